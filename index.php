@@ -106,7 +106,7 @@
                         <tr>
                             <td class="col-title">${paper.title}</td>
                             <td>${paper.authors}</td>
-                            <td class="center-align">${paper.year}</td>
+                            <td class="center-align">${paper.year ?? ''}</td>
                             <td>${paper.journal}</td>
                             <td class="center-align">${paper.citations}</td>
                             <td class="col-link"><a href="${paper.link}" target="_blank">Open</a></td>
@@ -14,6 +14,27 @@ if ($_SERVER['REQUEST_METHOD'] === 'POST') {
         exit;
     }
 
+    // Prefer the warm local service (python main.py --serve), fall back to a one-off process
+    $daemonUrl = getenv('SCHOLAR_DAEMON_URL') ?: 'http://127.0.0.1:8765/search';
+    $payload = json_encode(['author' => $author, 'keyword' => $keyword, 'limit' => $limit]);
+
+    $ch = curl_init($daemonUrl);
+    curl_setopt_array($ch, [
+        CURLOPT_POST => true,
+        CURLOPT_POSTFIELDS => $payload,
+        CURLOPT_HTTPHEADER => ['Content-Type: application/json'],
+        CURLOPT_RETURNTRANSFER => true,
+        CURLOPT_CONNECTTIMEOUT_MS => 300,
+    ]);
+    $daemon_output = curl_exec($ch);
+    $daemon_status = curl_getinfo($ch, CURLINFO_HTTP_CODE);
+    curl_close($ch);
+
+    if ($daemon_output !== false && $daemon_status === 200) {
+        echo $daemon_output;
+        exit;
+    }
+
     $escaped_author = escapeshellarg($author);
     $escaped_keyword = escapeshellarg($keyword);
     $escaped_limit = escapeshellarg($limit);
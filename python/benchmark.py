@@ -0,0 +1,328 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.scholarComputation import ScholarComputation
+from models.scholarDeduplicator import ScholarDeduplicator
+from models.scholarKeywords import ScholarKeywordExtractor
+from models.scholarPaperStore import ScholarPaperStore
+from models.scholarParser import ScholarParser
+from models.scholarScraper import ScholarScraper
+from models.scholarScraperConfig import ScholarScraperConfig
+from models.scholarSemantic import ScholarEmbedder, ScholarIvfIndex
+from models.scholarStemCache import ScholarStemCache
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "scholar")
+
+# Word pools for the synthetic titles, stopwords included so the filters have work to do
+VOCABULARY = {
+    "en": (
+        "learning deep neural network networks model models classification detection system systems "
+        "analysis data mining retrieval information document documents ranking similarity text "
+        "language processing image images segmentation recognition approach method methods "
+        "evaluation performance optimization algorithm algorithms graph graphs knowledge study "
+        "the of and for a in on with using based to an by from"
+    ).split(),
+    "id": (
+        "penelitian sistem informasi pencarian dokumen metode pembelajaran jaringan saraf tiruan "
+        "klasifikasi deteksi analisis data penambangan teks bahasa pengolahan citra pengenalan "
+        "pendekatan evaluasi kinerja optimasi algoritma pengetahuan perhitungan bobot kata "
+        "peringkat kemiripan menggunakan berbasis untuk dengan pada dan yang dari ini dalam"
+    ).split(),
+}
+
+QUERIES = {"en": "neural network document ranking", "id": "jaringan saraf pencarian dokumen"}
+
+def make_corpus(language, size, seed=42):
+    rng = random.Random(seed)
+    words = VOCABULARY[language]
+    return [" ".join(rng.choices(words, k=rng.randint(6, 14))).capitalize() for _ in range(size)]
+
+def measure(func, *args, repeat=3, setup=None, **kwargs):
+    # Best of N, the least disturbed run is the most comparable one
+    best, result = None, None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+# -------------------- Computation --------------------
+def bench_computation(language, size, repeat):
+    results = {}
+    documents = make_corpus(language, size)
+    repeat = repeat if size <= 100_000 else 1
+
+    def step(name, func, *args, **kwargs):
+        seconds, result = measure(func, *args, repeat=repeat, **kwargs)
+        results[name] = seconds
+        return result
+
+    computer = ScholarComputation(language)
+    # Language resources are loaded lazily, keep that one-off cost out of the first step
+    computer.load_language_resources()
+
+    # The token cache is cleared before every run, otherwise only the first run does real work
+    lowered = step("case_folding", computer.case_folding, documents)
+    filtered = step("stopword_removal", computer.stopword_removal, lowered)
+    step("lemmatization", computer.lemmatization, filtered, setup=computer.clear_cache)
+    processed = step("preprocess", computer.preprocess, documents, setup=computer.clear_cache)
+    step("preprocess_warm", computer.preprocess, documents)
+    query = computer.preprocess([QUERIES[language]])
+
+    # A new process with the stem dictionary of an earlier run, the stemmer is never called
+    with tempfile.TemporaryDirectory() as path:
+        stem_cache = ScholarStemCache(os.path.join(path, "stems.sqlite3"))
+        ScholarComputation(language, stem_cache=stem_cache).preprocess(documents)
+        step("preprocess_stem_cache", lambda: ScholarComputation(language, stem_cache=stem_cache).preprocess(documents))
+        step("preprocess_detect_language", computer.preprocess, documents, detect_language=True)
+        stem_cache.close()
+
+    tfidf_docs = step("train_tfidf_weighting", computer.train_tfidf_weighting, processed)
+    tfidf_query = step("apply_tfidf_weighting", computer.apply_tfidf_weighting, query)
+    step("calculate_similarity", computer.calculate_similarity, tfidf_query, tfidf_docs)
+    step("set_vectorizer_vocabulary_mean", computer.set_vectorizer_vocabulary, tfidf_docs, "mean", 10)
+    step("set_vectorizer_vocabulary_sum", computer.set_vectorizer_vocabulary, tfidf_docs, "sum", 10)
+
+    extractor = ScholarKeywordExtractor(ngram_range=(1, 2))
+    step("keywords_partial_fit", lambda: ScholarKeywordExtractor(ngram_range=(1, 2)).partial_fit(processed))
+    extractor.partial_fit(processed, [str(2000 + i % 10) for i in range(len(processed))])
+    step("keywords_bm25", extractor.top_keywords, 10, "bm25")
+    step("keywords_chi2_group", extractor.top_keywords, 10, "chi2", "2000")
+
+    papers = [{"title": document, "authors": "J Siswantoro"} for document in documents]
+    step("deduplicate", ScholarDeduplicator(computer=computer).deduplicate, papers)
+    return results
+
+# -------------------- Semantic --------------------
+def bench_semantic(language, size, repeat, queries=100):
+    results = {}
+    documents = make_corpus(language, size)
+    repeat = repeat if size <= 100_000 else 1
+
+    embedder = ScholarEmbedder()
+    results["embedder_fit"], _ = measure(embedder.fit, documents, repeat=repeat)
+    results["embedder_encode"], vectors = measure(embedder.encode, documents, repeat=repeat)
+
+    ivf = ScholarIvfIndex()
+    results["ivf_build"], _ = measure(ivf.build, vectors, repeat=repeat)
+
+    # Single queries, the latency a search request sees
+    encoded = embedder.encode(make_corpus(language, queries, seed=7))
+    seconds, _ = measure(lambda: [ivf.search(vectors, encoded[i:i + 1], 10) for i in range(queries)], repeat=repeat)
+    results["ivf_query"] = seconds / queries
+    return results
+
+# -------------------- Paper Store --------------------
+def bench_store(language, size, repeat, queries=100):
+    rng = random.Random(42)
+    papers = [
+        {
+            "title": title,
+            "link": f"https://example.org/paper/{i}",
+            "authors": ", ".join(f"{chr(97 + rng.randrange(26))} {rng.choice(VOCABULARY[language])}{rng.randrange(500)}" for _ in range(3)),
+            "year": rng.randint(1995, 2025),
+            "citations": rng.randint(0, 500),
+            "citation_id": f"bench:{i}",
+        }
+        for i, title in enumerate(make_corpus(language, size))
+    ]
+    authors = [paper["authors"].split(",")[0] for paper in rng.sample(papers, min(queries, size))]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as path:
+        results["put"], _ = measure(lambda: ScholarPaperStore(tempfile.mkdtemp(dir=path)).put(papers), repeat=repeat)
+
+        store = ScholarPaperStore(os.path.join(path, "store"))
+        store.put(papers)
+        results["put_unchanged"], _ = measure(store.put, papers, repeat=repeat)
+        store.close()
+
+        results["open"], store = measure(ScholarPaperStore, os.path.join(path, "store"), repeat=repeat)
+        results["query_range"], _ = measure(store.query, min_year=2018, min_citations=50, repeat=repeat)
+        seconds, _ = measure(lambda: [store.query(author=author, min_year=2018) for author in authors], repeat=repeat)
+        results["query_author"] = seconds / len(authors)
+        results["select_100"], _ = measure(store.select, min_citations=50, limit=100, repeat=repeat)
+        store.close()
+    return results
+
+# -------------------- Parsing --------------------
+def bench_parsing(repeat, iterations=200):
+    def read(name):
+        with open(os.path.join(FIXTURES, name), encoding="utf-8") as file:
+            return file.read()
+
+    search_page = read("author_search.html")
+    profile_page = read("author_profile.html")
+    detail_page = read("citation_detail.html")
+    results_page = read("search_results.html")
+
+    def loop(func, *args):
+        for _ in range(iterations):
+            func(*args)
+
+    results = {}
+    for name, func, args in (
+        ("parse_author_profile_url", ScholarParser.parse_author_profile_url, (search_page, "")),
+        ("parse_article_table", ScholarParser.parse_article_table, (profile_page,)),
+        ("has_more_articles", ScholarParser.has_more_articles, (profile_page,)),
+        ("parse_citation_details", ScholarParser.parse_citation_details, (detail_page,)),
+        ("parse_search_results", ScholarParser.parse_search_results, (results_page,)),
+    ):
+        seconds, _ = measure(loop, func, *args, repeat=repeat)
+        results[name] = seconds / iterations
+    return results
+
+# -------------------- Replay --------------------
+def bench_replay(archive_path, repeat, count=100):
+    # Full scraper navigation over recorded pages, no browser and no network
+    config = ScholarScraperConfig(backend="replay", archive_path=archive_path)
+
+    def scrape(query):
+        scraper = ScholarScraper(config=config)
+        scraper.request_scholar(query)
+        papers = scraper.scrape_scholar_papers(count=count, fast=True, fetch_details=True)
+        scraper._close_webdriver()
+        return papers
+
+    results = {}
+    for query in config.get_archive().get_queries("author"):
+        seconds, papers = measure(scrape, query, repeat=repeat)
+        results[query] = {"seconds": seconds, "papers": len(papers)}
+    return results
+
+def bench_replay_search(archive_path, repeat, count=100):
+    # Topic search over the recorded result pages, including the start= pagination
+    config = ScholarScraperConfig(backend="replay", archive_path=archive_path)
+
+    def search(query):
+        scraper = ScholarScraper(query=query, config=config)
+        papers = scraper.scrape_search_results(count=count)
+        scraper._close_webdriver()
+        return papers
+
+    results = {}
+    for query in config.get_archive().get_queries("topic"):
+        seconds, papers = measure(search, query, repeat=repeat)
+        results[query] = {"seconds": seconds, "papers": len(papers)}
+    return results
+
+# -------------------- Baseline --------------------
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+def compare(results, baseline, threshold, min_seconds):
+    current = flatten(results["benchmarks"])
+    previous = flatten(baseline["benchmarks"])
+
+    regressions = []
+    print(f"\n{'benchmark':60s} {'baseline':>12s} {'current':>12s} {'ratio':>8s}")
+    for name in sorted(current):
+        if name not in previous or previous[name] <= 0:
+            continue
+        ratio = current[name] / previous[name]
+        flag = ""
+        if max(current[name], previous[name]) < min_seconds:
+            # Too short to tell timer noise from a real change
+            pass
+        elif ratio > 1 + threshold:
+            flag = "  SLOWER"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{name:60s} {previous[name]:12.6f} {current[name]:12.6f} {ratio:8.2f}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=str, default="10,100,1000,10000,100000", help='Ukuran korpus, dipisah koma (mis. 10,1000,1000000)')
+    parser.add_argument('--languages', type=str, default="en,id", help='Bahasa, dipisah koma')
+    parser.add_argument('--repeat', type=int, default=3, help='Jumlah pengulangan, diambil yang tercepat')
+    parser.add_argument('--skip-semantic', action='store_true', help='Lewati benchmark embedding dan indeks IVF')
+    parser.add_argument('--skip-store', action='store_true', help='Lewati benchmark penyimpanan paper')
+    parser.add_argument('--skip-parsing', action='store_true', help='Lewati benchmark parser HTML')
+    parser.add_argument('--archive', type=str, default=os.path.join(FIXTURES, "replay"), help='Folder arsip rekaman untuk benchmark replay')
+    parser.add_argument('--skip-replay', action='store_true', help='Lewati benchmark scraping dari arsip rekaman')
+    parser.add_argument('--output', type=str, default="", help='Simpan hasil ke file JSON')
+    parser.add_argument('--baseline', type=str, default="", help='File JSON hasil sebelumnya untuk dibandingkan')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Batas perlambatan relatif sebelum dianggap regresi')
+    parser.add_argument('--min-seconds', type=float, default=0.001, help='Abaikan benchmark yang lebih cepat dari ini saat membandingkan')
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "benchmarks": {},
+    }
+
+    for language in args.languages.split(","):
+        for size in (int(s) for s in args.sizes.split(",")):
+            name = f"computation.{language}.{size}"
+            try:
+                results["benchmarks"][name] = bench_computation(language, size, args.repeat)
+            except Exception as e:
+                # e.g. missing NLTK corpora, the other language can still be measured
+                error = " ".join(str(e).replace("*", " ").split())
+                results["benchmarks"][name] = {"error": error}
+                print(f"{name}: skipped, {error[:120]}", file=sys.stderr)
+                break
+            total = sum(results["benchmarks"][name].values())
+            print(f"{name:40s} {total:10.4f} seconds")
+
+    if not args.skip_semantic:
+        for language in args.languages.split(","):
+            for size in (int(s) for s in args.sizes.split(",")):
+                name = f"semantic.{language}.{size}"
+                results["benchmarks"][name] = bench_semantic(language, size, args.repeat)
+                print(f"{name:40s} {results['benchmarks'][name]['ivf_query'] * 1000:10.4f} ms/query")
+
+    if not args.skip_store:
+        for size in (int(s) for s in args.sizes.split(",")):
+            name = f"store.{size}"
+            results["benchmarks"][name] = bench_store("en", size, args.repeat)
+            print(f"{name:40s} {results['benchmarks'][name]['put']:10.4f} seconds")
+
+    if not args.skip_parsing:
+        results["benchmarks"]["parsing"] = bench_parsing(args.repeat)
+        for name, seconds in results["benchmarks"]["parsing"].items():
+            print(f"parsing.{name:32s} {seconds * 1000:10.4f} ms/page")
+
+    if not args.skip_replay:
+        results["benchmarks"]["replay"] = bench_replay(args.archive, args.repeat)
+        for query, result in results["benchmarks"]["replay"].items():
+            print(f"replay.{query:33s} {result['seconds'] * 1000:10.4f} ms ({result['papers']} papers)")
+        results["benchmarks"]["replay_search"] = bench_replay_search(args.archive, args.repeat)
+        for query, result in results["benchmarks"]["replay_search"].items():
+            print(f"replay_search.{query:26s} {result['seconds'] * 1000:10.4f} ms ({result['papers']} papers)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.threshold, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks slower than the baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
@@ -1,11 +1,13 @@
-import nltk
+from functools import lru_cache
 
+# Probed once per process, and only when English resources are actually loaded
+@lru_cache(maxsize=None)
 def ensure_nltk_data():
+    import nltk
+
     resources = ["stopwords", "wordnet", "omw-1.4"]
     for r in resources:
         try:
             nltk.data.find(f"corpora/{r}")
         except LookupError:
             nltk.download(r, quiet=True) 
-
-ensure_nltk_data()
\ No newline at end of file
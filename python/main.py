@@ -1,3 +1,8 @@
+import time
+
+# Taken before anything else is imported, so the startup report includes import time
+STARTED_AT = time.perf_counter()
+
 import sys
 import json
 import os
@@ -6,87 +11,534 @@ import traceback
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config.nltk_config import ensure_nltk_data
 from models.scholarScraper import ScholarScraper
+from models.scholarScraperConfig import ScholarScraperConfig
 from models.scholarComputation import ScholarComputation
 
+# Next to this file, so the PHP fallback (started from php/), the service and batch runs share one stem dictionary
+DEFAULT_STEM_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scholar_stems.sqlite3")
+
+HEAVY_MODULES = ["selenium", "requests", "lxml", "numpy", "scipy", "sklearn", "nltk", "Sastrawi"]
+timings = []
+
+def mark_timing(label):
+    timings.append((label, time.perf_counter()))
+
+def timing_report():
+    report, previous = {}, STARTED_AT
+    for label, at in timings:
+        report[label] = round(at - previous, 4)
+        previous = at
+    report["total"] = round(previous - STARTED_AT, 4)
+    # Shows which heavy dependencies this run actually needed
+    report["loaded_modules"] = [name for name in HEAVY_MODULES if name in sys.modules]
+    return report
+
+def get_cache_variant(author_name, fast=False, fetch_details=False):
+    return "|".join([
+        "author" if author_name else "keyword",
+        "details" if fetch_details or not fast else "table",
+    ])
+
+def rank_papers(raw_papers, keyword, computer, top_k=0):
+    documents = [p['title'] if p['title'] else "" for p in raw_papers]
+
+    # Preprocessing Documents
+    processed_docs = computer.preprocess(documents)
+
+    # Keys let a persistent index replace papers it has already seen instead of counting them twice
+    keys = [p.get('citation_id') or p.get('link') or p['title'] for p in raw_papers]
+    payloads = raw_papers if computer.get_index() is not None else None
+    tfidf_matrix = computer.train_tfidf_weighting(processed_docs, keys=keys, payloads=payloads)
+
+    # Title and snippet for the semantic index, it learns from co-occurrence rather than exact terms
+    semantic = computer.get_semantic_index()
+    if semantic is not None:
+        texts = [f"{p['title'] or ''} {p.get('description') or ''}".strip() for p in raw_papers]
+        semantic.add_documents(texts, keys, payloads=raw_papers)
+
+    top_keywords = []
+    related_papers = []
+    if hasattr(computer, 'top_word'):
+        for word, score in computer.top_word:
+            top_keywords.append({"word": word, "score": float(score)})
+
+    if keyword:
+        processed_query = computer.preprocess([keyword])
+        query_vector = computer.apply_tfidf_weighting(processed_query)
+        similarity_scores = computer.calculate_similarity(query_vector, tfidf_matrix)
+        if semantic is not None:
+            similarity_scores = computer.blend_similarity(
+                similarity_scores, computer.semantic_similarity(keyword, texts)
+            )
+
+        # Best matches across every paper stored in the index, not only this author's
+        if top_k and semantic is not None:
+            for key, score in computer.retrieve_semantic(keyword, top_k):
+                related_papers.append({**(semantic.get_payload(key) or {"key": key}), "similarity": score})
+        elif top_k and computer.get_index() is not None:
+            index = computer.get_index()
+            for key, score in computer.retrieve_top_k(query_vector, top_k):
+                related_papers.append({**(index.get_payload(key) or {"key": key}), "similarity": float(score)})
+    else:
+        similarity_scores = [0.0] * len(raw_papers)
+
+    return [float(score) for score in similarity_scores], top_keywords, related_papers
+
+def deduplicate_papers(raw_papers, computer):
+    from models.scholarDeduplicator import ScholarDeduplicator
+
+    # Titles go through the same case folding and stopword removal as the ranking
+    return ScholarDeduplicator(computer=computer).deduplicate(raw_papers, return_clusters=True)
+
+def group_keywords(papers, computer, group_by, method="mean", ngram=1, top_n=10):
+    from models.scholarKeywords import ScholarKeywordExtractor
+
+    documents = computer.preprocess([p['title'] if p['title'] else "" for p in papers])
+    if group_by == "authors":
+        # Multi-label: a paper counts towards every one of its co-authors
+        groups = [[name.strip() for name in (p.get('authors') or "").split(",")] for p in papers]
+    else:
+        groups = [p.get(group_by) for p in papers]
+
+    extractor = ScholarKeywordExtractor(ngram_range=(1, ngram)).partial_fit(documents, groups)
+    return {
+        group: [{"word": word, "score": score} for word, score in keywords]
+        for group, keywords in extractor.top_keywords_by_group(top_n, method).items()
+    }
+
+def read_store(store, author_name, limit_data, store_query):
+    # Papers scraped earlier, filtered on the store's indexes; most cited first
+    return store.select(author=author_name or None, limit=limit_data, **store_query).to_dicts()
+
+def run_search(
+    author_name,
+    keyword,
+    limit_data,
+    scraper,
+    computer,
+    fast=False,
+    fetch_details=False,
+    concurrency=1,
+    cache=None,
+    refresh=False,
+    top_k=0,
+    dedup=False,
+    store=None,
+    store_query=None,
+):
+    search_query = author_name if author_name else keyword
+    cache_variant = get_cache_variant(author_name, fast, fetch_details)
+
+    # --- A. SCRAPING ---
+    raw_papers = None
+    if store is not None and store_query is not None:
+        raw_papers = read_store(store, author_name, limit_data, store_query)
+    elif cache and not refresh:
+        raw_papers = cache.get(search_query, limit_data, cache_variant)
+
+    if refresh and author_name:
+        # Re-read the profile table and only revisit papers that are new or changed
+        scraper.request_scholar(search_query)
+        previous = cache.get_snapshot(search_query, cache_variant) if cache else None
+        raw_papers = scraper.refresh_scholar_papers(
+            previous,
+            count=limit_data,
+            output_format="dict",
+            fetch_details=fetch_details or not fast,
+            concurrency=concurrency,
+        )
+
+        # An empty profile is more likely a block or CAPTCHA than a real answer, it must not be served for a whole TTL
+        if cache and raw_papers:
+            cache.put_snapshot(search_query, raw_papers, cache_variant)
+            cache.put(search_query, raw_papers, limit_data, cache_variant)
+        if store is not None:
+            store.put(raw_papers)
+
+    if raw_papers is None:
+        if author_name:
+            scraper.request_scholar(search_query)
+
+            # Scrape data
+            raw_papers = scraper.scrape_scholar_papers(
+                count=limit_data,
+                output_format="dict",
+                fast=fast,
+                fetch_details=fetch_details,
+                concurrency=concurrency,
+            )
+        else:
+            # Topic search reads the result list itself, there is no profile to open
+            scraper.set_query(search_query)
+            raw_papers = scraper.scrape_search_results(count=limit_data, output_format="dict")
+
+        # Navigation errors are swallowed and come back as no papers, only real results are cached
+        if cache and raw_papers:
+            cache.put(search_query, raw_papers, limit_data, cache_variant)
+        if store is not None:
+            store.put(raw_papers)
+
+    if not raw_papers:
+        return {"papers": [], "top_keywords": []}
+
+    # --- B. COMPUTATION ---
+    # The cache keeps what was scraped, duplicates are merged on every read
+    duplicates = []
+    if dedup:
+        raw_papers, clusters = deduplicate_papers(raw_papers, computer)
+        duplicates = [members for members in clusters if len(members) > 1]
+
+    similarity_scores, top_keywords, related_papers = rank_papers(raw_papers, keyword, computer, top_k)
+
+    # --- C. OUTPUT ---
+    from models.scholarPaperBatch import ScholarPaperBatch
+
+    batch = ScholarPaperBatch.from_papers(raw_papers)
+    batch.set_similarity(similarity_scores)
+    final_papers = batch.sort_by("similarity").to_dicts()
+
+    result = {
+        "papers": final_papers,
+        "top_keywords": top_keywords
+    }
+    if related_papers:
+        result["related_papers"] = related_papers
+    if dedup:
+        result["duplicates_merged"] = sum(len(members) - 1 for members in duplicates)
+    return result
+
+def stream_search(
+    author_name,
+    keyword,
+    limit_data,
+    scraper,
+    computer,
+    fast=False,
+    fetch_details=False,
+    concurrency=1,
+    cache=None,
+    top_k=0,
+    dedup=False,
+    store=None,
+    store_query=None,
+):
+    search_query = author_name if author_name else keyword
+    cache_variant = get_cache_variant(author_name, fast, fetch_details)
+
+    # --- A. SCRAPING (one record per finished paper) ---
+    if store is not None and store_query is not None:
+        raw_papers = read_store(store, author_name, limit_data, store_query)
+    else:
+        raw_papers = cache.get(search_query, limit_data, cache_variant) if cache else None
+
+    if raw_papers is None:
+        if author_name:
+            scraper.request_scholar(search_query)
+            papers = scraper.iter_scholar_papers(
+                count=limit_data,
+                fast=fast,
+                fetch_details=fetch_details,
+                concurrency=concurrency,
+            )
+        else:
+            scraper.set_query(search_query)
+            papers = scraper.iter_search_results(count=limit_data)
+
+        raw_papers = []
+        for paper in papers:
+            raw_papers.append(paper.to_dict())
+            yield {"type": "paper", "index": len(raw_papers) - 1, "paper": raw_papers[-1]}
+
+        # Only reached when the caller consumed everything, partial and empty results are never cached
+        if cache and raw_papers:
+            cache.put(search_query, raw_papers, limit_data, cache_variant)
+        if store is not None:
+            store.put(raw_papers)
+    else:
+        for i, paper in enumerate(raw_papers):
+            yield {"type": "paper", "index": i, "paper": paper}
+
+    # --- B. COMPUTATION ---
+    # Papers were already streamed one by one, merged groups are reported by their streamed indices
+    indices = list(range(len(raw_papers)))
+    if dedup and raw_papers:
+        raw_papers, clusters = deduplicate_papers(raw_papers, computer)
+        indices = [members[0] for members in clusters]
+        yield {"type": "duplicates", "clusters": [members for members in clusters if len(members) > 1]}
+
+    similarity_scores, top_keywords, related_papers = [], [], []
+    if raw_papers:
+        similarity_scores, top_keywords, related_papers = rank_papers(raw_papers, keyword, computer, top_k)
+
+    # --- C. OUTPUT ---
+    ranking = sorted(
+        ({"index": indices[i], "similarity": score} for i, score in enumerate(similarity_scores)),
+        key=lambda x: x['similarity'],
+        reverse=True,
+    )
+    record = {"type": "ranking", "ranking": ranking, "top_keywords": top_keywords}
+    if related_papers:
+        record["related_papers"] = related_papers
+    yield record
+
+def open_cache(args):
+    if not args.cache:
+        return None
+
+    from models.scholarCache import ScholarCache
+
+    return ScholarCache(path=args.cache, ttl=args.cache_ttl, max_entries=args.cache_size)
+
+def open_index(args):
+    if not args.index:
+        return None
+
+    from models.scholarIndex import ScholarIndex
+
+    return ScholarIndex(path=args.index)
+
+def open_stem_cache(args):
+    if not args.stem_cache:
+        return None
+
+    from models.scholarStemCache import open_stem_cache as open_cache_file
+
+    return open_cache_file(args.stem_cache)
+
+def open_semantic(args):
+    if not args.semantic:
+        return None
+
+    from models.scholarSemantic import ScholarSemanticIndex
+
+    return ScholarSemanticIndex(path=args.semantic)
+
+def open_store(args):
+    if not args.store:
+        return None
+
+    from models.scholarPaperStore import ScholarPaperStore
+
+    return ScholarPaperStore(path=args.store)
+
+def get_store_query(args):
+    if not args.from_store:
+        return None
+    if not args.store:
+        raise ValueError("--from-store needs --store.")
+    return {"min_year": args.since, "max_year": args.until, "min_citations": args.min_citations}
+
+def get_config_kwargs(args):
+    return {
+        "headless": True,
+        "backend": "replay" if args.replay else args.backend,
+        "requests_per_second": args.rate,
+        "archive_path": args.replay or args.record or None,
+        "record": bool(args.record),
+    }
+
+def get_computation_kwargs(args):
+    # "auto" starts from English and routes every document to its detected language
+    return {
+        "language": "en" if args.language == "auto" else args.language,
+        "workers": args.preprocess_workers,
+        "detect_language": args.language == "auto",
+    }
+
+def run_batch(args):
+    from models.scholarBatch import ScholarBatchRunner, ScholarJobQueue
+
+    runner = ScholarBatchRunner(
+        search_fn=run_search,
+        queue_path=args.queue,
+        output_path=args.output,
+        workers=args.workers,
+        options={
+            "fast": args.fast,
+            "fetch_details": args.details,
+            "concurrency": args.concurrency,
+            "dedup": args.dedup,
+        },
+        config_kwargs=get_config_kwargs(args),
+        stem_cache_path=args.stem_cache or None,
+        computation_kwargs=get_computation_kwargs(args),
+        semantic_path=args.semantic or None,
+        semantic_weight=args.semantic_weight,
+    )
+    counts = runner.run(ScholarJobQueue.read_jobs(args.batch, args.limit) if args.batch != "-" else None)
+    print(json.dumps({"jobs": counts}))
+
+def serve(args):
+    from models.scholarService import ScholarService
+
+    service = ScholarService(
+        search_fn=run_search,
+        stream_fn=stream_search,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_pages_per_driver=args.max_pages,
+        max_memory_mb=args.max_memory,
+        detail_workers=args.detail_workers,
+        config=ScholarScraperConfig(**get_config_kwargs(args)),
+        cache=open_cache(args),
+        store=open_store(args),
+        index=open_index(args),
+        stem_cache=open_stem_cache(args),
+        semantic=open_semantic(args),
+        semantic_weight=args.semantic_weight,
+        computation_kwargs=get_computation_kwargs(args),
+        max_concurrency=args.max_concurrency,
+    )
+    service.serve_forever()
+
 def main():
-    try:
-        ensure_nltk_data()
-    except Exception:
-        pass
+    mark_timing("imports")
 
     parser = argparse.ArgumentParser()
     parser.add_argument('-a', '--author', type=str, default="", help='Nama Penulis')
     parser.add_argument('-k', '--keyword', type=str, default="", help='Keyword untuk similaritas')
     parser.add_argument('-l', '--limit', type=int, default=10, help='Jumlah data')
-    
+    parser.add_argument('--fast', action='store_true', help='Baca tabel artikel sekaligus tanpa membuka detail')
+    parser.add_argument('--details', action='store_true', help='Pada mode --fast, tetap ambil deskripsi dan link')
+    parser.add_argument('-c', '--concurrency', type=int, default=1, help='Jumlah browser paralel untuk halaman detail')
+    parser.add_argument('--backend', type=str, default="selenium", choices=["selenium", "http", "replay"], help='Cara mengambil halaman')
+    parser.add_argument('--record', type=str, default="", help='Simpan setiap halaman yang diambil ke folder arsip (profil selalu dibaca lewat tabel artikel dan halaman detail)')
+    parser.add_argument('--replay', type=str, default="", help='Ambil halaman dari folder arsip rekaman, tanpa jaringan')
+    parser.add_argument('--rate', type=float, default=1.0, help='Maksimum request per detik ke Google Scholar')
+    parser.add_argument('--cache', type=str, default="", help='File SQLite untuk cache hasil')
+    parser.add_argument('--cache-ttl', type=float, default=24 * 60 * 60, help='Umur cache dalam detik')
+    parser.add_argument('--cache-size', type=int, default=1000, help='Jumlah query maksimum di cache')
+    parser.add_argument('--refresh', action='store_true', help='Perbarui profil penulis secara inkremental dari snapshot cache')
+    parser.add_argument('--store', type=str, default="", help='Folder penyimpanan paper (append-only, memory-mapped)')
+    parser.add_argument('--from-store', action='store_true', help='Ambil paper dari --store tanpa scraping')
+    parser.add_argument('--since', type=int, default=None, help='Pada --from-store, hanya paper sejak tahun ini')
+    parser.add_argument('--until', type=int, default=None, help='Pada --from-store, hanya paper sampai tahun ini')
+    parser.add_argument('--min-citations', type=int, default=None, help='Pada --from-store, minimal jumlah sitasi')
+    parser.add_argument('--stream', action='store_true', help='Keluarkan NDJSON per paper selama scraping')
+    parser.add_argument('--index', type=str, default="", help='File SQLite untuk indeks TF-IDF persisten')
+    parser.add_argument('--language', type=str, default="en", choices=["en", "id", "auto"], help='Bahasa preprocessing, "auto" mendeteksi per dokumen')
+    parser.add_argument('--stem-cache', type=str, default=DEFAULT_STEM_CACHE, help='File SQLite kamus stem yang disimpan antar run ("" untuk mematikan)')
+    parser.add_argument('--preprocess-workers', type=int, default=None, help='Jumlah proses untuk preprocessing korpus besar')
+    parser.add_argument('--semantic', type=str, default="", help='Folder indeks semantik (LSA + IVF) untuk ranking berbasis makna')
+    parser.add_argument('--semantic-weight', type=float, default=0.5, help='Bobot skor semantik terhadap TF-IDF (0-1)')
+    parser.add_argument('--top-k', type=int, default=0, help='Tambahkan N paper paling relevan dari seluruh indeks')
+    parser.add_argument('--dedup', action='store_true', help='Gabungkan paper duplikat (preprint vs versi jurnal) sebelum ranking')
+    parser.add_argument('--keywords-by', type=str, default="", choices=["", "year", "authors"], help='Tambahkan kata kunci teratas per tahun atau per penulis')
+    parser.add_argument('--keyword-method', type=str, default="mean", choices=["mean", "sum", "df", "bm25", "chi2"], help='Metode skor kata kunci untuk --keywords-by')
+    parser.add_argument('--ngram', type=int, default=1, help='Panjang frasa maksimum untuk --keywords-by')
+    parser.add_argument('--batch', type=str, default="", help='File daftar query (satu per baris), "-" untuk melanjutkan antrian')
+    parser.add_argument('--queue', type=str, default="scholar_jobs.sqlite3", help='File SQLite antrian batch')
+    parser.add_argument('--output', type=str, default="scholar_results.ndjson", help='File NDJSON hasil batch')
+    parser.add_argument('--serve', action='store_true', help='Jalankan sebagai service HTTP lokal')
+    parser.add_argument('--host', type=str, default="127.0.0.1", help='Host service')
+    parser.add_argument('--port', type=int, default=8765, help='Port service')
+    parser.add_argument('--workers', type=int, default=1, help='Jumlah browser yang tetap hidup / proses batch')
+    parser.add_argument('--max-concurrency', type=int, default=8, help='Batas concurrency per request pada service')
+    parser.add_argument('--detail-workers', type=int, default=0, help='Jumlah browser tambahan untuk halaman detail')
+    parser.add_argument('--max-pages', type=int, default=200, help='Daur ulang browser setelah N halaman')
+    parser.add_argument('--max-memory', type=int, default=None, help='Daur ulang browser di atas N MB')
+    parser.add_argument('--export', type=str, default="", help='Simpan paper ke file (.ndjson, .json, .csv, .parquet, .arrow)')
+    parser.add_argument('--export-format', type=str, default=None, choices=["ndjson", "json", "csv", "parquet", "arrow"], help='Format ekspor jika tidak dari ekstensi')
+    parser.add_argument('--metrics', action='store_true', help='Sertakan waktu per tahap dan penghitung di output')
+    parser.add_argument('--timing', action='store_true', help='Tulis laporan waktu startup ke stderr')
+
     args = parser.parse_args()
-    
+
+    if args.serve:
+        serve(args)
+        return
+
+    if args.batch:
+        run_batch(args)
+        return
+
     author_name = args.author
     keyword = args.keyword
     limit_data = args.limit
     search_query = author_name if author_name else keyword
 
     try:
-        # --- A. SCRAPING ---
-        scraper = ScholarScraper(query=search_query)
-        scraper.config.set_headless(True)
-        
-        scraper.request_scholar(search_query)
-        
-        # Scrape data
-        raw_papers = scraper.scrape_scholar_papers(count=limit_data, output_format="dict")
-        
-        if not raw_papers:
-            print(json.dumps({"papers": [], "top_keywords": []}))
+        config = ScholarScraperConfig(**get_config_kwargs(args))
+        scraper = ScholarScraper(query=search_query, config=config)
+
+        metrics = config.get_metrics()
+        computer = ScholarComputation(
+            index=open_index(args),
+            metrics=metrics,
+            stem_cache=open_stem_cache(args),
+            **get_computation_kwargs(args),
+        )
+        computer.set_semantic_index(open_semantic(args), args.semantic_weight)
+        cache = open_cache(args)
+        store = open_store(args)
+        store_query = get_store_query(args)
+        mark_timing("setup")
+
+        if args.stream:
+            records = stream_search(
+                author_name, keyword, limit_data, scraper, computer,
+                fast=args.fast,
+                fetch_details=args.details,
+                concurrency=args.concurrency,
+                cache=cache,
+                top_k=args.top_k,
+                dedup=args.dedup,
+                store=store,
+                store_query=store_query,
+            )
+            try:
+                for record in records:
+                    print(json.dumps(record), flush=True)
+                if args.metrics:
+                    print(json.dumps({"type": "metrics", "metrics": metrics.snapshot()}), flush=True)
+            except BrokenPipeError:
+                # Reader went away, stop scraping instead of finishing the remaining papers
+                records.close()
             return
 
-        # --- B. COMPUTATION ---
-        
-        documents = [p['title'] if p['title'] else "" for p in raw_papers]
-        
-        computer = ScholarComputation(language="en")
-        
-        # Preprocessing Documents
-        processed_docs = computer.case_folding(documents)
-        processed_docs = computer.stopword_removal(processed_docs)
-        processed_docs = computer.lemmatization(processed_docs)
-        
-        tfidf_matrix = computer.train_tfidf_weighting(processed_docs)
-        
-        top_keywords = []
-        if hasattr(computer, 'top_word'):
-            for word, score in computer.top_word:
-                top_keywords.append({"word": word, "score": float(score)})
-
-        if keyword:
-            processed_query = computer.case_folding([keyword])
-            processed_query = computer.stopword_removal(processed_query)
-            processed_query = computer.lemmatization(processed_query)
-            query_vector = computer.apply_tfidf_weighting(processed_query)
-            similarity_scores = computer.calculate_similarity(query_vector, tfidf_matrix)
-        else:
-            similarity_scores = [0.0] * len(raw_papers)
+        result = run_search(
+            author_name, keyword, limit_data, scraper, computer,
+            fast=args.fast,
+            fetch_details=args.details,
+            concurrency=args.concurrency,
+            cache=cache,
+            refresh=args.refresh,
+            top_k=args.top_k,
+            dedup=args.dedup,
+            store=store,
+            store_query=store_query,
+        )
+
+        if args.keywords_by and result.get("papers"):
+            result[f"keywords_by_{args.keywords_by}"] = group_keywords(
+                result["papers"], computer, args.keywords_by, args.keyword_method, args.ngram,
+            )
+
+        if args.export and result.get("papers"):
+            from models.scholarExporter import ScholarExporter
+
+            result["exported"] = {
+                "path": args.export,
+                "count": ScholarExporter().export(result["papers"], args.export, args.export_format),
+            }
+
+        if args.metrics:
+            result["metrics"] = metrics.snapshot()
+
+        print(json.dumps(result))
 
-        # --- C. OUTPUT ---
-        final_papers = []
-        for i, paper in enumerate(raw_papers):
-            paper['similarity'] = float(similarity_scores[i])
-            final_papers.append(paper)
-        
-        final_papers.sort(key=lambda x: x['similarity'], reverse=True)
-
-        print(json.dumps({
-            "papers": final_papers,
-            "top_keywords": top_keywords
-        }))
-        
     except Exception as e:
         print(json.dumps({"error": str(e), "details": traceback.format_exc()}))
     finally:
         if 'scraper' in locals():
             scraper._close_webdriver()
+        if locals().get('store') is not None:
+            store.close()
+        if args.timing:
+            mark_timing("search")
+            print(json.dumps({"timing": timing_report()}), file=sys.stderr)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,132 @@
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+kind_pack = ["author", "topic"]
+
+class ScholarReplayMiss(LookupError):
+    pass
+
+
+class ScholarArchive:
+    MANIFEST = "manifest.ndjson"
+    QUERIES = "queries.ndjson"
+
+    def __init__(self, path: str = "scholar_archive"):
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__pages = {}
+
+        os.makedirs(path, exist_ok=True)
+        manifest = os.path.join(path, self.MANIFEST)
+        if os.path.exists(manifest):
+            with open(manifest, encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        # Later lines win, a page recorded twice keeps its newest copy
+                        entry = json.loads(line)
+                        self.__pages[entry["key"]] = entry
+
+        # Which scraper path each query was recorded through, the same search page serves both
+        self.__kinds = {}
+        queries = os.path.join(path, self.QUERIES)
+        if os.path.exists(queries):
+            with open(queries, encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.__kinds.setdefault(entry["query"], []).append(entry["kind"])
+
+    # -------------------- Keys --------------------
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        # Parameter order differs between Selenium clicks and built URLs, the page does not
+        parts = urlparse(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunparse((parts.scheme, parts.netloc, parts.path, "", query, ""))
+
+    @classmethod
+    def make_key(cls, url: str) -> str:
+        return hashlib.sha1(cls.normalize_url(url).encode("utf-8")).hexdigest()
+
+    # -------------------- Getters --------------------
+    def get_path(self) -> str:
+        return self.__path
+
+    def __len__(self) -> int:
+        return len(self.__pages)
+
+    def __contains__(self, url: str) -> bool:
+        return self.make_key(url) in self.__pages
+
+    def get_urls(self) -> list:
+        return [entry["url"] for entry in self.__pages.values()]
+
+    def get_queries(self, kind: str = None) -> list:
+        # Search queries that were recorded, so a replay run knows what it can ask for
+        if kind is not None:
+            if kind not in kind_pack:
+                raise ValueError(f"Kind must be one of {kind_pack}.")
+            # Archives recorded before kinds were kept fall back to every query
+            if self.__kinds:
+                return [query for query, kinds in self.__kinds.items() if kind in kinds]
+
+        queries = []
+        for url in self.get_urls():
+            parts = urlparse(url)
+            if parts.path == "/scholar":
+                query = dict(parse_qsl(parts.query)).get("q")
+                if query and query not in queries:
+                    queries.append(query)
+        return queries
+
+    # -------------------- Record --------------------
+    def save(self, url: str, html: str, status: int = 200):
+        key = self.make_key(url)
+        entry = {"key": key, "url": url, "file": f"{key}.html", "status": status, "recorded_at": time.time()}
+
+        with self.__lock:
+            with open(os.path.join(self.__path, entry["file"]), "w", encoding="utf-8") as file:
+                file.write(html)
+            with open(os.path.join(self.__path, self.MANIFEST), "a", encoding="utf-8") as file:
+                file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.__pages[key] = entry
+
+    def save_query(self, query: str, kind: str):
+        if kind not in kind_pack:
+            raise ValueError(f"Kind must be one of {kind_pack}.")
+        with self.__lock:
+            if kind in self.__kinds.get(query, []):
+                return
+            with open(os.path.join(self.__path, self.QUERIES), "a", encoding="utf-8") as file:
+                file.write(json.dumps({"query": query, "kind": kind}, ensure_ascii=False) + "\n")
+            self.__kinds.setdefault(query, []).append(kind)
+
+    # -------------------- Replay --------------------
+    def load(self, url: str) -> str:
+        entry = self.__pages.get(self.make_key(url))
+        if entry is None:
+            raise ScholarReplayMiss(f"No recorded page for {url}")
+        with open(os.path.join(self.__path, entry["file"]), encoding="utf-8") as file:
+            return file.read()
+
+    def __repr__(self) -> str:
+        return f"ScholarArchive(path={self.__path!r}, pages={len(self.__pages)})"
+
+
+class ScholarReplayClient:
+    # Same interface as ScholarHttpClient, pages come from the archive instead of the network
+    def __init__(self, archive: ScholarArchive, is_verbose: bool = False):
+        self.__archive = archive
+        self.__is_verbose = is_verbose
+
+    def get(self, url: str) -> str:
+        if self.__is_verbose:
+            print(f"REPLAY {url}")
+        return self.__archive.load(url)
+
+    def close(self):
+        pass
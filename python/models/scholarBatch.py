@@ -0,0 +1,255 @@
+# Project models
+from models.scholarScraperConfig import ScholarScraperConfig
+
+import json
+import multiprocessing
+import sqlite3
+import time
+import traceback
+
+class ScholarJobQueue:
+    def __init__(self, path: str = "scholar_jobs.sqlite3"):
+        self.__path = path
+        self.__connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                author TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                "limit" INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated_at REAL NOT NULL,
+                UNIQUE (author, keyword, "limit")
+            )
+            """
+        )
+        self.__connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+    # -------------------- Getters --------------------
+    def get_path(self) -> str:
+        return self.__path
+
+    def counts(self) -> dict:
+        rows = self.__connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return {status: count for status, count in rows}
+
+    # -------------------- Producer --------------------
+    def enqueue(self, jobs) -> int:
+        now = time.time()
+        before = self.__connection.total_changes
+        self.__connection.execute("BEGIN IMMEDIATE")
+        self.__connection.executemany(
+            'INSERT OR IGNORE INTO jobs (author, keyword, "limit", updated_at) VALUES (?, ?, ?, ?)',
+            ((job.get("author", ""), job.get("keyword", ""), int(job.get("limit", 10)), now) for job in jobs),
+        )
+        self.__connection.execute("COMMIT")
+        return self.__connection.total_changes - before
+
+    @staticmethod
+    def read_jobs(path: str, default_limit: int = 10):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                # Either a bare author name per line or a JSON object with author/keyword/limit
+                job = json.loads(line) if line.startswith("{") else {"author": line}
+                job.setdefault("limit", default_limit)
+                yield job
+
+    # -------------------- Consumer --------------------
+    def recover(self) -> int:
+        # Jobs left running by a crashed run go back to the queue
+        cursor = self.__connection.execute(
+            "UPDATE jobs SET status = 'pending', updated_at = ? WHERE status = 'running'",
+            (time.time(),),
+        )
+        return cursor.rowcount
+
+    def claim(self):
+        self.__connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.__connection.execute(
+                'SELECT id, author, keyword, "limit" FROM jobs WHERE status = \'pending\' ORDER BY id LIMIT 1'
+            ).fetchone()
+            if row is not None:
+                self.__connection.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (time.time(), row[0]),
+                )
+            self.__connection.execute("COMMIT")
+        except Exception:
+            self.__connection.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            return None
+        return {"id": row[0], "author": row[1], "keyword": row[2], "limit": row[3]}
+
+    def complete(self, job_id: int):
+        self.__connection.execute(
+            "UPDATE jobs SET status = 'done', error = NULL, updated_at = ? WHERE id = ?",
+            (time.time(), job_id),
+        )
+
+    def fail(self, job_id: int, error: str, max_attempts: int = 3):
+        self.__connection.execute(
+            """
+            UPDATE jobs
+            SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                error = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            (max_attempts, error, time.time(), job_id),
+        )
+
+    def close(self):
+        self.__connection.close()
+
+
+def _batch_worker(
+    search_fn,
+    queue_path,
+    output_path,
+    output_lock,
+    options,
+    config_kwargs,
+    max_attempts,
+    stem_cache_path=None,
+    computation_kwargs=None,
+    semantic_path=None,
+    semantic_weight=0.5,
+):
+    from models.scholarScraper import ScholarScraper
+    from models.scholarComputation import ScholarComputation
+
+    stem_cache = None
+    if stem_cache_path:
+        from models.scholarStemCache import open_stem_cache
+        stem_cache = open_stem_cache(stem_cache_path)
+
+    semantic = None
+    if semantic_path:
+        from models.scholarSemantic import ScholarSemanticIndex
+        semantic = ScholarSemanticIndex(path=semantic_path)
+
+    # Each process keeps one browser and one set of language resources for all of its jobs
+    queue = ScholarJobQueue(queue_path)
+    scraper = ScholarScraper(config=ScholarScraperConfig(**config_kwargs))
+    computer = ScholarComputation(stem_cache=stem_cache, **(computation_kwargs or {}))
+    computer.set_semantic_index(semantic, semantic_weight)
+
+    try:
+        while True:
+            job = queue.claim()
+            if job is None:
+                break
+
+            try:
+                result = search_fn(
+                    job["author"], job["keyword"], job["limit"],
+                    scraper=scraper,
+                    computer=computer,
+                    **options,
+                )
+                if "error" in result:
+                    raise RuntimeError(result["error"])
+            except Exception as e:
+                queue.fail(job["id"], f"{e}\n{traceback.format_exc()}", max_attempts)
+                # Start the next job with a fresh browser in case this one is wedged
+                scraper._close_webdriver()
+                scraper = ScholarScraper(config=ScholarScraperConfig(**config_kwargs))
+                continue
+
+            record = {"author": job["author"], "keyword": job["keyword"], "limit": job["limit"], **result}
+            with output_lock:
+                with open(output_path, "a", encoding="utf-8") as output:
+                    output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            queue.complete(job["id"])
+    finally:
+        scraper._close_webdriver()
+        queue.close()
+        if stem_cache is not None:
+            stem_cache.close()
+        if semantic is not None:
+            semantic.close()
+
+
+class ScholarBatchRunner:
+    def __init__(
+        self,
+        search_fn,
+        queue_path: str = "scholar_jobs.sqlite3",
+        output_path: str = "scholar_results.ndjson",
+        workers: int = 2,
+        max_attempts: int = 3,
+        options: dict = None,
+        config_kwargs: dict = None,
+        stem_cache_path: str = None,
+        computation_kwargs: dict = None,
+        semantic_path: str = None,
+        semantic_weight: float = 0.5,
+    ):
+        if workers < 1:
+            raise ValueError("Workers must be at least 1.")
+        # The semantic index appends to its vector file without a cross-process lock
+        if semantic_path and workers > 1:
+            raise ValueError("A semantic index can only be used with one batch worker.")
+
+        self.__search_fn = search_fn
+        self.__queue_path = queue_path
+        self.__output_path = output_path
+        self.__workers = workers
+        self.__max_attempts = max_attempts
+        self.__options = options or {}
+        self.__config_kwargs = config_kwargs or {"headless": True}
+        self.__stem_cache_path = stem_cache_path
+        self.__computation_kwargs = computation_kwargs or {}
+        self.__semantic_path = semantic_path
+        self.__semantic_weight = semantic_weight
+
+    def run(self, jobs=None) -> dict:
+        queue = ScholarJobQueue(self.__queue_path)
+        try:
+            recovered = queue.recover()
+            if recovered and self.__config_kwargs.get("is_verbose"):
+                print(f"Resuming {recovered} interrupted jobs.")
+            if jobs is not None:
+                queue.enqueue(jobs)
+        finally:
+            queue.close()
+
+        output_lock = multiprocessing.Lock()
+        processes = [
+            multiprocessing.Process(
+                target=_batch_worker,
+                args=(
+                    self.__search_fn,
+                    self.__queue_path,
+                    self.__output_path,
+                    output_lock,
+                    self.__options,
+                    self.__config_kwargs,
+                    self.__max_attempts,
+                    self.__stem_cache_path,
+                    self.__computation_kwargs,
+                    self.__semantic_path,
+                    self.__semantic_weight,
+                ),
+            )
+            for _ in range(self.__workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        queue = ScholarJobQueue(self.__queue_path)
+        try:
+            return queue.counts()
+        finally:
+            queue.close()
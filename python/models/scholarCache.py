@@ -0,0 +1,192 @@
+import json
+import sqlite3
+import threading
+import time
+
+class ScholarCache:
+    def __init__(
+        self,
+        path: str = "scholar_cache.sqlite3",
+        ttl: float = 24 * 60 * 60,
+        max_entries: int = 1000,
+        max_bytes: int = None,
+    ):
+        if ttl is not None and ttl <= 0:
+            raise ValueError("TTL must be positive or None.")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("Max entries must be at least 1 or None.")
+
+        self.__ttl = ttl
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__lock = threading.Lock()
+
+        # One connection shared by the service threads, guarded by the lock above
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                papers TEXT NOT NULL,
+                count INTEGER NOT NULL,
+                complete INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+        )
+        # Snapshots are the last known state of a profile for incremental refresh, they never expire
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                key TEXT PRIMARY KEY,
+                papers TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.__connection.commit()
+
+    # -------------------- Keys --------------------
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        if not isinstance(query, str) or not query.strip():
+            raise ValueError("Query cannot be empty or None.")
+        return " ".join(query.lower().split())
+
+    def make_key(self, query: str, variant: str = "") -> str:
+        return f"{variant}|{self.normalize_query(query)}"
+
+    # -------------------- Lookup --------------------
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.__ttl is not None and now - created_at > self.__ttl
+
+    def get(self, query: str, limit: int, variant: str = ""):
+        key = self.make_key(query, variant)
+        now = time.time()
+
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT papers, count, complete, created_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            papers, count, complete, created_at = row
+            if self._is_expired(created_at, now):
+                self.__connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.__connection.commit()
+                return None
+
+            # A smaller limit is served from the stored prefix, a larger one only if nothing more exists;
+            # an empty entry is never an answer, it usually stands for a blocked or failed scrape
+            if not count or (count < limit and not complete):
+                return None
+
+            self.__connection.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.__connection.commit()
+
+        return json.loads(papers)[:limit]
+
+    # -------------------- Store --------------------
+    def put(self, query: str, papers: list, limit: int, variant: str = ""):
+        key = self.make_key(query, variant)
+        data = json.dumps(papers, ensure_ascii=False)
+        now = time.time()
+
+        with self.__lock:
+            self.__connection.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (key, papers, count, complete, size, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, data, len(papers), int(0 < len(papers) < limit), len(data), now, now),
+            )
+            self._evict(now)
+            self.__connection.commit()
+
+    def invalidate(self, query: str, variant: str = ""):
+        with self.__lock:
+            self.__connection.execute(
+                "DELETE FROM entries WHERE key = ?", (self.make_key(query, variant),)
+            )
+            self.__connection.commit()
+
+    # -------------------- Snapshots --------------------
+    def get_snapshot(self, query: str, variant: str = ""):
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT papers FROM snapshots WHERE key = ?",
+                (self.make_key(query, variant),),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_snapshot(self, query: str, papers: list, variant: str = ""):
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO snapshots (key, papers, updated_at) VALUES (?, ?, ?)",
+                (self.make_key(query, variant), json.dumps(papers, ensure_ascii=False), time.time()),
+            )
+            self.__connection.commit()
+
+    # -------------------- Eviction --------------------
+    def _evict(self, now: float):
+        if self.__ttl is not None:
+            self.__connection.execute(
+                "DELETE FROM entries WHERE created_at < ?", (now - self.__ttl,)
+            )
+
+        if self.__max_entries is not None:
+            self.__connection.execute(
+                """
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.__max_entries,),
+            )
+
+        if self.__max_bytes is not None:
+            # Keep the most recently used entries that fit in the byte budget
+            total = 0
+            stale = []
+            for key, size in self.__connection.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at DESC"
+            ):
+                total += size
+                if total > self.__max_bytes:
+                    stale.append((key,))
+            self.__connection.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+    def clear(self):
+        with self.__lock:
+            self.__connection.execute("DELETE FROM entries")
+            self.__connection.execute("DELETE FROM snapshots")
+            self.__connection.commit()
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __repr__(self) -> str:
+        return (
+            f"ScholarCache("
+            f"ttl={self.__ttl}, "
+            f"max_entries={self.__max_entries}, "
+            f"max_bytes={self.__max_bytes}"
+            f")"
+        )
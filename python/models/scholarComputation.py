@@ -1,19 +1,90 @@
-from nltk.stem import PorterStemmer, WordNetLemmatizer
-from nltk.corpus import stopwords as nltk_stopwords
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
-from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
-from sklearn.metrics import jaccard_score
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.preprocessing import binarize
-import numpy as np
+# NLTK, Sastrawi, sklearn and numpy are imported where they are first needed, a plain
+# scrape without ranking never pays for them
+from contextlib import nullcontext
+from functools import lru_cache
+import re
 
 language_pack = ["en", "id"]
 
+# Built on first access by __getattr__, only for the language in use
+language_resources = ("stemmer", "lemmatizer", "stopword", "stopword_set")
+
+# Same tokens CountVectorizer keeps, anything shorter would be dropped there anyway
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+# Function words that only occur in one of the languages; titles are short, so a single hit usually decides
+LANGUAGE_HINTS = {
+    "en": frozenset((
+        "the of and for in on with using based to an by from is are its into via towards through "
+        "between among under over at as or this that these their new study case approach"
+    ).split()),
+    "id": frozenset((
+        "dan yang di untuk dengan pada dari dalam ini itu ke sebagai terhadap atau oleh berbasis "
+        "menggunakan melalui antara tentang bagi serta studi kasus penerapan pengaruh analisis sistem"
+    ).split()),
+}
+
+# Indonesian affixes (meng-, pen-, ber-, -kan, -nya, pe-an) break ties on titles without function words
+INDONESIAN_AFFIX_PATTERN = re.compile(r"^(?:me[mn]g?|pe[mn]g?|ber|ter|di)\w{3,}|\w{3,}(?:kan|nya)$|^pe\w{3,}an$")
+
+# Worker processes build one instance per language once and reuse its token cache for every chunk
+_worker_computations = {}
+_worker_options = {}
+
+def _init_preprocess_worker(cache_size: int, stem_cache_path: str = None):
+    _worker_options.update(cache_size=cache_size, stem_cache_path=stem_cache_path)
+
+def _get_worker_computation(language: str):
+    if language not in _worker_computations:
+        stem_cache = None
+        if _worker_options.get("stem_cache_path"):
+            from models.scholarStemCache import open_stem_cache
+            stem_cache = open_stem_cache(_worker_options["stem_cache_path"])
+        _worker_computations[language] = ScholarComputation(
+            language=language, cache_size=_worker_options.get("cache_size", 100_000), stem_cache=stem_cache
+        )
+    return _worker_computations[language]
+
+def _preprocess_chunk(task):
+    # Stems the worker had to compute travel back, the parent writes them to the shared cache once
+    language, documents = task
+    computation = _get_worker_computation(language)
+    return computation.preprocess_documents(documents), computation.pop_new_stems()
+
 class ScholarComputation:
-    def __init__(self, language: str = "en"):
+    def __init__(
+        self,
+        language: str = "en",
+        index=None,
+        cache_size: int = 100_000,
+        metrics=None,
+        semantic=None,
+        stem_cache=None,
+        workers: int = None,
+        detect_language: bool = False,
+    ):
         self.set_language(language)
+        self.cache_size = cache_size
+        self.__computations = {}
+        self.set_stem_cache(stem_cache)
         self.set_preprocessor()
+        self.set_preprocessing(workers, detect_language)
+        self.vectorizer = None
+        self.tfidf_transformer = None
+        self.vocabulary = None
+        self.set_index(index)
+        self.set_metrics(metrics)
+        self.set_semantic_index(semantic)
+
+    # ---------------------------------------------------------------------------------------------
+    # Metrics
+    # ---------------------------------------------------------------------------------------------
+    def set_metrics(self, metrics):
+        # Optional ScholarMetrics, every pipeline step is timed into it
+        self.metrics = metrics
+
+    def _timer(self, stage: str):
+        return self.metrics.timer(stage) if self.metrics else nullcontext()
 
     # ---------------------------------------------------------------------------------------------
     # Check Text
@@ -37,35 +108,168 @@ class ScholarComputation:
             raise Exception("Language not supported")
         self.__language = language
 
+    def get_language(self) -> str:
+        return self.__language
+
+    # ---------------------------------------------------------------------------------------------
+    # Language Detection
+    # ---------------------------------------------------------------------------------------------
+    def set_preprocessing(self, workers: int = None, detect_language: bool = False):
+        # Defaults for preprocess(), so callers such as main.rank_papers need no extra arguments
+        self.workers = workers
+        self.detect_language_enabled = detect_language
+
+    def detect_language(self, text: str) -> str:
+        tokens = TOKEN_PATTERN.findall(text.lower()) if isinstance(text, str) else []
+        english = sum(token in LANGUAGE_HINTS["en"] for token in tokens)
+        indonesian = sum(token in LANGUAGE_HINTS["id"] for token in tokens)
+        if english == indonesian:
+            indonesian += sum(bool(INDONESIAN_AFFIX_PATTERN.match(token)) for token in tokens) > len(tokens) / 3
+        if english == indonesian:
+            # Nothing to go on, the configured language decides
+            return self.__language
+        return "en" if english > indonesian else "id"
+
+    def get_computation(self, language: str):
+        # Sibling instance for the other language, sharing cache settings and the stem cache
+        if language == self.__language:
+            return self
+        if language not in self.__computations:
+            self.__computations[language] = ScholarComputation(
+                language=language, cache_size=self.cache_size, stem_cache=self.stem_cache
+            )
+        return self.__computations[language]
+
     # ---------------------------------------------------------------------------------------------
     # Pre-Processing
     # ---------------------------------------------------------------------------------------------
     def pre_processor_indonesia(self):
+        from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+        from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+
         stemmer_factory = StemmerFactory()
         self.stemmer = stemmer_factory.create_stemmer()
+        # ArrayDictionary keeps its ~30k root words in a list and scans it on every affix check,
+        # a set gives the same answers; left alone if a Sastrawi release changes the internals
+        dictionary = getattr(getattr(self.stemmer, "delegatedStemmer", None), "dictionary", None)
+        if isinstance(getattr(dictionary, "words", None), list):
+            dictionary.words = set(dictionary.words)
         
         stopword_factory = StopWordRemoverFactory()
         self.stopword = stopword_factory.create_stop_word_remover()
+        self.stopword_set = set(stopword_factory.get_stop_words())
 
     def pre_processor_english(self):
+        from config.nltk_config import ensure_nltk_data
+        from nltk.stem import PorterStemmer, WordNetLemmatizer
+        from nltk.corpus import stopwords as nltk_stopwords
+
+        try:
+            ensure_nltk_data()
+        except Exception:
+            pass
+
         self.stemmer = PorterStemmer()
         self.lemmatizer = WordNetLemmatizer()
         self.stopword = set(nltk_stopwords.words("english"))
+        self.stopword_set = self.stopword
 
-    def set_preprocessor(self):
+    def load_language_resources(self):
         if self.__language == "en":
             self.pre_processor_english()
         elif self.__language == "id":
             self.pre_processor_indonesia()
+        self.__resources_loaded = True
+
+    def __getattr__(self, name):
+        # Only called for missing attributes, so after the first load this costs nothing
+        if name in language_resources and not self.__dict__.get("_ScholarComputation__resources_loaded"):
+            self.load_language_resources()
+            return getattr(self, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def set_preprocessor(self):
+        # Drop resources of a previous language, the next access loads the current one
+        for name in language_resources:
+            self.__dict__.pop(name, None)
+        self.__resources_loaded = False
+
+        # Titles repeat most of their vocabulary, so each distinct token is normalised only once
+        self.normalize_token = lru_cache(maxsize=self.cache_size)(self._normalize_token)
+        self.__stems = None
+        self.__new_stems = {}
+
+    def _normalize_token(self, token: str) -> str:
+        stems = self._get_stems()
+        if stems is not None:
+            stem = stems.get(token)
+            if stem is not None:
+                return stem
+
+        if self.__language == "en":
+            stem = self.lemmatizer.lemmatize(token)
+        else:
+            stem = self.stemmer.stem(token)
+
+        if stems is not None:
+            stems[token] = self.__new_stems[token] = stem
+        return stem
+
+    def get_cache_info(self):
+        return self.normalize_token.cache_info()
+
+    def clear_cache(self):
+        self.normalize_token.cache_clear()
+
+    # ---------------------------------------------------------------------------------------------
+    # Stem Cache
+    # ---------------------------------------------------------------------------------------------
+    def set_stem_cache(self, stem_cache):
+        # Optional ScholarStemCache, loaded on the first token that misses the in-memory cache
+        self.stem_cache = stem_cache
+        self.__stems = None
+        self.__new_stems = {}
+        for computation in self.__computations.values():
+            computation.set_stem_cache(stem_cache)
+
+    def get_stem_cache(self):
+        return self.stem_cache
+
+    def _get_stems(self):
+        if self.stem_cache is None:
+            return None
+        if self.__stems is None:
+            self.__stems = self.stem_cache.load(self.__language)
+        return self.__stems
+
+    def add_stems(self, stems: dict):
+        # Stems computed in a worker process, kept here until save_stems()
+        if self.stem_cache is None or not stems:
+            return
+        self._get_stems().update(stems)
+        self.__new_stems.update(stems)
+
+    def pop_new_stems(self) -> dict:
+        stems, self.__new_stems = self.__new_stems, {}
+        return stems
+
+    def save_stems(self) -> int:
+        if self.stem_cache is None:
+            return 0
+        saved = self.stem_cache.update(self.__language, self.pop_new_stems())
+        for computation in self.__computations.values():
+            saved += computation.save_stems()
+        return saved
 
     # ---------------------------------------------------------------------------------------------
     # Case Folding
     # ---------------------------------------------------------------------------------------------
     def case_folding(self, documents):
         if isinstance(documents, list):
-            for doc in documents:
-                self.check_text(doc)
-            return [doc.lower() for doc in documents]
+            with self._timer("case_folding"):
+                for doc in documents:
+                    self.check_text(doc)
+                return [doc.lower() for doc in documents]
         else:
             raise Exception("Documents must be string or list of strings")
     
@@ -82,13 +286,11 @@ class ScholarComputation:
     # ---------------------------------------------------------------------------------------------
     def lemmatization(self, text):
         if isinstance(text, list):
-            return [self.lemmatization(t) for t in text]
+            with self._timer("lemmatization"):
+                return [self.lemmatization(t) for t in text]
 
         self.check_text(text)
-        if self.__language == "en":
-            return self.lemmatizer.lemmatize(text)
-        elif self.__language == "id":
-            return self.stemmer.stem(text)
+        return " ".join(self.normalize_token(token) for token in text.split())
 
     # ---------------------------------------------------------------------------------------------
     # Stopword Removal
@@ -103,59 +305,224 @@ class ScholarComputation:
 
     def stopword_removal(self, documents):
         if isinstance(documents, list):
-            return [self.stopword_removal(doc) for doc in documents]
+            with self._timer("stopword_removal"):
+                return [self.stopword_removal(doc) for doc in documents]
         self.check_text(documents)
         if self.__language == "en":
             return self.stopword_removal_english(documents)
         elif self.__language == "id":
             return self.stopword_removal_indonesia(documents)
 
+    # ---------------------------------------------------------------------------------------------
+    # Fused Pipeline
+    # ---------------------------------------------------------------------------------------------
+    def preprocess_text(self, text: str) -> str:
+        if not isinstance(text, str):
+            raise Exception("Text must be a string")
+
+        # One pass: tokenize, fold case, drop stopwords and normalise each token through the cache
+        stopword_set = self.stopword_set
+        normalize_token = self.normalize_token
+        return " ".join(
+            normalize_token(token)
+            for token in TOKEN_PATTERN.findall(text.lower())
+            if token not in stopword_set
+        )
+
+    def preprocess_documents(self, documents) -> list:
+        return [self.preprocess_text(doc) for doc in documents]
+
+    def preprocess(self, documents, workers: int = None, chunk_size: int = 1000, detect_language: bool = None):
+        if not isinstance(documents, list):
+            raise Exception("Documents must be a list of strings")
+
+        workers = self.workers if workers is None else workers
+        detect_language = self.detect_language_enabled if detect_language is None else detect_language
+
+        # One group per language, so a mixed corpus goes through each pipeline in the same call
+        groups = {}
+        if detect_language:
+            for i, doc in enumerate(documents):
+                groups.setdefault(self.detect_language(doc), []).append(i)
+        else:
+            groups[self.__language] = range(len(documents))
+
+        with self._timer("preprocess"):
+            if not workers or workers < 2 or len(documents) <= chunk_size:
+                processed = self._preprocess_groups(documents, groups)
+            else:
+                processed = self._preprocess_parallel(documents, groups, workers, chunk_size)
+        self.save_stems()
+        return processed
+
+    def _preprocess_groups(self, documents, groups: dict) -> list:
+        if len(groups) == 1 and self.__language in groups:
+            return self.preprocess_documents(documents)
+
+        processed = [None] * len(documents)
+        for language, indices in groups.items():
+            computation = self.get_computation(language)
+            for i, doc in zip(indices, computation.preprocess_documents([documents[i] for i in indices])):
+                processed[i] = doc
+        return processed
+
+    def _preprocess_parallel(self, documents, groups: dict, workers: int, chunk_size: int) -> list:
+        # Pulls in multiprocessing, which every CLI start would otherwise pay for
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Chunks never mix languages, each worker builds a stemmer per language only once
+        tasks, positions = [], []
+        for language, indices in groups.items():
+            indices = list(indices)
+            for start in range(0, len(indices), chunk_size):
+                chunk = indices[start:start + chunk_size]
+                tasks.append((language, [documents[i] for i in chunk]))
+                positions.append(chunk)
+
+        stem_cache_path = self.stem_cache.get_path() if self.stem_cache is not None else None
+        processed = [None] * len(documents)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_preprocess_worker,
+            initargs=(self.cache_size, stem_cache_path),
+        ) as executor:
+            for (language, _), chunk, (docs, stems) in zip(tasks, positions, executor.map(_preprocess_chunk, tasks)):
+                self.get_computation(language).add_stems(stems)
+                for i, doc in zip(chunk, docs):
+                    processed[i] = doc
+        return processed
+
+    # ---------------------------------------------------------------------------------------------
+    # Corpus Index
+    # ---------------------------------------------------------------------------------------------
+    def set_index(self, index):
+        # With a persistent ScholarIndex, TF-IDF uses the accumulated corpus instead of refitting
+        self.index = index
+
+    def get_index(self):
+        return self.index
+
     # ---------------------------------------------------------------------------------------------
     # Feature Weighting (TF-IDF)
     # ---------------------------------------------------------------------------------------------
-    def train_tfidf_weighting(self, documents):
-        self.vectorizer = CountVectorizer()
-        count_matrix = self.vectorizer.fit_transform(documents)
-        self.tfidf_transformer = TfidfTransformer()
-        tfidf_matrix = self.tfidf_transformer.fit_transform(count_matrix)
+    def train_tfidf_weighting(self, documents, keys=None, payloads=None):
+        if self.index is not None:
+            with self._timer("tfidf_fit"):
+                self.index.add_documents(documents, keys=keys, payloads=payloads)
+                tfidf_matrix = self.index.transform(documents)
+            self.set_vectorizer_vocabulary(tfidf_matrix)
+            return tfidf_matrix
+
+        from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+
+        with self._timer("tfidf_fit"):
+            self.vectorizer = CountVectorizer()
+            count_matrix = self.vectorizer.fit_transform(documents)
+            self.tfidf_transformer = TfidfTransformer()
+            tfidf_matrix = self.tfidf_transformer.fit_transform(count_matrix)
+            # Feature names are read once per fit, only the top terms are ever looked up
+            self.vocabulary = self.vectorizer.get_feature_names_out()
         self.set_vectorizer_vocabulary(tfidf_matrix)
         return tfidf_matrix
 
 
     def apply_tfidf_weighting(self, documents):
+        if self.index is not None:
+            with self._timer("tfidf_transform"):
+                return self.index.transform(documents)
         if self.vectorizer is None or self.tfidf_transformer is None:
             raise RuntimeError(
                 "TF-IDF model not trained. Call train_tfidf_weighting() first."
             )
-        count_matrix = self.vectorizer.transform(documents)
-        tfidf_matrix = self.tfidf_transformer.transform(count_matrix)
+        with self._timer("tfidf_transform"):
+            count_matrix = self.vectorizer.transform(documents)
+            tfidf_matrix = self.tfidf_transformer.transform(count_matrix)
         return tfidf_matrix
 
     def set_vectorizer_vocabulary(self,tfidf_matrix,method = "mean", top_n=10):
-        if self.vectorizer is None:
-            raise RuntimeError(
-                "TF-IDF model not trained. Call train_tfidf_weighting() first."
-            )
-        self.vocabulary = self.vectorizer.get_feature_names_out().tolist()
-        
-        if method == "mean":
-            computed_word = np.asarray(tfidf_matrix.mean(axis=0)).ravel()
-        elif method == "sum":
-            computed_word = np.asarray(tfidf_matrix.sum(axis=0)).ravel()
-        
-        top_indices = computed_word.argsort()[::-1][:top_n]
+        from models.scholarKeywords import ScholarKeywordExtractor
+
+        if self.index is not None:
+            get_term = self.index.get_term
+        else:
+            if self.vectorizer is None or self.vocabulary is None:
+                raise RuntimeError(
+                    "TF-IDF model not trained. Call train_tfidf_weighting() first."
+                )
+            get_term = lambda i: str(self.vocabulary[i])
+
+        with self._timer("top_keywords"):
+            # Column sums straight from the CSR arrays, then a partial sort for the n best
+            computed_word = ScholarKeywordExtractor.column_scores(tfidf_matrix, method)
+            top_indices = ScholarKeywordExtractor.top_terms(computed_word, top_n)
         self.top_word = [
-            (self.vocabulary[i], computed_word[i])
+            (get_term(i), computed_word[i])
             for i in top_indices
+            if computed_word[i] > 0
         ]
-    
+
     # ---------------------------------------------------------------------------------------------
     # Similarity Measures
     # ---------------------------------------------------------------------------------------------
-    def calculate_similarity(self, query, documents):
+    def calculate_similarity(self, query, documents=None):
+        # Without explicit documents, score against every document in the index (see ScholarIndex.get_keys)
+        if documents is None:
+            if self.index is None:
+                raise RuntimeError("No documents given and no index attached.")
+            with self._timer("similarity"):
+                return self.index.score(query)
+
+        if self.index is not None and query.shape[1] != documents.shape[1]:
+            # The shared index may have grown new terms between the two transforms
+            width = max(query.shape[1], documents.shape[1])
+            query = query.copy()
+            documents = documents.copy()
+            query.resize((query.shape[0], width))
+            documents.resize((documents.shape[0], width))
+
         if query.shape[1] != documents.shape[1]:
             raise Exception("Query and documents vector size mismatch")
-        similarities = cosine_similarity(query, documents)
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        with self._timer("similarity"):
+            similarities = cosine_similarity(query, documents)
         return similarities.flatten()
 
+    def retrieve_top_k(self, query, top_k: int = 10):
+        # Best k (key, score) pairs from the index postings, without scoring the whole corpus
+        if self.index is None:
+            raise RuntimeError("Top-k retrieval needs an attached index.")
+        with self._timer("top_k_retrieval"):
+            return self.index.search(query, top_k)
+
+    # ---------------------------------------------------------------------------------------------
+    # Semantic Ranking
+    # ---------------------------------------------------------------------------------------------
+    def set_semantic_index(self, semantic, weight: float = 0.5):
+        # Optional ScholarSemanticIndex, its cosine is blended with the TF-IDF one by weight
+        if not 0 <= weight <= 1:
+            raise ValueError("Semantic weight must be between 0 and 1.")
+        self.semantic = semantic
+        self.semantic_weight = weight
+
+    def get_semantic_index(self):
+        return self.semantic
+
+    def semantic_similarity(self, query: str, documents: list):
+        if self.semantic is None:
+            raise RuntimeError("Semantic similarity needs an attached semantic index.")
+        with self._timer("semantic_similarity"):
+            vectors = self.semantic.encode([query] + list(documents))
+            return vectors[1:] @ vectors[0]
+
+    def blend_similarity(self, lexical, semantic):
+        return (1 - self.semantic_weight) * lexical + self.semantic_weight * semantic
+
+    def retrieve_semantic(self, query: str, top_k: int = 10):
+        # Nearest (key, score) pairs over every stored paper through the IVF lists
+        if self.semantic is None:
+            raise RuntimeError("Semantic retrieval needs an attached semantic index.")
+        with self._timer("semantic_retrieval"):
+            return self.semantic.search([query], top_k)[0]
+
         
@@ -0,0 +1,225 @@
+# Project models
+from models.scholarPaper import ScholarPaper
+
+import re
+import zlib
+
+import numpy as np
+
+# Permutations are (a * x + b) mod p on 32-bit shingle hashes, truncated back to 32 bits
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Signature value of papers without shingles, above every real hash so they never share a bucket
+_EMPTY = np.iinfo(np.uint64).max
+
+merge_pack = ["max", "sum"]
+
+class ScholarDeduplicator:
+    __WORD_PATTERN = re.compile(r"\w+")
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        threshold: float = 0.7,
+        shingle_size: int = 2,
+        citations: str = "max",
+        computer=None,
+        seed: int = 1,
+        chunk_size: int = 2048,
+    ):
+        if num_perm % bands:
+            raise ValueError("Number of permutations must be divisible by the number of bands.")
+        if not 0 < threshold <= 1:
+            raise ValueError("Threshold must be in (0, 1].")
+        if citations not in merge_pack:
+            raise ValueError(f"Citations must be merged with one of {merge_pack}.")
+
+        self.__num_perm = num_perm
+        self.__bands = bands
+        self.__rows = num_perm // bands
+        self.__threshold = threshold
+        self.__shingle_size = shingle_size
+        self.__citations = citations
+        self.__chunk_size = chunk_size
+
+        # Optional ScholarComputation, titles then go through the same case folding and stopword removal as ranking
+        self.__computer = computer
+
+        # One (a, b) pair per permutation; a fixed seed keeps signatures comparable between runs
+        rng = np.random.default_rng(seed)
+        self.__a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self.__b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    # -------------------- Getters --------------------
+    def get_threshold(self) -> float:
+        return self.__threshold
+
+    def get_bands(self) -> int:
+        return self.__bands
+
+    # -------------------- Shingles --------------------
+    @staticmethod
+    def _as_dict(paper) -> dict:
+        return paper.to_dict() if isinstance(paper, ScholarPaper) else paper
+
+    def _normalize_titles(self, titles: list) -> list:
+        if self.__computer is None:
+            return [" ".join(self.__WORD_PATTERN.findall(title.lower())) for title in titles]
+
+        # check_text rejects empty titles, those simply get no shingles
+        filled = [i for i, title in enumerate(titles) if title and title.strip()]
+        normalized = [""] * len(titles)
+        cleaned = self.__computer.stopword_removal(self.__computer.case_folding([titles[i] for i in filled]))
+        for i, title in zip(filled, cleaned):
+            normalized[i] = " ".join(self.__WORD_PATTERN.findall(title))
+        return normalized
+
+    def _shingles(self, title: str, authors: str) -> set:
+        # Words plus word n-grams: a subtitle or one changed word still leaves most shingles shared,
+        # and a title has a handful of them instead of one per character
+        words = title.split()
+        shingles = set()
+        for n in range(1, self.__shingle_size + 1):
+            shingles.update(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+
+        # Author surnames only: "J Siswantoro" and "Joko Siswantoro" are the same person
+        for author in authors.split(","):
+            words = self.__WORD_PATTERN.findall(author.lower())
+            if words and words[-1] != "...":
+                shingles.add(f"@{words[-1]}")
+        return shingles
+
+    def shingle_papers(self, papers) -> list:
+        records = [self._as_dict(paper) for paper in papers]
+        titles = self._normalize_titles([record.get("title") or "" for record in records])
+        return [
+            self._shingles(title, record.get("authors") or "") if title else set()
+            for title, record in zip(titles, records)
+        ]
+
+    # -------------------- MinHash --------------------
+    def signatures(self, shingle_sets: list) -> np.ndarray:
+        # One row per paper, papers without shingles keep _EMPTY
+        signatures = np.full((len(shingle_sets), self.__num_perm), _EMPTY, dtype=np.uint64)
+
+        # Chunked so the (shingles x permutations) block stays small on large corpora
+        for start in range(0, len(shingle_sets), self.__chunk_size):
+            chunk = shingle_sets[start:start + self.__chunk_size]
+            lengths = np.array([len(shingles) for shingles in chunk])
+            if not lengths.sum():
+                continue
+
+            hashes = np.fromiter(
+                (zlib.crc32(s.encode("utf-8")) for shingles in chunk for s in shingles),
+                dtype=np.uint64,
+                count=int(lengths.sum()),
+            )
+            # The uint64 product wraps around on overflow, which is part of the mixing
+            with np.errstate(over="ignore"):
+                permuted = (hashes[:, None] * self.__a + self.__b) % np.uint64(_PRIME) & np.uint64(_MAX_HASH)
+
+            filled = np.flatnonzero(lengths)
+            offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[filled]
+            signatures[start + filled] = np.minimum.reduceat(permuted, offsets, axis=0)
+        return signatures
+
+    # -------------------- LSH --------------------
+    def candidate_pairs(self, signatures: np.ndarray) -> np.ndarray:
+        # Papers sharing a band bucket become candidates; buckets come from one sort per band, not a Python dict.
+        # Each member is paired with the first paper of its bucket only, so the candidates stay linear in
+        # the number of papers; a near-duplicate missed that way usually meets its leader in another band
+        filled = np.flatnonzero(np.any(signatures != _EMPTY, axis=1))
+        if len(filled) < 2:
+            return np.empty((0, 2), dtype=np.int64)
+
+        # uint64 arithmetic wraps around, which is fine for a bucket key; collisions are caught by the verification
+        mixers = np.random.default_rng(0).integers(1, _MAX_HASH, size=self.__rows, dtype=np.uint64) | np.uint64(1)
+        pairs = []
+        for band in range(self.__bands):
+            with np.errstate(over="ignore"):
+                keys = signatures[filled, band * self.__rows:(band + 1) * self.__rows] @ mixers
+            order = np.argsort(keys, kind="stable")
+            ordered = keys[order]
+
+            is_leader = np.concatenate(([True], ordered[1:] != ordered[:-1]))
+            leaders = np.flatnonzero(is_leader)[np.cumsum(is_leader) - 1]
+            followers = np.flatnonzero(~is_leader)
+            pairs.append(np.stack((filled[order[leaders[followers]]], filled[order[followers]]), axis=1))
+
+        return np.unique(np.concatenate(pairs), axis=0)
+
+    def find_clusters(self, papers) -> list:
+        shingle_sets = self.shingle_papers(papers)
+        signatures = self.signatures(shingle_sets)
+
+        parent = list(range(len(shingle_sets)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Buckets only propose, the estimated Jaccard similarity (share of equal minima) decides
+        pairs = self.candidate_pairs(signatures)
+        for start in range(0, len(pairs), self.__chunk_size * 16):
+            chunk = pairs[start:start + self.__chunk_size * 16]
+            similar = np.mean(signatures[chunk[:, 0]] == signatures[chunk[:, 1]], axis=1) >= self.__threshold
+            for i, j in chunk[similar].tolist():
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        clusters = {}
+        for i in range(len(shingle_sets)):
+            clusters.setdefault(find(i), []).append(i)
+        # First occurrence order, like the papers came in
+        return sorted(clusters.values(), key=lambda members: members[0])
+
+    # -------------------- Merge --------------------
+    @staticmethod
+    def _citations(record: dict) -> int:
+        # Scraped rows hold "Cited by 12" strings, to_dict() output holds ints
+        return ScholarPaper.parse_citations(str(record.get("citations") or ""))
+
+    def merge(self, papers: list) -> dict:
+        records = [self._as_dict(paper) for paper in papers]
+
+        # The most cited version is usually the published one, its fields win
+        records.sort(key=self._citations, reverse=True)
+        merged = dict(records[0])
+        for record in records[1:]:
+            for field, value in record.items():
+                if value and not merged.get(field):
+                    merged[field] = value
+
+        citations = [self._citations(record) for record in records]
+        merged["citations"] = sum(citations) if self.__citations == "sum" else max(citations)
+        return merged
+
+    def deduplicate(self, papers, return_clusters: bool = False):
+        papers = list(papers)
+        clusters = self.find_clusters(papers)
+
+        merged = []
+        for members in clusters:
+            if len(members) == 1:
+                merged.append(papers[members[0]])
+                continue
+            record = self.merge([papers[i] for i in members])
+            merged.append(ScholarPaper.from_dict(record) if isinstance(papers[members[0]], ScholarPaper) else record)
+
+        return (merged, clusters) if return_clusters else merged
+
+    def __repr__(self) -> str:
+        return (
+            f"ScholarDeduplicator("
+            f"num_perm={self.__num_perm}, "
+            f"bands={self.__bands}, "
+            f"threshold={self.__threshold}, "
+            f"shingle_size={self.__shingle_size}, "
+            f"citations={self.__citations!r}"
+            f")"
+        )
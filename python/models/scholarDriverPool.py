@@ -0,0 +1,216 @@
+# Project models
+from models.scholarScraperConfig import ScholarScraperConfig
+
+from contextlib import contextmanager
+import threading
+import time
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"PooledDriver(pages={self.pages}, age={time.monotonic() - self.created_at:.1f}s)"
+
+
+class ScholarDriverPool:
+    def __init__(
+        self,
+        config: ScholarScraperConfig = None,
+        max_size: int = 2,
+        max_pages: int = 200,
+        max_memory_mb: int = None,
+        prelaunch: int = 0,
+    ):
+        if max_size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        if prelaunch > max_size:
+            raise ValueError("Cannot prelaunch more drivers than the pool size.")
+
+        self.config = config or ScholarScraperConfig(headless=True)
+        self.__max_size = max_size
+        self.__max_pages = max_pages
+        self.__max_memory_mb = max_memory_mb
+
+        self.__idle = []
+        self.__live = 0
+        self.__closed = False
+        self.__lock = threading.Condition()
+
+        for _ in range(prelaunch):
+            self.__idle.append(self._launch())
+            self.__live += 1
+
+    # -------------------- Getters --------------------
+    def get_max_size(self) -> int:
+        return self.__max_size
+
+    def get_live_count(self) -> int:
+        return self.__live
+
+    def get_idle_count(self) -> int:
+        return len(self.__idle)
+
+    # -------------------- Driver Lifecycle --------------------
+    def _launch(self) -> PooledDriver:
+        from selenium import webdriver
+
+        if self.config._is_verbose:
+            print("Launching pooled Selenium WebDriver...")
+        return PooledDriver(webdriver.Chrome(options=self.config.apply_to_chrome_options()))
+
+    def _quit(self, session: PooledDriver):
+        if self.config._is_verbose:
+            print(f"Retiring pooled WebDriver {session!r}")
+        try:
+            session.driver.quit()
+        except Exception:
+            # quit() failed half way, make sure chromedriver does not linger as a zombie
+            try:
+                session.driver.service.stop()
+            except Exception:
+                pass
+
+    # -------------------- Health Check --------------------
+    def _memory_mb(self, session: PooledDriver):
+        try:
+            import psutil
+        except ImportError:
+            return None
+
+        try:
+            process = psutil.Process(session.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def is_healthy(self, session: PooledDriver) -> bool:
+        try:
+            if not session.driver.window_handles:
+                return False
+            url = session.driver.current_url
+        except Exception:
+            return False
+
+        if url not in ("data:,", "about:blank") and "scholar.google.com" not in url:
+            return False
+
+        return True
+
+    def needs_recycle(self, session: PooledDriver) -> bool:
+        if self.__max_pages and session.pages >= self.__max_pages:
+            return True
+
+        if self.__max_memory_mb:
+            memory = self._memory_mb(session)
+            if memory is not None and memory >= self.__max_memory_mb:
+                return True
+
+        return False
+
+    # -------------------- Checkout --------------------
+    def acquire(self, timeout: float = None) -> PooledDriver:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            # Only the bookkeeping happens under the lock, a slow or hung driver must not block
+            # every other acquire and release while it is checked, quit or launched
+            with self.__lock:
+                while True:
+                    if self.__closed:
+                        raise RuntimeError("Driver pool is closed.")
+
+                    # Most recently used first, it is the one most likely still warm
+                    if self.__idle:
+                        session = self.__idle.pop()
+                        break
+
+                    if self.__live < self.__max_size:
+                        # The slot is reserved now, the driver is launched below
+                        self.__live += 1
+                        session = None
+                        break
+
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("No WebDriver available in pool.")
+                    self.__lock.wait(remaining)
+
+            if session is None:
+                try:
+                    return self._launch()
+                except Exception:
+                    with self.__lock:
+                        self.__live -= 1
+                        self.__lock.notify()
+                    raise
+
+            # Still counted as live while it is checked, so no one launches a driver in its place
+            if self.is_healthy(session):
+                return session
+            self._quit(session)
+            with self.__lock:
+                self.__live -= 1
+                self.__lock.notify()
+
+    def release(self, session: PooledDriver, pages: int = 0, discard: bool = False):
+        session.pages += pages
+        retire = discard or self.__closed or self.needs_recycle(session)
+
+        if not retire:
+            try:
+                # Drop the previous query's page so the next user starts clean
+                session.driver.get("about:blank")
+            except Exception:
+                retire = True
+
+        with self.__lock:
+            if retire:
+                self.__live -= 1
+            else:
+                self.__idle.append(session)
+            self.__lock.notify()
+
+        if retire:
+            self._quit(session)
+
+    @contextmanager
+    def session(self, timeout: float = None):
+        session = self.acquire(timeout)
+        try:
+            yield session
+        except Exception:
+            self.release(session, discard=True)
+            raise
+        else:
+            self.release(session)
+
+    def close(self):
+        with self.__lock:
+            self.__closed = True
+            idle, self.__idle = self.__idle, []
+            self.__live -= len(idle)
+            self.__lock.notify_all()
+
+        for session in idle:
+            self._quit(session)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __repr__(self) -> str:
+        return (
+            f"ScholarDriverPool("
+            f"max_size={self.__max_size}, "
+            f"live={self.__live}, "
+            f"idle={len(self.__idle)}, "
+            f"max_pages={self.__max_pages}, "
+            f"max_memory_mb={self.__max_memory_mb}"
+            f")"
+        )
@@ -0,0 +1,199 @@
+# Project models
+from models.scholarPaper import ScholarPaper
+
+from contextlib import contextmanager
+import csv
+import json
+import os
+
+format_pack = ["ndjson", "json", "csv", "parquet", "arrow"]
+
+class ScholarExporter:
+    FIELDS = (
+        "title", "link", "description", "authors", "journal",
+        "year", "publication_date", "citations", "citation_id", "similarity",
+    )
+
+    def __init__(self, fields=None, use_orjson: bool = True, batch_size: int = 65536):
+        fields = tuple(fields or self.FIELDS)
+        unknown = [field for field in fields if field not in self.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1.")
+
+        self.__fields = fields
+        self.__batch_size = batch_size
+
+        # orjson is optional, several times faster than json.dumps on large exports
+        self.__orjson = None
+        if use_orjson:
+            try:
+                import orjson
+                self.__orjson = orjson
+            except ImportError:
+                pass
+
+    # -------------------- Getters --------------------
+    def get_fields(self) -> tuple:
+        return self.__fields
+
+    def uses_orjson(self) -> bool:
+        return self.__orjson is not None
+
+    # -------------------- Rows --------------------
+    def iter_rows(self, papers):
+        # One tuple per paper in field order, nothing is collected up front
+        fields = self.__fields
+
+        if hasattr(papers, "get_column"):
+            # ScholarPaperBatch: convert whole columns once, then walk them row by row
+            columns = []
+            for field in fields:
+                if field == "similarity" and not papers.has_similarity():
+                    columns.append([None] * len(papers))
+                elif field == "year":
+                    # 0 marks a missing year in the column, exported as None like ScholarPaper.to_dict()
+                    columns.append([year or None for year in papers.get_column(field).tolist()])
+                else:
+                    columns.append(papers.get_column(field).tolist())
+            yield from zip(*columns)
+            return
+
+        for paper in papers:
+            if isinstance(paper, ScholarPaper):
+                paper = paper.to_dict()
+            yield tuple(paper.get(field) for field in fields)
+
+    @staticmethod
+    def detect_format(path: str) -> str:
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        if extension in ("jsonl", "ndjson"):
+            return "ndjson"
+        if extension in ("arrow", "feather", "ipc"):
+            return "arrow"
+        if extension in format_pack:
+            return extension
+        raise ValueError(f"Cannot infer export format from '{path}', use one of: {', '.join(format_pack)}")
+
+    @staticmethod
+    @contextmanager
+    def _open(target):
+        # Paths are opened and closed here, file objects (sys.stdout) are left open for the caller
+        if isinstance(target, (str, os.PathLike)):
+            with open(target, "w", encoding="utf-8", newline="") as file:
+                yield file
+        else:
+            yield target
+
+    # -------------------- Text Formats --------------------
+    def _encode(self, record: dict) -> str:
+        if self.__orjson is not None:
+            return self.__orjson.dumps(record).decode("utf-8")
+        return json.dumps(record, ensure_ascii=False)
+
+    def write_ndjson(self, papers, target) -> int:
+        fields = self.__fields
+        count = 0
+        with self._open(target) as file:
+            for row in self.iter_rows(papers):
+                file.write(self._encode(dict(zip(fields, row))) + "\n")
+                count += 1
+        return count
+
+    def write_json(self, papers, target) -> int:
+        # A single compact array, still written record by record
+        fields = self.__fields
+        count = 0
+        with self._open(target) as file:
+            file.write("[")
+            for row in self.iter_rows(papers):
+                file.write(("," if count else "") + self._encode(dict(zip(fields, row))))
+                count += 1
+            file.write("]\n")
+        return count
+
+    def write_csv(self, papers, target) -> int:
+        count = 0
+        with self._open(target) as file:
+            writer = csv.writer(file)
+            writer.writerow(self.__fields)
+            for row in self.iter_rows(papers):
+                writer.writerow(["" if value is None else value for value in row])
+                count += 1
+        return count
+
+    # -------------------- Columnar Formats --------------------
+    def _arrow_schema(self, pa):
+        types = {"year": pa.int32(), "citations": pa.int64(), "similarity": pa.float64()}
+        return pa.schema([(field, types.get(field, pa.string())) for field in self.__fields])
+
+    def _iter_record_batches(self, papers, pa, schema):
+        # Rows are buffered only up to batch_size, then flushed as one Arrow record batch
+        buffer = []
+        for row in self.iter_rows(papers):
+            buffer.append(row)
+            if len(buffer) >= self.__batch_size:
+                yield self._record_batch(buffer, pa, schema)
+                buffer = []
+        if buffer:
+            yield self._record_batch(buffer, pa, schema)
+
+    @staticmethod
+    def _record_batch(rows, pa, schema):
+        # Missing values (no year, no similarity) become Arrow nulls
+        return pa.RecordBatch.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(zip(*rows), schema)],
+            schema=schema,
+        )
+
+    @staticmethod
+    def _require_pyarrow():
+        try:
+            import pyarrow
+            return pyarrow
+        except ImportError:
+            raise RuntimeError("Parquet and Arrow export need pyarrow (pip install pyarrow).")
+
+    def write_parquet(self, papers, target, compression: str = "zstd") -> int:
+        pa = self._require_pyarrow()
+        import pyarrow.parquet as pq
+
+        schema = self._arrow_schema(pa)
+        count = 0
+        with pq.ParquetWriter(target, schema, compression=compression) as writer:
+            for batch in self._iter_record_batches(papers, pa, schema):
+                writer.write_batch(batch)
+                count += batch.num_rows
+        return count
+
+    def write_arrow(self, papers, target) -> int:
+        pa = self._require_pyarrow()
+
+        schema = self._arrow_schema(pa)
+        count = 0
+        with pa.ipc.new_file(target, schema) as writer:
+            for batch in self._iter_record_batches(papers, pa, schema):
+                writer.write_batch(batch)
+                count += batch.num_rows
+        return count
+
+    # -------------------- Dispatch --------------------
+    def export(self, papers, target, output_format: str = None) -> int:
+        if output_format is None:
+            if not isinstance(target, (str, os.PathLike)):
+                raise ValueError("Output format is required when exporting to a file object.")
+            output_format = self.detect_format(str(target))
+        if output_format not in format_pack:
+            raise ValueError(f"Unsupported export format: {output_format}")
+
+        return getattr(self, f"write_{output_format}")(papers, target)
+
+    def __repr__(self) -> str:
+        return (
+            f"ScholarExporter("
+            f"fields={list(self.__fields)}, "
+            f"orjson={self.uses_orjson()}, "
+            f"batch_size={self.__batch_size}"
+            f")"
+        )
@@ -0,0 +1,63 @@
+# Project models
+from models.scholarScheduler import ScholarScheduler, ScholarBlockedError
+
+class ScholarHttpClient:
+    USER_AGENT = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0.0.0 Safari/537.36"
+    )
+
+    def __init__(
+        self,
+        proxy: str = None,
+        timeout: float = 10,
+        pool_size: int = 4,
+        is_verbose: bool = False,
+        scheduler: ScholarScheduler = None,
+        archive=None,
+    ):
+        self.__timeout = timeout
+        # Set in record mode, every page fetched is also written to the archive
+        self.__archive = archive
+        self.__is_verbose = is_verbose
+        self.__scheduler = scheduler or ScholarScheduler(is_verbose=is_verbose)
+
+        # Only needed for this backend, Selenium-only installs do not have to ship requests
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.__session = requests.Session()
+        self.__session.headers.update({
+            "User-Agent": self.USER_AGENT,
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        # Keep-alive connections are reused across pages and detail fetches
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+
+        if proxy:
+            self.__session.proxies.update({"http": proxy, "https": proxy})
+
+    # -------------------- Status Check --------------------
+    @staticmethod
+    def is_blocked(response) -> bool:
+        return ScholarScheduler.is_throttled(response.url, response.text, response.status_code)
+
+    # -------------------- Fetching --------------------
+    def _fetch(self, url: str):
+        if self.__is_verbose:
+            print(f"GET {url}")
+        return self.__session.get(url, timeout=self.__timeout)
+
+    def get(self, url: str) -> str:
+        # Rate limited per host, throttled responses are retried with backoff before giving up
+        response = self.__scheduler.run(url, lambda: self._fetch(url), self.is_blocked)
+        response.raise_for_status()
+        if self.__archive is not None:
+            self.__archive.save(url, response.text, response.status_code)
+        return response.text
+
+    def close(self):
+        self.__session.close()
@@ -0,0 +1,451 @@
+from collections import Counter
+import heapq
+import json
+import math
+import re
+import sqlite3
+import threading
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+class ScholarIndex:
+    # Same tokens as sklearn's CountVectorizer default, so scores line up with the in-memory path
+    TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+    def __init__(self, path: str = "scholar_index.sqlite3"):
+        self.__lock = threading.RLock()
+
+        # Term dictionary and document frequencies, postings (term id -> {doc id: tf}) are read
+        # from SQLite the first time a query or an update needs the term
+        self.__terms = {}
+        self.__term_list = []
+        self.__df = []
+        self.__postings = []
+
+        # Document keys only, payloads stay on disk until asked for
+        self.__doc_keys = {}
+        self.__key_docs = {}
+
+        # Per document sums of tf^2, tf^2*a and tf^2*a^2 with a = 1 - log(1 + df), so that
+        # norm^2 = L^2*s0 + 2L*s1 + s2 for L = log(1 + N) follows the corpus size without a rebuild
+        self.__stats = {}
+        # Per term min over its documents of (s0 - tf^2) / tf^2, bounds the weight the term can reach
+        self.__rest = []
+        # Only ever raised, so idf bounds derived from it stay valid after removals
+        self.__max_df = 0
+
+        # Derived data, rebuilt lazily after the corpus changes
+        self.__rows = None
+        self.__positions = None
+        self.__norms = {}
+        self.__matrix = None
+
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS terms (
+                id INTEGER PRIMARY KEY,
+                term TEXT NOT NULL UNIQUE,
+                df INTEGER NOT NULL DEFAULT 0,
+                rest REAL
+            );
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                payload TEXT,
+                s0 REAL,
+                s1 REAL,
+                s2 REAL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term_id INTEGER NOT NULL,
+                doc_id INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term_id, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+            """
+        )
+        self._load()
+
+    # ---------------------------------------------------------------------------------------------
+    # Persistence
+    # ---------------------------------------------------------------------------------------------
+    def _load(self):
+        # Index files written before the weights were stored get them computed once
+        columns = {row[1] for row in self.__connection.execute("PRAGMA table_info(documents)")}
+        migrate = "s0" not in columns
+        if migrate:
+            self.__connection.executescript(
+                """
+                ALTER TABLE terms ADD COLUMN df INTEGER NOT NULL DEFAULT 0;
+                ALTER TABLE terms ADD COLUMN rest REAL;
+                ALTER TABLE documents ADD COLUMN s0 REAL;
+                ALTER TABLE documents ADD COLUMN s1 REAL;
+                ALTER TABLE documents ADD COLUMN s2 REAL;
+                UPDATE terms SET df = (SELECT COUNT(*) FROM postings WHERE term_id = terms.id);
+                """
+            )
+
+        for term_id, term, df, rest in self.__connection.execute("SELECT id, term, df, rest FROM terms ORDER BY id"):
+            self._add_term(term, term_id, df, math.inf if rest is None else rest)
+
+        for doc_id, key, s0, s1, s2 in self.__connection.execute("SELECT id, key, s0, s1, s2 FROM documents"):
+            self.__doc_keys[doc_id] = key
+            self.__key_docs[key] = doc_id
+            self.__stats[doc_id] = [s0 or 0.0, s1 or 0.0, s2 or 0.0]
+
+        self.__max_df = max(self.__df, default=0)
+        if migrate:
+            documents = {}
+            for doc_id, term_id, tf in self.__connection.execute("SELECT doc_id, term_id, tf FROM postings"):
+                documents.setdefault(doc_id, {})[term_id] = tf
+            self._update_weights({}, documents)
+            self.__connection.commit()
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    # ---------------------------------------------------------------------------------------------
+    # Getters
+    # ---------------------------------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.__doc_keys)
+
+    def get_vocabulary_size(self) -> int:
+        return len(self.__term_list)
+
+    def get_term(self, term_id: int) -> str:
+        return self.__term_list[term_id]
+
+    def get_term_id(self, term: str):
+        return self.__terms.get(term)
+
+    def get_document_frequency(self, term: str) -> int:
+        term_id = self.__terms.get(term)
+        return 0 if term_id is None else self.__df[term_id]
+
+    def get_keys(self) -> list:
+        # Row order used by document_matrix() and score()
+        return [self.__doc_keys[doc_id] for doc_id in self._rows()]
+
+    def get_payload(self, key: str):
+        with self.__lock:
+            doc_id = self.__key_docs.get(key)
+            if doc_id is None:
+                return None
+            row = self.__connection.execute("SELECT payload FROM documents WHERE id = ?", (doc_id,)).fetchone()
+            return json.loads(row[0]) if row and row[0] else None
+
+    # ---------------------------------------------------------------------------------------------
+    # Indexing
+    # ---------------------------------------------------------------------------------------------
+    @classmethod
+    def tokenize(cls, text: str) -> list:
+        return cls.TOKEN_PATTERN.findall(text.lower())
+
+    def _add_term(self, term: str, term_id: int = None, df: int = 0, rest: float = math.inf) -> int:
+        term_id = len(self.__term_list) if term_id is None else term_id
+        self.__terms[term] = term_id
+        self.__term_list.append(term)
+        self.__df.append(df)
+        # None until first use, a term without documents has nothing to read
+        self.__postings.append(None if df else {})
+        self.__rest.append(rest)
+        return term_id
+
+    def _postings(self, term_id: int) -> dict:
+        postings = self.__postings[term_id]
+        if postings is None:
+            postings = self.__postings[term_id] = dict(
+                # Query term ids come from numpy, sqlite3 would bind an int64 as a blob
+                self.__connection.execute("SELECT doc_id, tf FROM postings WHERE term_id = ?", (int(term_id),))
+            )
+        return postings
+
+    def _invalidate(self):
+        self.__rows = None
+        self.__positions = None
+        self.__norms = {}
+        self.__matrix = None
+
+    def _remove_document(self, doc_id: int, changed: dict):
+        # The terms of a document come from the postings_doc index, there is no forward index in memory
+        for term_id, in self.__connection.execute("SELECT term_id FROM postings WHERE doc_id = ?", (doc_id,)).fetchall():
+            changed.setdefault(term_id, self.__df[term_id])
+            if self.__postings[term_id] is not None:
+                del self.__postings[term_id][doc_id]
+            self.__df[term_id] -= 1
+        del self.__key_docs[self.__doc_keys.pop(doc_id)]
+        self.__stats.pop(doc_id, None)
+
+        self.__connection.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self.__connection.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+    def add_documents(self, documents, keys=None, payloads=None) -> list:
+        if keys is not None and len(keys) != len(documents):
+            raise ValueError("Keys and documents must have the same length.")
+        if payloads is not None and len(payloads) != len(documents):
+            raise ValueError("Payloads and documents must have the same length.")
+
+        with self.__lock:
+            doc_ids = []
+            new_terms = []
+            changed = {}
+            fresh = {}
+            for i, document in enumerate(documents):
+                key = keys[i] if keys is not None else document
+                payload = payloads[i] if payloads is not None else None
+
+                # Re-adding a key replaces the old version instead of double counting it
+                if key in self.__key_docs:
+                    fresh.pop(self.__key_docs[key], None)
+                    self._remove_document(self.__key_docs[key], changed)
+
+                cursor = self.__connection.execute(
+                    "INSERT INTO documents (key, payload) VALUES (?, ?)",
+                    (key, json.dumps(payload, ensure_ascii=False) if payload is not None else None),
+                )
+                doc_id = cursor.lastrowid
+
+                counts = {}
+                for term, tf in Counter(self.tokenize(document)).items():
+                    term_id = self.__terms.get(term)
+                    if term_id is None:
+                        term_id = self._add_term(term)
+                        new_terms.append((term_id, term))
+                    counts[term_id] = tf
+                    changed.setdefault(term_id, self.__df[term_id])
+                    if self.__postings[term_id] is not None:
+                        self.__postings[term_id][doc_id] = tf
+                    self.__df[term_id] += 1
+
+                self.__doc_keys[doc_id] = key
+                self.__key_docs[key] = doc_id
+                fresh[doc_id] = counts
+                doc_ids.append(doc_id)
+
+                self.__connection.executemany(
+                    "INSERT INTO postings (term_id, doc_id, tf) VALUES (?, ?, ?)",
+                    ((term_id, doc_id, tf) for term_id, tf in counts.items()),
+                )
+
+            self.__connection.executemany("INSERT INTO terms (id, term) VALUES (?, ?)", new_terms)
+            self._update_weights(changed, fresh)
+            self.__connection.commit()
+            self._invalidate()
+            return doc_ids
+
+    def remove_documents(self, keys):
+        with self.__lock:
+            changed = {}
+            for key in keys:
+                if key in self.__key_docs:
+                    self._remove_document(self.__key_docs[key], changed)
+            self._update_weights(changed, {})
+            self.__connection.commit()
+            self._invalidate()
+
+    # ---------------------------------------------------------------------------------------------
+    # Weighting
+    # ---------------------------------------------------------------------------------------------
+    def idf(self, term_id: int) -> float:
+        # Smoothed idf, identical to TfidfTransformer(smooth_idf=True)
+        return math.log((1 + len(self.__doc_keys)) / (1 + self.__df[term_id])) + 1
+
+    def _rows(self) -> list:
+        if self.__rows is None:
+            self.__rows = sorted(self.__doc_keys)
+            self.__positions = {doc_id: i for i, doc_id in enumerate(self.__rows)}
+        return self.__rows
+
+    def _positions(self) -> dict:
+        self._rows()
+        return self.__positions
+
+    @staticmethod
+    def _offset(df: int) -> float:
+        # idf = log(1 + N) + offset, only the offset depends on the term
+        return 1.0 - math.log1p(df)
+
+    def _document_stats(self, counts: dict) -> list:
+        stats = [0.0, 0.0, 0.0]
+        for term_id, tf in counts.items():
+            weight, offset = tf * tf, self._offset(self.__df[term_id])
+            stats[0] += weight
+            stats[1] += weight * offset
+            stats[2] += weight * offset * offset
+        return stats
+
+    def _update_weights(self, changed: dict, fresh: dict):
+        # Only documents sharing a term whose df moved are touched, never the whole corpus
+        touched = set(fresh)
+        for term_id, old_df in changed.items():
+            new_df = self.__df[term_id]
+            if new_df == old_df:
+                continue
+            old, new = self._offset(old_df), self._offset(new_df)
+            delta, delta_squared = new - old, new * new - old * old
+            for doc_id, tf in self._postings(term_id).items():
+                if doc_id not in fresh:
+                    stats = self.__stats[doc_id]
+                    stats[1] += tf * tf * delta
+                    stats[2] += tf * tf * delta_squared
+                    touched.add(doc_id)
+            self.__max_df = max(self.__max_df, new_df)
+
+        for doc_id, counts in fresh.items():
+            stats = self.__stats[doc_id] = self._document_stats(counts)
+            for term_id, tf in counts.items():
+                self.__rest[term_id] = min(self.__rest[term_id], (stats[0] - tf * tf) / (tf * tf))
+                changed.setdefault(term_id, self.__df[term_id])
+
+        self.__connection.executemany(
+            "UPDATE documents SET s0 = ?, s1 = ?, s2 = ? WHERE id = ?",
+            ((*self.__stats[doc_id], doc_id) for doc_id in touched),
+        )
+        self.__connection.executemany(
+            "UPDATE terms SET df = ?, rest = ? WHERE id = ?",
+            (
+                (self.__df[term_id], None if self.__rest[term_id] == math.inf else self.__rest[term_id], term_id)
+                for term_id in changed
+            ),
+        )
+
+    def _norm(self, doc_id: int) -> float:
+        # Cached until the next change, a query only computes the norms of the documents it touches
+        norm = self.__norms.get(doc_id)
+        if norm is None:
+            s0, s1, s2 = self.__stats[doc_id]
+            log_documents = math.log1p(len(self.__doc_keys))
+            squared = log_documents * log_documents * s0 + 2 * log_documents * s1 + s2
+            norm = self.__norms[doc_id] = math.sqrt(max(squared, 0.0)) or 1.0
+        return norm
+
+    def _max_impact(self, term_id: int) -> float:
+        # MaxScore upper bound of a term's normalised weight: every other term of a document has an idf
+        # of at least the floor, so tf*idf / norm <= 1 / sqrt(1 + floor^2 * rest / idf^2). Inserts only
+        # lower rest and the floor, removals leave both as they are, so the bound never needs a rebuild
+        rest = self.__rest[term_id]
+        if rest == math.inf:
+            return 0.0
+        idf = self.idf(term_id)
+        # Never below 1, df <= N keeps every real idf at least there
+        floor = max(math.log((1 + len(self.__doc_keys)) / (1 + self.__max_df)) + 1, 1.0)
+        return 1.0 / math.sqrt(1.0 + floor * floor * rest / (idf * idf))
+
+    def transform(self, documents) -> csr_matrix:
+        with self.__lock:
+            data, indices, indptr = [], [], [0]
+            for document in documents:
+                weights = {}
+                for term, tf in Counter(self.tokenize(document)).items():
+                    term_id = self.__terms.get(term)
+                    # A term whose last document was replaced or removed is out of the vocabulary,
+                    # as in a refitted vectorizer; it must not weigh on the query norm either
+                    if term_id is not None and self.__df[term_id]:
+                        weights[term_id] = tf * self.idf(term_id)
+
+                norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+                for term_id in sorted(weights):
+                    indices.append(term_id)
+                    data.append(weights[term_id] / norm)
+                indptr.append(len(indices))
+
+            return csr_matrix(
+                (np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr)),
+                shape=(len(documents), len(self.__term_list)),
+            )
+
+    def document_matrix(self) -> csr_matrix:
+        with self.__lock:
+            if self.__matrix is None:
+                # The whole corpus is needed here, so the postings are scanned instead of loaded per term
+                position = self._positions()
+                rows = [[] for _ in position]
+                for doc_id, term_id, tf in self.__connection.execute("SELECT doc_id, term_id, tf FROM postings"):
+                    rows[position[doc_id]].append((term_id, tf))
+
+                data, indices, indptr = [], [], [0]
+                for doc_id, entries in zip(self._rows(), rows):
+                    norm = self._norm(doc_id)
+                    for term_id, tf in sorted(entries):
+                        indices.append(term_id)
+                        data.append(tf * self.idf(term_id) / norm)
+                    indptr.append(len(indices))
+
+                self.__matrix = csr_matrix(
+                    (np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr)),
+                    shape=(len(self.__doc_keys), len(self.__term_list)),
+                )
+            return self.__matrix
+
+    # ---------------------------------------------------------------------------------------------
+    # Scoring
+    # ---------------------------------------------------------------------------------------------
+    def score(self, query) -> np.ndarray:
+        with self.__lock:
+            position = self._positions()
+            norm = self._norm
+            scores = np.zeros(len(position), dtype=np.float64)
+
+            # Only the postings of the query terms are touched, not the whole corpus
+            query = query.tocsr()
+            for term_id, weight in zip(query.indices, query.data):
+                if term_id >= len(self.__df) or not self.__df[term_id]:
+                    continue
+                idf = self.idf(term_id)
+                for doc_id, tf in self._postings(term_id).items():
+                    scores[position[doc_id]] += weight * tf * idf / norm(doc_id)
+
+            return scores
+
+    def search(self, query, top_k: int = 10) -> list:
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1.")
+
+        with self.__lock:
+            norm = self._norm
+
+            query = query.tocsr()
+            terms = [
+                (weight * self._max_impact(term_id), term_id, weight)
+                for term_id, weight in zip(query.indices, query.data)
+                if term_id < len(self.__df) and self.__df[term_id]
+            ]
+            # Highest upper bound first, so the threshold rises as early as possible
+            terms.sort(reverse=True)
+            remaining = sum(bound for bound, _, _ in terms)
+
+            scores = {}
+            threshold = 0.0
+            for bound, term_id, weight in terms:
+                # Clamped, rounding must not push the k-th candidate below its own threshold
+                remaining = max(0.0, remaining - bound)
+                postings = self._postings(term_id)
+                factor = weight * self.idf(term_id)
+
+                if len(scores) >= top_k and remaining + bound < threshold:
+                    # No unseen document can still reach the top k, only finish scoring the candidates
+                    for doc_id in scores:
+                        tf = postings.get(doc_id)
+                        if tf is not None:
+                            scores[doc_id] += factor * tf / norm(doc_id)
+                else:
+                    for doc_id, tf in postings.items():
+                        scores[doc_id] = scores.get(doc_id, 0.0) + factor * tf / norm(doc_id)
+
+                if len(scores) >= top_k:
+                    threshold = heapq.nlargest(top_k, scores.values())[-1]
+                    # Candidates that cannot catch up with the current k-th score are dropped
+                    if remaining < threshold:
+                        scores = {d: v for d, v in scores.items() if v + remaining >= threshold}
+
+            best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+            return [(self.__doc_keys[doc_id], score) for doc_id, score in best if score > 0]
+
+    def __repr__(self) -> str:
+        return f"ScholarIndex(documents={len(self.__doc_keys)}, terms={len(self.__term_list)})"
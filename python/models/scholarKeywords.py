@@ -0,0 +1,225 @@
+import re
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+
+# Same tokens as CountVectorizer, so the keywords match the TF-IDF vocabulary
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+method_pack = ["mean", "sum", "df", "bm25", "chi2"]
+
+class ScholarKeywordExtractor:
+    def __init__(self, ngram_range: tuple = (1, 1), k1: float = 1.5, b: float = 0.75):
+        low, high = ngram_range
+        if low < 1 or high < low:
+            raise ValueError("N-gram range must satisfy 1 <= low <= high.")
+
+        self.__ngram_range = (low, high)
+        self.__k1 = k1
+        self.__b = b
+
+        # Vocabulary grows with every batch, earlier rows simply have zeros in the new columns
+        self.__terms = {}
+        self.__term_list = []
+
+        # Count matrix kept as appended row chunks, merged lazily when scores are asked for
+        self.__chunks = []
+        self.__matrix = None
+        self.__groups = {}
+        self.__documents = 0
+
+    # -------------------- Getters --------------------
+    def __len__(self) -> int:
+        return self.__documents
+
+    def get_vocabulary_size(self) -> int:
+        return len(self.__term_list)
+
+    def get_term(self, term_id: int) -> str:
+        return self.__term_list[term_id]
+
+    def get_groups(self) -> list:
+        return list(self.__groups)
+
+    def count_matrix(self) -> csr_matrix:
+        if self.__matrix is None:
+            width = len(self.__term_list)
+            for chunk in self.__chunks:
+                chunk.resize((chunk.shape[0], width))
+            self.__matrix = (
+                vstack(self.__chunks, format="csr") if self.__chunks else csr_matrix((0, width), dtype=np.float64)
+            )
+            self.__chunks = [self.__matrix]
+        return self.__matrix
+
+    # -------------------- Incremental Fitting --------------------
+    def _ngrams(self, tokens: list):
+        low, high = self.__ngram_range
+        for n in range(low, high + 1):
+            for i in range(len(tokens) - n + 1):
+                yield " ".join(tokens[i:i + n])
+
+    def partial_fit(self, documents, groups=None):
+        # groups: one label per document (a year) or a list of labels (its authors), or None
+        if groups is not None and len(groups) != len(documents):
+            raise ValueError("Groups and documents must have the same length.")
+
+        data, indices, indptr = [], [], [0]
+        for document in documents:
+            counts = {}
+            for term in self._ngrams(TOKEN_PATTERN.findall(document.lower())):
+                term_id = self.__terms.get(term)
+                if term_id is None:
+                    term_id = self.__terms[term] = len(self.__term_list)
+                    self.__term_list.append(term)
+                counts[term_id] = counts.get(term_id, 0) + 1
+            indices.extend(counts)
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        chunk = csr_matrix(
+            (np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr)),
+            shape=(len(documents), len(self.__term_list)),
+        )
+        chunk.sort_indices()
+
+        if groups is not None:
+            for i, labels in enumerate(groups):
+                if labels is None or isinstance(labels, (str, int)):
+                    labels = [labels]
+                for label in labels:
+                    if label not in (None, ""):
+                        self.__groups.setdefault(str(label), []).append(self.__documents + i)
+
+        self.__chunks.append(chunk)
+        self.__matrix = None
+        self.__documents += len(documents)
+        return self
+
+    # -------------------- Scoring --------------------
+    # Every method works on the CSR arrays, nothing is densified
+    @staticmethod
+    def top_terms(scores: np.ndarray, top_n: int) -> np.ndarray:
+        # argpartition is linear, only the n winners get sorted
+        scores = np.asarray(scores).ravel()
+        if top_n >= len(scores):
+            return np.argsort(-scores, kind="stable")
+        best = np.argpartition(-scores, top_n - 1)[:top_n]
+        return best[np.argsort(-scores[best], kind="stable")]
+
+    @staticmethod
+    def column_scores(matrix, method: str = "mean") -> np.ndarray:
+        # For an already weighted (TF-IDF) matrix, as used by ScholarComputation
+        if method == "mean":
+            return np.asarray(matrix.mean(axis=0)).ravel()
+        if method == "sum":
+            return np.asarray(matrix.sum(axis=0)).ravel()
+        if method == "df":
+            return np.bincount(matrix.indices, minlength=matrix.shape[1]).astype(np.float64)
+        raise ValueError("Method must be one of ['mean', 'sum', 'df'] for a weighted matrix.")
+
+    @staticmethod
+    def _document_frequency(matrix) -> np.ndarray:
+        return np.bincount(matrix.indices, minlength=matrix.shape[1])
+
+    @staticmethod
+    def _row_ids(matrix) -> np.ndarray:
+        return np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+
+    def _tfidf(self, matrix) -> csr_matrix:
+        # Smoothed idf and l2 rows, identical to TfidfTransformer defaults
+        df = self._document_frequency(matrix)
+        idf = np.log((1 + matrix.shape[0]) / (1 + df)) + 1
+        data = matrix.data * idf[matrix.indices]
+        norms = np.sqrt(np.bincount(self._row_ids(matrix), weights=data * data, minlength=matrix.shape[0]))
+        norms[norms == 0] = 1.0
+        data /= norms[self._row_ids(matrix)]
+        return csr_matrix((data, matrix.indices, matrix.indptr), shape=matrix.shape)
+
+    def _bm25(self, matrix) -> csr_matrix:
+        documents = matrix.shape[0]
+        df = self._document_frequency(matrix)
+        idf = np.log(1 + (documents - df + 0.5) / (df + 0.5))
+
+        lengths = np.asarray(matrix.sum(axis=1)).ravel()
+        average = lengths.mean() if documents else 0.0
+        norm = self.__k1 * (1 - self.__b + self.__b * lengths / (average or 1.0))
+
+        tf = matrix.data
+        data = idf[matrix.indices] * tf * (self.__k1 + 1) / (tf + norm[self._row_ids(matrix)])
+        return csr_matrix((data, matrix.indices, matrix.indptr), shape=matrix.shape)
+
+    def _chi2(self, matrix, rows) -> np.ndarray:
+        # Presence in the group against presence in the rest of the corpus
+        total = matrix.shape[0]
+        inside = len(rows)
+        outside = total - inside
+
+        df_all = self._document_frequency(matrix)
+        df_in = self._document_frequency(matrix[rows]).astype(np.float64)
+        df_out = df_all - df_in
+
+        a, b = df_in, df_out
+        c, d = inside - df_in, outside - df_out
+        denominator = (a + c) * (b + d) * (a + b) * (c + d)
+        scores = np.divide(total * (a * d - b * c) ** 2, denominator, out=np.zeros_like(a), where=denominator > 0)
+
+        # Only terms over-represented in the group describe it
+        scores[a * outside <= b * inside] = 0.0
+        return scores
+
+    def scores(self, method: str = "mean", group: str = None) -> np.ndarray:
+        if method not in method_pack:
+            raise ValueError(f"Method must be one of {method_pack}.")
+
+        matrix = self.count_matrix()
+        if matrix.shape[0] == 0:
+            return np.zeros(matrix.shape[1])
+
+        rows = None
+        if group is not None:
+            if group not in self.__groups:
+                raise ValueError(f"Unknown group: {group}")
+            rows = np.array(self.__groups[group])
+
+        if method == "chi2":
+            if rows is None:
+                raise ValueError("Chi-square scoring needs a group to compare against the corpus.")
+            return self._chi2(matrix, rows)
+
+        # idf and average length come from the whole corpus, a group only selects rows
+        if method == "bm25":
+            weighted, method = self._bm25(matrix), "mean"
+        elif method in ("mean", "sum"):
+            weighted = self._tfidf(matrix)
+        else:
+            weighted = matrix
+        if rows is not None:
+            weighted = weighted[rows]
+        return self.column_scores(weighted, method)
+
+    # -------------------- Keywords --------------------
+    def top_keywords(self, top_n: int = 10, method: str = "mean", group: str = None) -> list:
+        scores = self.scores(method, group)
+        return [
+            (self.__term_list[i], float(scores[i]))
+            for i in self.top_terms(scores, top_n)
+            if scores[i] > 0
+        ]
+
+    def top_keywords_by_group(self, top_n: int = 10, method: str = "mean", min_documents: int = 1) -> dict:
+        return {
+            group: self.top_keywords(top_n, method, group)
+            for group, rows in sorted(self.__groups.items())
+            if len(rows) >= min_documents
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ScholarKeywordExtractor("
+            f"documents={self.__documents}, "
+            f"terms={len(self.__term_list)}, "
+            f"groups={len(self.__groups)}, "
+            f"ngram_range={self.__ngram_range}"
+            f")"
+        )
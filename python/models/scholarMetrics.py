@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+import re
+import threading
+import time
+
+class ScholarMetrics:
+    def __init__(self):
+        # Stage name -> [count, total seconds, slowest run], counter name -> value
+        self.__timings = {}
+        self.__counters = {}
+        self.__lock = threading.Lock()
+
+    # -------------------- Recording --------------------
+    def observe(self, stage: str, seconds: float):
+        with self.__lock:
+            timing = self.__timings.get(stage)
+            if timing is None:
+                self.__timings[stage] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                timing[2] = max(timing[2], seconds)
+
+    @contextmanager
+    def timer(self, stage: str):
+        # Failed runs are recorded too, a stage that times out is exactly what we want to see
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def increment(self, counter: str, amount: int = 1):
+        with self.__lock:
+            self.__counters[counter] = self.__counters.get(counter, 0) + amount
+
+    def reset(self):
+        with self.__lock:
+            self.__timings.clear()
+            self.__counters.clear()
+
+    # -------------------- Export --------------------
+    def snapshot(self) -> dict:
+        with self.__lock:
+            return {
+                "timings": {
+                    stage: {
+                        "count": count,
+                        "total": round(total, 6),
+                        "mean": round(total / count, 6),
+                        "max": round(slowest, 6),
+                    }
+                    for stage, (count, total, slowest) in sorted(self.__timings.items())
+                },
+                "counters": dict(sorted(self.__counters.items())),
+            }
+
+    @staticmethod
+    def _metric_name(name: str) -> str:
+        return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+    def to_prometheus(self, prefix: str = "scholar") -> str:
+        # Prometheus text exposition format, stages as labels of one summary
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, timing in snapshot["timings"].items():
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {timing["count"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {timing["total"]}')
+        lines.append(f"# HELP {prefix}_stage_seconds_max Slowest run per pipeline stage.")
+        lines.append(f"# TYPE {prefix}_stage_seconds_max gauge")
+        for stage, timing in snapshot["timings"].items():
+            lines.append(f'{prefix}_stage_seconds_max{{stage="{stage}"}} {timing["max"]}')
+
+        for counter, value in snapshot["counters"].items():
+            name = f"{prefix}_{self._metric_name(counter)}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def __repr__(self) -> str:
+        with self.__lock:
+            return f"ScholarMetrics(stages={len(self.__timings)}, counters={len(self.__counters)})"
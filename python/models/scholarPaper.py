@@ -1,6 +1,16 @@
 import json
+import re
 
 class ScholarPaper:
+    # No per-instance __dict__, large result sets are held in memory for ranking
+    __slots__ = (
+        "__title", "__link", "__description", "__authors", "__journal",
+        "__year", "__publication_date", "__citations", "__citation_id",
+    )
+
+    __YEAR_PATTERN = re.compile(r"\b(1[5-9]\d\d|2\d\d\d)\b")
+    __NUMBER_PATTERN = re.compile(r"\d+")
+
     def __init__(
         self,
         title: str,
@@ -8,8 +18,9 @@ class ScholarPaper:
         description: str,
         authors: str,
         journal: str,
-        year: str,
-        citations: str
+        year,
+        citations,
+        citation_id: str = ""
     ):
         self.set_title(title)
         self.set_link(link)
@@ -18,6 +29,7 @@ class ScholarPaper:
         self.set_journal(journal)
         self.set_year(year)
         self.set_citations(citations)
+        self.set_citation_id(citation_id)
 
     # -------------------- Getters --------------------
     def get_title(self) -> str:
@@ -35,11 +47,18 @@ class ScholarPaper:
     def get_journal(self) -> str:
         return self.__journal
 
-    def get_year(self) -> str:
+    def get_year(self) -> int:
+        # 0 when Scholar has no date for the paper
         return self.__year
 
-    def get_citations(self) -> str:
+    def get_publication_date(self) -> str:
+        return self.__publication_date
+
+    def get_citations(self) -> int:
         return self.__citations
+
+    def get_citation_id(self) -> str:
+        return self.__citation_id
     
     # -------------------- Setters --------------------
     def set_title(self, title: str):
@@ -72,17 +91,57 @@ class ScholarPaper:
         else:
             self.__journal = journal.strip()
 
-    def set_year(self, year: str):
-        if not isinstance(year, str):
-            self.__year = ""
+    def set_year(self, year):
+        # Keeps the raw date ("2019/3/14") next to the parsed year
+        if isinstance(year, int) and not isinstance(year, bool):
+            self.__year = year
+            self.__publication_date = str(year) if year else ""
+        elif not isinstance(year, str):
+            self.__year = 0
+            self.__publication_date = ""
+        else:
+            self.__publication_date = year.strip()
+            self.__year = self.parse_year(year)
+
+    def set_citations(self, citations):
+        if isinstance(citations, int) and not isinstance(citations, bool):
+            self.__citations = max(citations, 0)
+        elif not isinstance(citations, str):
+            self.__citations = 0
         else:
-            self.__year = year.strip()
+            self.__citations = self.parse_citations(citations)
 
-    def set_citations(self, citations: str):
-        if not isinstance(citations, str):
-            self.__citations = "0"
+    def set_citation_id(self, citation_id: str):
+        if not isinstance(citation_id, str):
+            self.__citation_id = ""
         else:
-            self.__citations = citations.strip()
+            self.__citation_id = citation_id.strip()
+
+    # -------------------- Parsing --------------------
+    @classmethod
+    def parse_year(cls, value: str) -> int:
+        match = cls.__YEAR_PATTERN.search(value or "")
+        return int(match.group()) if match else 0
+
+    @classmethod
+    def parse_citations(cls, value: str) -> int:
+        match = cls.__NUMBER_PATTERN.search((value or "").replace(",", ""))
+        return int(match.group()) if match else 0
+
+    # -------------------- Conversion --------------------
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScholarPaper":
+        return cls(
+            title=data.get("title", ""),
+            link=data.get("link", ""),
+            description=data.get("description", ""),
+            authors=data.get("authors", ""),
+            journal=data.get("journal", ""),
+            # Older cache entries only have the raw date string under "year"
+            year=data.get("publication_date") or data.get("year", ""),
+            citations=data.get("citations", 0),
+            citation_id=data.get("citation_id", "")
+        )
 
     def to_dict(self) -> dict:
         return {
@@ -91,8 +150,10 @@ class ScholarPaper:
             "description": self.__description,
             "authors": self.__authors,
             "journal": self.__journal,
-            "year": self.__year,
-            "citations": self.__citations
+            "year": self.__year or None,
+            "publication_date": self.__publication_date,
+            "citations": self.__citations,
+            "citation_id": self.__citation_id
         }
 
     def to_json(self, indent: int = 2) -> str:
@@ -109,7 +170,7 @@ class ScholarPaper:
             f"description: {self.__description}\n"
             f"authors: {self.__authors}\n"
             f"journal: {self.__journal}\n"
-            f"year: {self.__year}\n"
+            f"year: {self.__publication_date}\n"
             f"citations: {self.__citations}"
         )
 
@@ -0,0 +1,180 @@
+# Project models
+from models.scholarPaper import ScholarPaper
+
+import json
+
+import numpy as np
+
+class ScholarPaperBatch:
+    TEXT_COLUMNS = ("title", "link", "description", "authors", "journal", "publication_date", "citation_id")
+    NUMERIC_COLUMNS = {"year": np.int32, "citations": np.int64, "similarity": np.float64}
+
+    def __init__(self, columns: dict = None):
+        columns = columns or {}
+        size = len(next(iter(columns.values()))) if columns else 0
+
+        # One array per field, text as object arrays so sorting and masks apply to every column alike
+        self.__columns = {}
+        for name in self.TEXT_COLUMNS:
+            values = columns.get(name)
+            self.__columns[name] = (
+                np.array(values, dtype=object) if values is not None else np.full(size, "", dtype=object)
+            )
+        for name, dtype in self.NUMERIC_COLUMNS.items():
+            values = columns.get(name)
+            self.__columns[name] = (
+                np.asarray(values, dtype=dtype) if values is not None else np.zeros(size, dtype=dtype)
+            )
+
+        if any(len(column) != size for column in self.__columns.values()):
+            raise ValueError("All columns must have the same length.")
+
+        self.__has_similarity = columns.get("similarity") is not None
+
+    # -------------------- Construction --------------------
+    @classmethod
+    def from_papers(cls, papers) -> "ScholarPaperBatch":
+        columns = {name: [] for name in cls.TEXT_COLUMNS + ("year", "citations")}
+        for paper in papers:
+            if not isinstance(paper, ScholarPaper):
+                paper = ScholarPaper.from_dict(paper)
+            columns["title"].append(paper.get_title())
+            columns["link"].append(paper.get_link())
+            columns["description"].append(paper.get_description())
+            columns["authors"].append(paper.get_authors())
+            columns["journal"].append(paper.get_journal())
+            columns["publication_date"].append(paper.get_publication_date())
+            columns["citation_id"].append(paper.get_citation_id())
+            columns["year"].append(paper.get_year())
+            columns["citations"].append(paper.get_citations())
+        return cls(columns)
+
+    @classmethod
+    def concat(cls, batches) -> "ScholarPaperBatch":
+        batches = list(batches)
+        if not batches:
+            return cls()
+        columns = {
+            name: np.concatenate([batch.get_column(name) for batch in batches])
+            for name in cls.TEXT_COLUMNS + tuple(cls.NUMERIC_COLUMNS)
+        }
+        if not all(batch.has_similarity() for batch in batches):
+            columns.pop("similarity")
+        return cls(columns)
+
+    # -------------------- Getters --------------------
+    def __len__(self) -> int:
+        return len(self.__columns["title"])
+
+    def get_column(self, name: str) -> np.ndarray:
+        if name not in self.__columns:
+            raise ValueError(f"Unknown column: {name}")
+        return self.__columns[name]
+
+    def has_similarity(self) -> bool:
+        return self.__has_similarity
+
+    def get_paper(self, i: int) -> ScholarPaper:
+        return ScholarPaper(
+            title=self.__columns["title"][i],
+            link=self.__columns["link"][i],
+            description=self.__columns["description"][i],
+            authors=self.__columns["authors"][i],
+            journal=self.__columns["journal"][i],
+            year=self.__columns["publication_date"][i] or int(self.__columns["year"][i]),
+            citations=int(self.__columns["citations"][i]),
+            citation_id=self.__columns["citation_id"][i],
+        )
+
+    def __getitem__(self, i: int) -> ScholarPaper:
+        return self.get_paper(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get_paper(i)
+
+    def nbytes(self) -> int:
+        # Numeric columns exactly, text columns as their pointer arrays (the strings are shared)
+        return sum(column.nbytes for column in self.__columns.values())
+
+    # -------------------- Setters --------------------
+    def set_similarity(self, scores):
+        scores = np.asarray(scores, dtype=np.float64)
+        if len(scores) != len(self):
+            raise ValueError("Scores and papers must have the same length.")
+        self.__columns["similarity"] = scores
+        self.__has_similarity = True
+
+    # -------------------- Selection --------------------
+    def take(self, indices) -> "ScholarPaperBatch":
+        columns = {name: column[indices] for name, column in self.__columns.items()}
+        if not self.__has_similarity:
+            columns.pop("similarity")
+        return ScholarPaperBatch(columns)
+
+    def filter(
+        self,
+        min_year: int = None,
+        max_year: int = None,
+        min_citations: int = None,
+        max_citations: int = None,
+    ) -> "ScholarPaperBatch":
+        year = self.__columns["year"]
+        citations = self.__columns["citations"]
+
+        mask = np.ones(len(self), dtype=bool)
+        if min_year is not None:
+            mask &= year >= min_year
+        if max_year is not None:
+            # Papers without a year stay out of any year range
+            mask &= (year <= max_year) & (year > 0)
+        if min_citations is not None:
+            mask &= citations >= min_citations
+        if max_citations is not None:
+            mask &= citations <= max_citations
+        return self.take(np.flatnonzero(mask))
+
+    def sort_by(self, column: str = "similarity", descending: bool = True) -> "ScholarPaperBatch":
+        if column not in self.NUMERIC_COLUMNS:
+            raise ValueError(f"Only numeric columns can be sorted: {', '.join(self.NUMERIC_COLUMNS)}")
+        values = self.__columns[column]
+        # Stable, so equal scores keep scraping order like list.sort() did
+        order = np.argsort(-values if descending else values, kind="stable")
+        return self.take(order)
+
+    def top_k(self, k: int, column: str = "similarity") -> "ScholarPaperBatch":
+        if k >= len(self):
+            return self.sort_by(column)
+        values = self.__columns[column]
+        candidates = np.argpartition(-values, k - 1)[:k]
+        return self.take(candidates[np.argsort(-values[candidates], kind="stable")])
+
+    # -------------------- Serialization --------------------
+    def to_dicts(self) -> list:
+        # Same key order as ScholarPaper.to_dict()
+        names = [
+            "title", "link", "description", "authors", "journal",
+            "year", "publication_date", "citations", "citation_id",
+        ]
+        if self.__has_similarity:
+            names.append("similarity")
+
+        # tolist() converts whole columns to Python values at once instead of per field
+        columns = [self.__columns[name].tolist() for name in names]
+        year = names.index("year")
+        papers = []
+        for row in zip(*columns):
+            paper = dict(zip(names, row))
+            paper["year"] = row[year] or None
+            papers.append(paper)
+        return papers
+
+    def to_json(self, indent: int = None) -> str:
+        return json.dumps(self.to_dicts(), indent=indent, ensure_ascii=False)
+
+    def write_ndjson(self, file):
+        for paper in self.to_dicts():
+            file.write(json.dumps(paper, ensure_ascii=False) + "\n")
+
+    def __repr__(self) -> str:
+        return f"ScholarPaperBatch(papers={len(self)}, similarity={self.__has_similarity})"
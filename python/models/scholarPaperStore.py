@@ -0,0 +1,433 @@
+# Project models
+from models.scholarPaper import ScholarPaper
+from models.scholarPaperBatch import ScholarPaperBatch
+
+from contextlib import contextmanager
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no flock, there only the threads of one process are kept apart
+    fcntl = None
+
+# One fixed-width row per stored version; numeric columns are read straight from the memory map
+ROW_DTYPE = np.dtype([
+    ("key", np.uint64),
+    ("offset", np.uint64),
+    ("length", np.uint32),
+    ("year", np.int32),
+    ("citations", np.int64),
+])
+
+order_pack = ["citations", "year", "row"]
+
+class ScholarPaperStore:
+    # Append-only: papers.dat holds one JSON record per version, rows.bin points into it.
+    # A changed paper is appended again and its newest row wins, nothing is rewritten in place
+    DATA = "papers.dat"
+    ROWS = "rows.bin"
+    INDEXES = "indexes.npz"
+    LOCK = "store.lock"
+
+    __WORD_PATTERN = re.compile(r"\w+")
+
+    def __init__(self, path: str = "scholar_store", is_verbose: bool = False):
+        self.__path = path
+        self.__is_verbose = is_verbose
+        # Threads share the RLock, processes the flock on LOCK; only the outermost holder takes the flock
+        self.__lock = threading.RLock()
+        self.__lock_file = None
+        self.__lock_depth = 0
+
+        self.__rows = None
+        self.__data = None
+        self.__primary = {}
+        self.__live = np.zeros(0, dtype=bool)
+
+        # Author postings cover every row (also superseded ones), queries drop rows that are not live
+        self.__authors = {}
+        self.__indexed = 0
+        self.__sorted = {}
+
+        os.makedirs(path, exist_ok=True)
+        if fcntl is not None:
+            self.__lock_file = open(self._file(self.LOCK), "a+b")
+
+        # Exclusive, a row another process is still appending must not be taken for a torn one
+        with self._locked():
+            self._recover()
+
+            keys = self.rows()["key"]
+            for row, key in enumerate(keys.tolist()):
+                self.__primary[key] = row
+            self.__live = np.zeros(len(keys), dtype=bool)
+            self.__live[list(self.__primary.values())] = True
+
+            self._load_indexes()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.__path, name)
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        with self.__lock:
+            outermost = self.__lock_depth == 0 and self.__lock_file is not None
+            if outermost:
+                fcntl.flock(self.__lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            self.__lock_depth += 1
+            try:
+                yield
+            finally:
+                self.__lock_depth -= 1
+                if outermost:
+                    fcntl.flock(self.__lock_file, fcntl.LOCK_UN)
+
+    def _catch_up(self):
+        # Rows appended by other processes since the last look, applied like our own appends
+        start = len(self.__live)
+        keys = self.rows()["key"][start:].tolist()
+        if not keys:
+            return
+        self.__live = np.concatenate((self.__live, np.ones(len(keys), dtype=bool)))
+        for row, key in enumerate(keys, start):
+            previous = self.__primary.get(key)
+            if previous is not None:
+                self.__live[previous] = False
+            self.__primary[key] = row
+        self._index_authors()
+        self.__sorted = {}
+
+    def _recover(self):
+        # Data is written before rows, so a crash can only leave a half row or unreferenced data behind
+        rows_path, data_path = self._file(self.ROWS), self._file(self.DATA)
+        for name in (rows_path, data_path):
+            if not os.path.exists(name):
+                open(name, "wb").close()
+
+        size = os.path.getsize(rows_path)
+        if size % ROW_DTYPE.itemsize:
+            with open(rows_path, "r+b") as file:
+                file.truncate(size - size % ROW_DTYPE.itemsize)
+
+        rows = self.rows()
+        end = int(rows["offset"][-1] + rows["length"][-1]) if len(rows) else 0
+        if os.path.getsize(data_path) < end:
+            raise RuntimeError(f"Paper data in {self.__path} is shorter than its rows.")
+        if os.path.getsize(data_path) > end:
+            with open(data_path, "r+b") as file:
+                file.truncate(end)
+
+    # -------------------- Keys --------------------
+    @staticmethod
+    def make_key(paper: dict) -> str:
+        # Scholar's citation id when the paper came from a profile, its link otherwise
+        key = paper.get("citation_id") or paper.get("link")
+        if key:
+            return key
+        return f"{' '.join((paper.get('title') or '').lower().split())}|{paper.get('year') or ''}"
+
+    @staticmethod
+    def hash_key(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+    @classmethod
+    def author_keys(cls, authors: str) -> set:
+        # Initial plus surname, so "J Siswantoro" and "Joko Siswantoro" share a posting list
+        keys = set()
+        for author in (authors or "").split(","):
+            words = cls.__WORD_PATTERN.findall(author.lower())
+            if words and author.strip() != "...":
+                keys.add(f"{words[0][0]} {words[-1]}" if len(words) > 1 else words[0])
+        return keys
+
+    # -------------------- Getters --------------------
+    def get_path(self) -> str:
+        return self.__path
+
+    def __len__(self) -> int:
+        return len(self.__primary)
+
+    def __contains__(self, key: str) -> bool:
+        return self.hash_key(key) in self.__primary
+
+    def rows(self) -> np.ndarray:
+        # Reopened only after an append changed the file size
+        count = os.path.getsize(self._file(self.ROWS)) // ROW_DTYPE.itemsize
+        if self.__rows is None or len(self.__rows) != count:
+            self.__rows = (
+                np.memmap(self._file(self.ROWS), dtype=ROW_DTYPE, mode="r", shape=(count,))
+                if count else np.zeros(0, dtype=ROW_DTYPE)
+            )
+        return self.__rows
+
+    def _data(self):
+        # mmap slices are plain bytes, far cheaper per record than numpy views
+        size = os.path.getsize(self._file(self.DATA))
+        if self.__data is None or len(self.__data) != size:
+            if isinstance(self.__data, mmap.mmap):
+                self.__data.close()
+            if size:
+                with open(self._file(self.DATA), "rb") as file:
+                    self.__data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.__data = b""
+        return self.__data
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.__live)
+
+    # -------------------- Reading --------------------
+    def _read(self, row: int) -> bytes:
+        record = self.rows()[row]
+        offset = int(record["offset"])
+        return self._data()[offset:offset + int(record["length"])]
+
+    def _read_many(self, rows) -> list:
+        mapped = self.rows()[rows]
+        starts = mapped["offset"].tolist()
+        ends = (mapped["offset"] + mapped["length"]).tolist()
+        data = self._data()
+        return [data[start:end] for start, end in zip(starts, ends)]
+
+    def read(self, row: int) -> dict:
+        return json.loads(self._read(row))
+
+    def get(self, key: str):
+        row = self.__primary.get(self.hash_key(key))
+        if row is None:
+            return None
+        paper = self.read(row)
+        # 64-bit hashes practically never collide, but a wrong paper is worse than a miss
+        return paper if self.make_key(paper) == key else None
+
+    def iter_dicts(self, rows=None, batch_size: int = 4096):
+        rows = self.live_rows() if rows is None else np.asarray(rows, dtype=np.int64)
+        for start in range(0, len(rows), batch_size):
+            for data in self._read_many(rows[start:start + batch_size]):
+                yield json.loads(data)
+
+    def get_batch(self, rows=None) -> ScholarPaperBatch:
+        # Year and citations are taken from the mapped rows, only the text fields are decoded
+        rows = self.live_rows() if rows is None else np.asarray(rows, dtype=np.int64)
+        papers = list(self.iter_dicts(rows))
+        columns = {name: [paper.get(name) or "" for paper in papers] for name in ScholarPaperBatch.TEXT_COLUMNS}
+        mapped = self.rows()[rows]
+        columns["year"] = mapped["year"]
+        columns["citations"] = mapped["citations"]
+        return ScholarPaperBatch(columns)
+
+    # -------------------- Writing --------------------
+    @staticmethod
+    def _normalize(paper) -> dict:
+        # Same fields and types as ScholarPaper.to_dict(), extra keys such as similarity are not stored
+        if not isinstance(paper, ScholarPaper):
+            paper = ScholarPaper.from_dict(paper)
+        return paper.to_dict()
+
+    def put(self, papers) -> int:
+        encoded, seen = [], {}
+        for paper in papers:
+            record = self._normalize(paper)
+            hashed = self.hash_key(self.make_key(record))
+            data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            if hashed in seen:
+                # The last version within one call wins, like across calls
+                encoded[seen[hashed]] = (hashed, record, data)
+                continue
+            seen[hashed] = len(encoded)
+            encoded.append((hashed, record, data))
+
+        # Held for the whole append, other processes see either none or all of these rows
+        with self._locked():
+            self._catch_up()
+
+            # Re-scraping an unchanged paper adds nothing
+            known = [i for i, (hashed, _, _) in enumerate(encoded) if hashed in self.__primary]
+            stored = self._read_many(np.array([self.__primary[encoded[i][0]] for i in known], dtype=np.int64))
+            unchanged = {i for i, data in zip(known, stored) if data == encoded[i][2]}
+            records = [entry for i, entry in enumerate(encoded) if i not in unchanged]
+            if not records:
+                return 0
+
+            lengths = np.array([len(data) for _, _, data in records], dtype=np.uint64)
+            rows = np.zeros(len(records), dtype=ROW_DTYPE)
+            rows["key"] = [hashed for hashed, _, _ in records]
+            rows["offset"] = os.path.getsize(self._file(self.DATA)) + np.cumsum(lengths) - lengths
+            rows["length"] = lengths
+            rows["year"] = [record["year"] or 0 for _, record, _ in records]
+            rows["citations"] = [record["citations"] for _, record, _ in records]
+
+            # Data before rows, so a row never points past the end of the data file
+            with open(self._file(self.DATA), "ab") as file:
+                file.write(b"".join(data for _, _, data in records))
+            with open(self._file(self.ROWS), "ab") as file:
+                file.write(rows.tobytes())
+
+            start = len(self.__live)
+            self.__live = np.concatenate((self.__live, np.ones(len(records), dtype=bool)))
+            for row, (hashed, record, _) in enumerate(records, start):
+                previous = self.__primary.get(hashed)
+                if previous is not None:
+                    self.__live[previous] = False
+                self.__primary[hashed] = row
+                for author in self.author_keys(record["authors"]):
+                    self.__authors.setdefault(author, []).append(row)
+            self.__indexed = len(self.__live)
+            self.__sorted = {}
+
+        if self.__is_verbose:
+            print(f"Stored {len(records)} paper versions in {self.__path}")
+        return len(records)
+
+    # -------------------- Secondary Indexes --------------------
+    def _load_indexes(self):
+        path = self._file(self.INDEXES)
+        if os.path.exists(path):
+            with np.load(path, allow_pickle=False) as saved:
+                names, offsets, postings = saved["names"].tolist(), saved["offsets"], saved["postings"]
+                self.__indexed = int(saved["rows"])
+            self.__authors = {
+                name: postings[offsets[i]:offsets[i + 1]].tolist() for i, name in enumerate(names)
+            }
+
+        # Rows appended by a process that did not save its indexes are picked up here
+        if self.__indexed > len(self.__live):
+            self.__authors, self.__indexed = {}, 0
+        self._index_authors()
+
+    def _index_authors(self):
+        rows = np.arange(self.__indexed, len(self.__live), dtype=np.int64)
+        for row, data in zip(rows.tolist(), self._read_many(rows)):
+            for author in self.author_keys(json.loads(data)["authors"]):
+                self.__authors.setdefault(author, []).append(row)
+        self.__indexed = len(self.__live)
+
+    def save_indexes(self):
+        with self._locked():
+            self._catch_up()
+            names = sorted(self.__authors)
+            lengths = [len(self.__authors[name]) for name in names]
+            postings = [row for name in names for row in self.__authors[name]]
+
+            temporary = self._file(self.INDEXES + ".tmp.npz")
+            np.savez(
+                temporary,
+                names=np.array(names, dtype=str),
+                offsets=np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))),
+                postings=np.array(postings, dtype=np.int64),
+                rows=np.int64(self.__indexed),
+            )
+            os.replace(temporary, self._file(self.INDEXES))
+
+    def _sorted(self, column: str):
+        # Live rows ordered by a numeric column, rebuilt after writes; range lookups are two binary searches
+        with self._locked(shared=True):
+            self._catch_up()
+            if column not in self.__sorted:
+                rows = self.live_rows()
+                values = np.asarray(self.rows()[column])[rows]
+                order = np.argsort(values, kind="stable")
+                self.__sorted[column] = (rows[order], values[order])
+            return self.__sorted[column]
+
+    def _range(self, column: str, low=None, high=None) -> np.ndarray:
+        rows, values = self._sorted(column)
+        start = np.searchsorted(values, low, side="left") if low is not None else 0
+        end = np.searchsorted(values, high, side="right") if high is not None else len(values)
+        return rows[start:end]
+
+    def _author_rows(self, author: str) -> np.ndarray:
+        keys = self.author_keys(author)
+        if not keys:
+            return np.zeros(0, dtype=np.int64)
+        # "Siswantoro" alone matches every initial
+        if len(keys) == 1 and " " not in next(iter(keys)):
+            surname = next(iter(keys))
+            keys = {key for key in self.__authors if key == surname or key.endswith(f" {surname}")}
+
+        rows = np.unique(np.concatenate([
+            np.asarray(self.__authors.get(key, []), dtype=np.int64) for key in keys
+        ] or [np.zeros(0, dtype=np.int64)]))
+        return rows[self.__live[rows]]
+
+    # -------------------- Queries --------------------
+    def query(
+        self,
+        author: str = None,
+        min_year: int = None,
+        max_year: int = None,
+        min_citations: int = None,
+        max_citations: int = None,
+        order_by: str = "citations",
+        limit: int = None,
+    ) -> np.ndarray:
+        if order_by not in order_pack:
+            raise ValueError(f"Order must be one of {order_pack}.")
+
+        # Shared, readers only keep writers out; rows other processes appended are picked up first
+        with self._locked(shared=True):
+            self._catch_up()
+
+            # Papers without a year stay out of any year range, like ScholarPaperBatch.filter
+            if max_year is not None and min_year is None:
+                min_year = 1
+
+            # The most selective index gives the candidates, the other conditions are masks on the mapped columns
+            if author:
+                rows = self._author_rows(author)
+            elif min_year is not None or max_year is not None:
+                rows = self._range("year", min_year, max_year)
+            elif min_citations is not None or max_citations is not None:
+                rows = self._range("citations", min_citations, max_citations)
+            else:
+                rows = self.live_rows()
+
+            mapped = self.rows()[rows]
+            mask = np.ones(len(rows), dtype=bool)
+            if min_year is not None:
+                mask &= mapped["year"] >= min_year
+            if max_year is not None:
+                mask &= mapped["year"] <= max_year
+            if min_citations is not None:
+                mask &= mapped["citations"] >= min_citations
+            if max_citations is not None:
+                mask &= mapped["citations"] <= max_citations
+            rows, mapped = rows[mask], mapped[mask]
+
+            if order_by == "row":
+                order = np.argsort(rows, kind="stable")
+            else:
+                # Highest first, equal values keep insertion order
+                order = np.lexsort((rows, -mapped[order_by].astype(np.int64)))
+            rows = rows[order]
+            return rows[:limit] if limit else rows
+
+    def select(self, limit: int = None, **filters) -> ScholarPaperBatch:
+        return self.get_batch(self.query(limit=limit, **filters))
+
+    def close(self):
+        self.save_indexes()
+        if isinstance(self.__data, mmap.mmap):
+            self.__data.close()
+        self.__rows = self.__data = None
+        if self.__lock_file is not None:
+            self.__lock_file.close()
+            self.__lock_file = None
+
+    def __repr__(self) -> str:
+        return (
+            f"ScholarPaperStore("
+            f"path={self.__path!r}, "
+            f"papers={len(self.__primary)}, "
+            f"versions={len(self.__live)}, "
+            f"authors={len(self.__authors)}"
+            f")"
+        )
@@ -0,0 +1,196 @@
+import re
+
+class ScholarParser:
+    HOST_URL = "https://scholar.google.com"
+
+    # ---------------------------------------------------------------------------------------------
+    # Helpers
+    # ---------------------------------------------------------------------------------------------
+    @staticmethod
+    def _has_class(tag: str, css_class: str) -> str:
+        return f'{tag}[contains(concat(" ", normalize-space(@class), " "), " {css_class} ")]'
+
+    @staticmethod
+    def _text(elements) -> str:
+        if not elements:
+            return ""
+        return " ".join(elements[0].text_content().split())
+
+    @classmethod
+    def absolute_url(cls, href: str) -> str:
+        if not href or href.startswith("javascript:"):
+            return ""
+        if href.startswith("/"):
+            return f"{cls.HOST_URL}{href}"
+        return href
+
+    @classmethod
+    def parse_html(cls, page):
+        if isinstance(page, (str, bytes)):
+            from lxml import html as lxml_html
+            return lxml_html.fromstring(page)
+        return page
+
+    # ---------------------------------------------------------------------------------------------
+    # Search Result Page
+    # ---------------------------------------------------------------------------------------------
+    @classmethod
+    def parse_author_profile_url(cls, page, author_name: str) -> str:
+        tree = cls.parse_html(page)
+        name = author_name.lower()
+
+        for link in tree.xpath(f'//{cls._has_class("h4", "gs_rt2")}//a'):
+            href = link.get("href") or ""
+            if "citations?user=" in href and name in link.text_content().lower():
+                return cls.absolute_url(href)
+
+        for link in tree.xpath(f'//{cls._has_class("div", "gsc_1usr")}//{cls._has_class("h3", "gs_rt")}//a'):
+            if name in link.text_content().lower():
+                return cls.absolute_url(link.get("href") or "")
+
+        return ""
+
+    # ---------------------------------------------------------------------------------------------
+    # Topic Search Results
+    # ---------------------------------------------------------------------------------------------
+    @classmethod
+    def split_byline(cls, byline: str) -> tuple:
+        # "J Siswantoro, AS Prabuwono - Journal Name, 2016 - publisher.com"
+        parts = [part.strip() for part in byline.split(" - ")]
+        venue = parts[1] if len(parts) > 1 else ""
+        if len(parts) == 2 and re.fullmatch(r"[\w.-]+\.\w+", venue):
+            # Only authors and the source domain, no venue or year
+            venue = ""
+        year = re.search(r"\b(1[5-9]\d\d|2\d\d\d)\b", venue)
+        journal = re.sub(r",?\s*\b(1[5-9]\d\d|2\d\d\d)\s*$", "", venue).strip()
+        return parts[0], journal, year.group() if year else ""
+
+    @classmethod
+    def parse_search_results(cls, page) -> list:
+        tree = cls.parse_html(page)
+        results = []
+
+        # Entries only, the "User profiles for ..." card is a gs_r too but has no gs_ri body
+        for entry in tree.xpath(f'//{cls._has_class("div", "gs_r")}[.//{cls._has_class("div", "gs_ri")}]'):
+            heading = entry.xpath(f'.//{cls._has_class("h3", "gs_rt")}')
+            link = heading[0].xpath(".//a") if heading else []
+
+            # Entries without a link ([CITATION], [BOOK]) carry their type tag in the heading text
+            title = cls._text(link) if link else re.sub(r"^(\[[A-Z]+\]\s*)+", "", cls._text(heading))
+            authors, journal, year = cls.split_byline(cls._text(entry.xpath(f'.//{cls._has_class("div", "gs_a")}')))
+
+            citations = "0"
+            for footer_link in entry.xpath(f'.//{cls._has_class("div", "gs_fl")}//a'):
+                match = re.match(r"Cited by (\d+)", cls._text([footer_link]))
+                if match:
+                    citations = match.group(1)
+                    break
+
+            results.append({
+                "title": title,
+                "link": cls.absolute_url(link[0].get("href") or "") if link else "",
+                "description": cls._text(entry.xpath(f'.//{cls._has_class("div", "gs_rs")}')),
+                "authors": authors,
+                "journal": journal,
+                "year": year,
+                "citations": citations,
+                "citation_id": entry.get("data-cid") or "",
+                "detail_url": "",
+            })
+
+        return results
+
+    @classmethod
+    def has_next_results_page(cls, page) -> bool:
+        # Desktop pager links its "Next" label, the mobile pager has a button that is disabled on the last page
+        tree = cls.parse_html(page)
+        if tree.xpath('//*[@id="gs_n"]//a[.//b[contains(., "Next")] or contains(., "Next")]'):
+            return True
+        return bool(tree.xpath('//*[@id="gs_nm"]//button[@aria-label="Next" and not(@disabled)]'))
+
+    # ---------------------------------------------------------------------------------------------
+    # Author Article Table
+    # ---------------------------------------------------------------------------------------------
+    @classmethod
+    def normalize_article_row(cls, row: dict) -> dict:
+        detail_url = cls.absolute_url(row.get("href", ""))
+        citation_id = re.search(r"citation_for_view=([^&]+)", detail_url)
+        citations = re.search(r"\d+", row.get("citations") or "")
+        return {
+            "title": row.get("title", ""),
+            "link": "",
+            "description": "",
+            "authors": row.get("authors", ""),
+            "journal": (row.get("journal") or "").strip().rstrip(","),
+            "year": row.get("year", ""),
+            "citations": citations.group() if citations else "0",
+            "citation_id": citation_id.group(1) if citation_id else "",
+            "detail_url": detail_url,
+        }
+
+    @classmethod
+    def parse_article_table(cls, page) -> list:
+        tree = cls.parse_html(page)
+        articles = []
+
+        for row in tree.xpath(f'//{cls._has_class("tr", "gsc_a_tr")}'):
+            link = row.xpath(f'.//{cls._has_class("a", "gsc_a_at")}')
+            gray = row.xpath(f'.//{cls._has_class("div", "gs_gray")}')
+
+            # The venue cell repeats the year in a hidden span, only keep its own text
+            venue = "".join(gray[1].xpath("text()")) if len(gray) > 1 else ""
+
+            articles.append(cls.normalize_article_row({
+                "title": cls._text(link),
+                "href": (link[0].get("data-href") or link[0].get("href") or "") if link else "",
+                "authors": cls._text(gray[:1]),
+                "journal": venue,
+                "year": cls._text(row.xpath(f'.//{cls._has_class("td", "gsc_a_y")}//span')),
+                "citations": cls._text(row.xpath(f'.//{cls._has_class("a", "gsc_a_ac")}')),
+            }))
+
+        return articles
+
+    @classmethod
+    def has_more_articles(cls, page) -> bool:
+        tree = cls.parse_html(page)
+        button = tree.xpath('//button[@id="gsc_bpf_more"]')
+        return bool(button) and button[0].get("disabled") is None
+
+    # ---------------------------------------------------------------------------------------------
+    # Citation Detail Page
+    # ---------------------------------------------------------------------------------------------
+    @classmethod
+    def parse_citation_details(cls, page) -> dict:
+        tree = cls.parse_html(page)
+        details = {
+            "title": "", "link": "", "description": "",
+            "authors": "", "journal": "", "year": "", "citations": "0"
+        }
+
+        title_link = tree.xpath(f'//{cls._has_class("a", "gsc_oci_title_link")}')
+        if title_link:
+            details["title"] = cls._text(title_link)
+            details["link"] = title_link[0].get("href") or ""
+        else:
+            details["title"] = cls._text(tree.xpath('//*[@id="gsc_oci_title"]'))
+
+        for row in tree.xpath(f'//*[@id="gsc_oci_table"]//{cls._has_class("div", "gs_scl")}'):
+            label = cls._text(row.xpath(f'.//{cls._has_class("div", "gsc_oci_field")}')).lower()
+            value = cls._text(row.xpath(f'.//{cls._has_class("div", "gsc_oci_value")}'))
+
+            if "authors" in label:
+                details["authors"] = value
+            elif "publication date" in label:
+                details["year"] = value
+            elif "journal" in label:
+                details["journal"] = value
+            elif "description" in label:
+                details["description"] = value
+            elif "total citations" in label:
+                # Only read the "Cited by N" link, the value cell also holds the per-year chart
+                value = cls._text(row.xpath(f'.//{cls._has_class("div", "gsc_oci_value")}//a')) or value
+                match = re.search(r'\d+', value)
+                if match: details["citations"] = match.group()
+
+        return details
@@ -0,0 +1,165 @@
+from contextlib import nullcontext
+from urllib.parse import urlparse
+import random
+import threading
+import time
+
+class ScholarBlockedError(RuntimeError):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        # Takes a token now (possibly going negative) and returns how long the caller must wait for it
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class ScholarScheduler:
+    __THROTTLE_MARKERS = (
+        "gs_captcha_f",
+        "id=\"captcha-form\"",
+        "g-recaptcha",
+        "unusual traffic from your computer network",
+        "please show you're not a robot",
+        "our systems have detected unusual traffic",
+        "429 too many requests",
+    )
+
+    def __init__(
+        self,
+        requests_per_second: float = 0.5,
+        burst: int = 3,
+        min_requests_per_second: float = 0.05,
+        max_retries: int = 3,
+        backoff_base: float = 2.0,
+        backoff_max: float = 60.0,
+        is_verbose: bool = False,
+        metrics=None,
+    ):
+        if requests_per_second <= 0:
+            raise ValueError("Requests per second must be positive.")
+        if burst < 1:
+            raise ValueError("Burst must be at least 1.")
+
+        self.__max_rate = requests_per_second
+        self.__min_rate = min(min_requests_per_second, requests_per_second)
+        self.__burst = burst
+        self.__max_retries = max_retries
+        self.__backoff_base = backoff_base
+        self.__backoff_max = backoff_max
+        self.__is_verbose = is_verbose
+        self.__metrics = metrics
+
+        self.__buckets = {}
+        self.__lock = threading.Lock()
+
+    # -------------------- Getters --------------------
+    def get_max_retries(self) -> int:
+        return self.__max_retries
+
+    def get_rate(self, url: str) -> float:
+        with self.__lock:
+            return self._bucket(self._host(url)).rate
+
+    def _timer(self, stage: str):
+        return self.__metrics.timer(stage) if self.__metrics else nullcontext()
+
+    def _increment(self, counter: str):
+        if self.__metrics:
+            self.__metrics.increment(counter)
+
+    # -------------------- Rate Limiting --------------------
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).netloc or url
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self.__buckets:
+            self.__buckets[host] = TokenBucket(self.__max_rate, self.__burst)
+        return self.__buckets[host]
+
+    def acquire(self, url: str):
+        with self.__lock:
+            wait = self._bucket(self._host(url)).reserve()
+        if wait > 0:
+            with self._timer("rate_limit_wait"):
+                time.sleep(wait)
+
+    # Additive increase on success, multiplicative decrease on throttle, so the rate
+    # settles just under whatever the host tolerates
+    def record_success(self, url: str):
+        with self.__lock:
+            bucket = self._bucket(self._host(url))
+            bucket.rate = min(self.__max_rate, bucket.rate + self.__max_rate * 0.05)
+
+    def record_throttle(self, url: str):
+        with self.__lock:
+            bucket = self._bucket(self._host(url))
+            bucket.rate = max(self.__min_rate, bucket.rate / 2)
+            bucket.tokens = min(bucket.tokens, 0)
+
+        self._increment("throttle_events")
+        if self.__is_verbose:
+            print(f"Throttled by {self._host(url)}, slowing down to {bucket.rate:.3f} req/s")
+
+    # -------------------- Backoff --------------------
+    def backoff_delay(self, attempt: int) -> float:
+        # Full jitter keeps parallel workers from retrying in lockstep
+        return random.uniform(0, min(self.__backoff_max, self.__backoff_base * (2 ** attempt)))
+
+    def backoff(self, attempt: int):
+        time.sleep(self.backoff_delay(attempt))
+
+    # -------------------- Throttle Detection --------------------
+    @classmethod
+    def is_throttled(cls, url: str = "", text: str = "", status_code: int = 200) -> bool:
+        if status_code in (429, 503):
+            return True
+        if "/sorry/" in url or "google.com/sorry" in url:
+            return True
+        lowered = (text or "").lower()
+        return any(marker in lowered for marker in cls.__THROTTLE_MARKERS)
+
+    def run(self, url: str, fetch, check):
+        # fetch() loads the page, check(result) tells whether it came back throttled
+        for attempt in range(self.__max_retries + 1):
+            if attempt:
+                self._increment("retries")
+            self.acquire(url)
+            with self._timer("page_load"):
+                result = fetch()
+            if not check(result):
+                self.record_success(url)
+                return result
+
+            self.record_throttle(url)
+            if attempt < self.__max_retries:
+                with self._timer("backoff"):
+                    self.backoff(attempt)
+
+        self._increment("blocked_requests")
+        raise ScholarBlockedError(f"Google Scholar blocked the request to {url}.")
+
+    def __repr__(self) -> str:
+        return (
+            f"ScholarScheduler("
+            f"requests_per_second={self.__max_rate}, "
+            f"burst={self.__burst}, "
+            f"max_retries={self.__max_retries}, "
+            f"backoff_base={self.__backoff_base}, "
+            f"backoff_max={self.__backoff_max}"
+            f")"
+        )
@@ -1,21 +1,54 @@
 # Project models
 from models.scholarScraperConfig import ScholarScraperConfig
 from models.scholarPaper import ScholarPaper
-
-# Selenium imports
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
+from models.scholarDriverPool import ScholarDriverPool
+from models.scholarParser import ScholarParser
+from models.scholarHttpClient import ScholarHttpClient
+from models.scholarScheduler import ScholarScheduler, ScholarBlockedError
+from models.scholarArchive import ScholarReplayClient
+
+# Selenium is imported inside the methods that drive the browser, the http backend never loads it
+from concurrent.futures import ThreadPoolExecutor
 import re
 
 class ScholarScraper:
     __BASE_URL = "https://scholar.google.com/scholar?hl=en"
-
-    def __init__(self, query: str = "", config: ScholarScraperConfig = None):
+    __PROFILE_PAGE_SIZE = 100
+    __RESULTS_PAGE_SIZE = 10
+
+    # Reads every loaded row of the author article table in a single round trip
+    __ARTICLE_TABLE_SCRIPT = """
+        return Array.from(document.querySelectorAll('tr.gsc_a_tr')).map(function (row) {
+            var link = row.querySelector('a.gsc_a_at');
+            var gray = row.querySelectorAll('div.gs_gray');
+            var venue = '';
+            if (gray.length > 1) {
+                gray[1].childNodes.forEach(function (node) {
+                    if (node.nodeType === Node.TEXT_NODE) { venue += node.textContent; }
+                });
+            }
+            var cites = row.querySelector('a.gsc_a_ac');
+            var year = row.querySelector('td.gsc_a_y span');
+            return {
+                title: link ? link.textContent : '',
+                href: link ? (link.getAttribute('data-href') || link.getAttribute('href') || '') : '',
+                authors: gray.length > 0 ? gray[0].textContent : '',
+                journal: venue,
+                year: year ? year.textContent : '',
+                citations: cites ? cites.textContent : ''
+            };
+        });
+    """
+
+    def __init__(
+        self,
+        query: str = "",
+        config: ScholarScraperConfig = None,
+        webdriver=None,
+        pool: ScholarDriverPool = None,
+    ):
         self.config = config or ScholarScraperConfig()
+        self.__pool = pool
         
         if self.config._is_verbose:
             print("Initializing ScholarScraper...")
@@ -25,9 +58,28 @@ class ScholarScraper:
         self.__query_array = []
         self.__query_url = ""
         self.__search_url = ""
+        self.__pages_loaded = 0
+        self.__page_html = ""
+
+        # Plain HTTP first when configured, Chrome is only started if a page needs it
+        self.__http = None
+        if self.config.get_backend() == "http":
+            self.__http = ScholarHttpClient(
+                proxy=self.config.get_proxy(),
+                timeout=self.config.get_http_timeout(),
+                is_verbose=self.config._is_verbose,
+                scheduler=self.config.get_scheduler(),
+                archive=self.config.get_archive() if self.config.is_recording() else None,
+            )
+        elif self.config.get_backend() == "replay":
+            # Recorded pages only, a missing page raises ScholarReplayMiss instead of going online
+            if self.config.get_archive() is None:
+                raise ValueError("The replay backend needs an archive path.")
+            self.__http = ScholarReplayClient(self.config.get_archive(), is_verbose=self.config._is_verbose)
 
-        # Init webdriver (ALWAYS)
-        self.__webdriver = self._init_webdriver()
+        # Webdriver is lent by a pool or started on the first Selenium request
+        self.__owns_webdriver = webdriver is None
+        self.__webdriver = webdriver
 
         if query:
             self.set_query(query)
@@ -45,6 +97,9 @@ class ScholarScraper:
     def get_search_url(self):
         return self.__search_url
 
+    def get_pages_loaded(self):
+        return self.__pages_loaded
+
     # -------------------- Setters --------------------
     def set_query(self, query: str):
         if not query:
@@ -68,11 +123,28 @@ class ScholarScraper:
     def _init_webdriver(
         self
     ):
+        from selenium import webdriver
+
         if self.config._is_verbose:
             print("Initializing Selenium WebDriver...")
-        return webdriver.Chrome(options=self.config.apply_to_chrome_options())
+        with self.config.get_metrics().timer("driver_start"):
+            return webdriver.Chrome(options=self.config.apply_to_chrome_options())
+
+    def _fallback_to_selenium(self, reason):
+        if self.config._is_verbose:
+            print(f"Falling back to Selenium: {reason}")
+        if self.__http:
+            self.__http.close()
+            self.__http = None
+        if self.__webdriver is None:
+            self.__webdriver = self._init_webdriver()
 
     def _close_webdriver(self):
+        if self.__http:
+            self.__http.close()
+        # Pooled drivers are returned to their pool by the caller, never quit here
+        if not self.__owns_webdriver:
+            return
         if self.config._is_verbose:
             print("Closing Selenium WebDriver...")
         if self.__webdriver:
@@ -89,15 +161,48 @@ class ScholarScraper:
         if "scholar.google.com" not in self.__webdriver.current_url:
             return False
 
+        if self._is_throttled():
+            return False
+
         return True
 
+    def _is_throttled(self, driver=None):
+        driver = driver or self.__webdriver
+        return ScholarScheduler.is_throttled(driver.current_url, driver.page_source)
+
+    def _load_page(self, url, driver=None):
+        own_driver = driver is None
+        driver = driver or self.__webdriver
+
+        def fetch():
+            driver.get(url)
+            if own_driver:
+                self.__pages_loaded += 1
+
+        # Rate limited per host, CAPTCHA pages are retried with backoff before giving up
+        self.config.get_scheduler().run(url, fetch, lambda _: self._is_throttled(driver))
+
+        if self.config.is_recording():
+            self.config.get_archive().save(url, driver.page_source)
+
     # -------------------- Scraping Logic --------------------
     def request_scholar(self, query: str):
         if self.config._is_verbose:
             print(f"Scraping Google Scholar for query: {query}")
 
         self.set_query(query)
-        self.__webdriver.get(self.get_search_url())
+
+        if self.__http:
+            try:
+                self.__page_html = self.__http.get(self.get_search_url())
+                self.__pages_loaded += 1
+                return
+            except ScholarBlockedError as e:
+                self._fallback_to_selenium(e)
+
+        if self.__webdriver is None:
+            self.__webdriver = self._init_webdriver()
+        self._load_page(self.get_search_url())
 
         if not self.check_request_status():
             raise RuntimeError("Failed to access Google Scholar.")
@@ -107,28 +212,36 @@ class ScholarScraper:
             print("Title:", self.__webdriver.title)
 
     def _navigate_to_author_profile(self, author_name):
+        from selenium.webdriver.common.by import By
+
         try:
             profile_links = self.__webdriver.find_elements(By.CSS_SELECTOR, "h4.gs_rt2 a")
             for link in profile_links:
-                if "citations?user=" in link.get_attribute("href"):
+                href = link.get_attribute("href")
+                if "citations?user=" in href:
                     if author_name.lower() in link.text.lower():
-                        link.click()
+                        self._load_page(href)
                         return True
 
             user_cards = self.__webdriver.find_elements(By.CSS_SELECTOR, "div.gsc_1usr h3.gs_rt a")
             for link in user_cards:
                 if author_name.lower() in link.text.lower():
-                    link.click()
+                    self._load_page(link.get_attribute("href"))
                     return True
 
             if self.config._is_verbose: print("Author profile not found.")
             return False
 
+        except ScholarBlockedError:
+            raise
         except Exception as e:
             if self.config._is_verbose: print(f"Error finding profile: {e}")
             return False
         
     def _load_more_articles_if_needed(self, required_count):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+
         try:
             while True:
                 articles = self.__webdriver.find_elements(By.CSS_SELECTOR, "tr.gsc_a_tr")
@@ -144,33 +257,44 @@ class ScholarScraper:
 
                 if self.config._is_verbose: print("Clicking 'Show More'...")
 
-                show_more_btn.click()
-                time.sleep(0)
+                # Wait for the new rows (or the button to be disabled) instead of a fixed sleep
+                loaded = len(articles)
+                with self.config.get_metrics().timer("load_more"):
+                    show_more_btn.click()
+                    WebDriverWait(self.__webdriver, self.config.get_page_timeout()).until(
+                        lambda d: len(d.find_elements(By.CSS_SELECTOR, "tr.gsc_a_tr")) > loaded
+                        or d.find_element(By.ID, "gsc_bpf_more").get_attribute("disabled")
+                    )
                 
         except Exception as e:
             if self.config._is_verbose: print(f"Stop loading more: {e}")
 
-    def _scrape_modal_details(self):
+    def _scrape_modal_details(self, driver=None):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        driver = driver or self.__webdriver
         details = {
             "title": "", "link": "", "description": "", 
             "authors": "", "journal": "", "year": "", "citations": "0"
         }
         
         try:
-            WebDriverWait(self.__webdriver, 10).until(
+            WebDriverWait(driver, self.config.get_modal_timeout()).until(
                 EC.visibility_of_element_located((By.ID, "gsc_oci_table"))
             )
 
             try:
-                title_elem = self.__webdriver.find_element(By.CSS_SELECTOR, "a.gsc_oci_title_link")
+                title_elem = driver.find_element(By.CSS_SELECTOR, "a.gsc_oci_title_link")
                 details["title"] = title_elem.text
                 details["link"] = title_elem.get_attribute("href")
             except:
                 try: 
-                    details["title"] = self.__webdriver.find_element(By.ID, "gsc_oci_title").text
+                    details["title"] = driver.find_element(By.ID, "gsc_oci_title").text
                 except: pass
 
-            rows = self.__webdriver.find_elements(By.CSS_SELECTOR, "div.gs_scl")
+            rows = driver.find_elements(By.CSS_SELECTOR, "div.gs_scl")
             
             for row in rows:
                 try:
@@ -196,15 +320,195 @@ class ScholarScraper:
             
         return details
 
-    def scrape_scholar_papers(self, count=10, output_format="dict"):
-        papers = []
+    def _extract_article_rows(self, count):
+        rows = self.__webdriver.execute_script(self.__ARTICLE_TABLE_SCRIPT) or []
+        return [ScholarParser.normalize_article_row(row) for row in rows[:count]]
+
+    def _merge_article_details(self, article, details):
+        # The table is authoritative for what it shows, the detail page only fills the gaps
+        for field in ("link", "description"):
+            article[field] = details[field]
+        for field in ("title", "authors", "journal", "year"):
+            if details[field] and (not article[field] or article[field].endswith("...")):
+                article[field] = details[field]
+        return article
+
+    def _fetch_article_details(self, article, driver=None):
+        if not article["detail_url"]:
+            return article
+
+        if self.__http and driver is None:
+            details = ScholarParser.parse_citation_details(self.__http.get(article["detail_url"]))
+            self.__pages_loaded += 1
+            return self._merge_article_details(article, details)
+
+        self._load_page(article["detail_url"], driver)
+        with self.config.get_metrics().timer("modal_fetch"):
+            details = self._scrape_modal_details(driver)
+        return self._merge_article_details(article, details)
+
+    def _fetch_article_details_pooled(self, pool, article):
+        with pool.session() as session:
+            try:
+                return self._fetch_article_details(article, session.driver)
+            finally:
+                session.pages += 1
 
-        if not self._navigate_to_author_profile(self.__query):
+    def _fetch_article_details_safely(self, article, pool=None):
+        metrics = self.config.get_metrics()
+        try:
+            with metrics.timer("row_detail"):
+                if pool is None:
+                    self._fetch_article_details(article)
+                else:
+                    self._fetch_article_details_pooled(pool, article)
+        except Exception as e:
+            metrics.increment("failed_rows")
+            if self.config._is_verbose: print(f"Error fetching details for {article['title']}: {e}")
+        return article
+
+    def _iter_article_details(self, articles, concurrency=1):
+        if concurrency <= 1:
+            for article in articles:
+                yield self._fetch_article_details_safely(article)
+            return
+
+        # The HTTP session is thread safe, no browsers needed to fan out
+        pool = None
+        if not self.__http:
+            pool = self.__pool or ScholarDriverPool(config=self.config, max_size=concurrency)
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            futures = [
+                executor.submit(self._fetch_article_details_safely, article, pool)
+                for article in articles
+            ]
+            # Yield in row order regardless of finish order
+            for future in futures:
+                yield future.result()
+        finally:
+            # Runs on early stop too, pending fetches are dropped instead of finishing in the background
+            executor.shutdown(wait=True, cancel_futures=True)
+            if pool is not None and pool is not self.__pool:
+                pool.close()
+
+    def _fetch_all_article_details(self, articles, concurrency=1):
+        for _ in self._iter_article_details(articles, concurrency):
+            pass
+
+    def _read_table_over_http(self, count):
+        profile_url = ScholarParser.parse_author_profile_url(self.__page_html, self.__query)
+        if not profile_url:
+            if self.config._is_verbose: print("Author profile not found.")
+            return []
+
+        # The profile table can be paged directly, no 'Show More' clicks required
+        articles = []
+        while len(articles) < count:
+            page = self.__http.get(
+                f"{profile_url}&cstart={len(articles)}&pagesize={self.__PROFILE_PAGE_SIZE}"
+            )
+            self.__pages_loaded += 1
+            rows = ScholarParser.parse_article_table(page)
+            articles.extend(rows)
+            # More rows than one page means a table expanded in Chrome and recorded under cstart=0,
+            # it already holds everything that run loaded and no later cstart was ever fetched
+            if len(rows) != self.__PROFILE_PAGE_SIZE or not ScholarParser.has_more_articles(page):
+                break
+        return articles[:count]
+
+    def _read_article_table(self, count):
+        if self.__http:
+            try:
+                return self._read_table_over_http(count)
+            except ScholarBlockedError as e:
+                self._fallback_to_selenium(e)
+                self.request_scholar(self.__query)
+
+        with self.config.get_metrics().timer("profile_navigation"):
+            found = self._navigate_to_author_profile(self.__query)
+        if not found:
             return []
 
+        self._load_more_articles_if_needed(count)
+
+        if self.config.is_recording():
+            # Stored under the paged URL the HTTP path asks for, so Selenium recordings replay too
+            self.config.get_archive().save(
+                f"{self.__webdriver.current_url}&cstart=0&pagesize={self.__PROFILE_PAGE_SIZE}",
+                self.__webdriver.page_source,
+            )
+        return self._extract_article_rows(count)
+
+    def _build_papers(self, articles):
+        return [
+            ScholarPaper(
+                title=a["title"],
+                link=a["link"],
+                description=a["description"],
+                authors=a["authors"],
+                journal=a["journal"],
+                year=a["year"],
+                citations=a["citations"],
+                citation_id=a["citation_id"]
+            )
+            for a in articles
+        ]
+
+    def _format_papers(self, papers, output_format):
+        if output_format=="json":
+            return [paper.to_json() for paper in papers]
+        
+        if output_format=="dict":
+            return [paper.to_dict() for paper in papers]
+
+    def scrape_scholar_papers(
+        self,
+        count=10,
+        output_format="dict",
+        fast=False,
+        fetch_details=False,
+        concurrency=1,
+    ):
+        papers = list(self.iter_scholar_papers(
+            count=count,
+            fast=fast,
+            fetch_details=fetch_details,
+            concurrency=concurrency,
+        ))
+        return self._format_papers(papers, output_format)
+
+    def _record_query(self, kind: str):
+        # Lets a replay run (and benchmark.py) send each recorded query down the path it was recorded on
+        if self.config.is_recording() and self.__query:
+            self.config.get_archive().save_query(self.__query, kind)
+
+    def iter_scholar_papers(self, count=10, fast=False, fetch_details=False, concurrency=1):
+        self._record_query("author")
+        # Parallel detail fetching always goes through the table, the click loop below is inherently serial.
+        # Recording does too: modals opened by a click have no URL of their own to archive them under
+        if self.__http or fast or concurrency > 1 or self.config.is_recording():
+            with self.config.get_metrics().timer("article_table"):
+                articles = self._read_article_table(count)
+            if fetch_details or not fast:
+                articles = self._iter_article_details(articles, concurrency)
+            for article in articles:
+                yield self._build_papers([article])[0]
+            return
+
+        with self.config.get_metrics().timer("profile_navigation"):
+            found = self._navigate_to_author_profile(self.__query)
+        if not found:
+            return
+
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
         for i in range(count):
             try:
-                article_rows = WebDriverWait(self.__webdriver, 10).until(
+                article_rows = WebDriverWait(self.__webdriver, self.config.get_page_timeout()).until(
                     EC.presence_of_all_elements_located((By.CSS_SELECTOR, "tr.gsc_a_tr"))
                 )
                 
@@ -214,11 +518,14 @@ class ScholarScraper:
                 current_row = article_rows[i]
                 
                 title_link = current_row.find_element(By.CSS_SELECTOR, "a.gsc_a_at")
+                self.config.get_scheduler().acquire(self.__webdriver.current_url)
                 title_link.click()
+                self.__pages_loaded += 1
                 
-                data = self._scrape_modal_details()
+                with self.config.get_metrics().timer("modal_fetch"):
+                    data = self._scrape_modal_details()
                 
-                papers.append(ScholarPaper(
+                yield ScholarPaper(
                     title=data["title"],
                     link=data["link"],
                     description=data["description"],
@@ -226,10 +533,10 @@ class ScholarScraper:
                     journal=data["journal"],
                     year=data["year"],
                     citations=data["citations"]
-                ))
+                )
          
                 try:
-                    back_btn = WebDriverWait(self.__webdriver, 5).until(
+                    back_btn = WebDriverWait(self.__webdriver, self.config.get_modal_timeout()).until(
                         EC.element_to_be_clickable((By.ID, "gs_hdr_bck"))
                     )
                     back_btn.click()
@@ -239,19 +546,164 @@ class ScholarScraper:
                         self.__webdriver.find_element(By.ID, "gsc_oci_x").click()
                     except:
                         pass
-                
-                time.sleep(1)
 
             except Exception as e:
+                self.config.get_metrics().increment("failed_rows")
                 if self.config._is_verbose: print(f"Error processing row {i}: {e}")
                 try:
                     self.__webdriver.find_element(By.ID, "gs_hdr_bck").click()
-                    time.sleep(1)
                 except: pass
                 continue
 
-        if output_format=="json":
-            return [paper.to_json() for paper in papers]
-        
-        if output_format=="dict":
-            return [paper.to_dict() for paper in papers]
\ No newline at end of file
+    # -------------------- Topic Search --------------------
+    def _results_page_url(self, start):
+        # The first page keeps the plain search URL, so it shares archive entries with request_scholar
+        if start == 0:
+            return self.get_search_url()
+        return f"{self.get_search_url()}&start={start}"
+
+    def _fetch_results_page(self, client, url):
+        with self.config.get_metrics().timer("results_page"):
+            if client is not None:
+                page = client.get(url)
+                self.__pages_loaded += 1
+                return page
+
+            if self.__webdriver is None:
+                self.__webdriver = self._init_webdriver()
+            self._load_page(url)
+            return self.__webdriver.page_source
+
+    def scrape_search_results(self, count=10, output_format="dict", prefetch=True):
+        papers = list(self.iter_search_results(count=count, prefetch=prefetch))
+        return self._format_papers(papers, output_format)
+
+    def iter_search_results(self, count=10, prefetch=True):
+        self._record_query("topic")
+        # Result pages are static HTML, so even the Selenium backend reads them over plain HTTP
+        # first and only starts Chrome when Scholar blocks that
+        client = self.__http
+        own_client = None
+        if client is None and self.__webdriver is None:
+            own_client = client = ScholarHttpClient(
+                proxy=self.config.get_proxy(),
+                timeout=self.config.get_http_timeout(),
+                is_verbose=self.config._is_verbose,
+                scheduler=self.config.get_scheduler(),
+                archive=self.config.get_archive() if self.config.is_recording() else None,
+            )
+
+        # One page ahead: the next request waits out the rate limit while this page is consumed
+        executor = ThreadPoolExecutor(max_workers=1) if client is not None and prefetch else None
+        pending = None
+        start = 0
+        found = 0
+
+        try:
+            while found < count:
+                url = self._results_page_url(start)
+                try:
+                    page = pending.result() if pending is not None else self._fetch_results_page(client, url)
+                except ScholarBlockedError as e:
+                    if client is None:
+                        raise
+                    if client is self.__http:
+                        self._fallback_to_selenium(e)
+                    elif self.config._is_verbose:
+                        print(f"Falling back to Selenium: {e}")
+                    client = None
+                    page = self._fetch_results_page(client, url)
+                pending = None
+
+                tree = ScholarParser.parse_html(page)
+                has_next = ScholarParser.has_next_results_page(tree)
+                needs_next = has_next and found + self.__RESULTS_PAGE_SIZE < count
+                if needs_next and client is not None and executor is not None:
+                    pending = executor.submit(
+                        self._fetch_results_page, client, self._results_page_url(start + self.__RESULTS_PAGE_SIZE)
+                    )
+
+                rows = ScholarParser.parse_search_results(tree)
+                for row in rows[:count - found]:
+                    yield self._build_papers([row])[0]
+                found += min(len(rows), count - found)
+
+                if not rows or not has_next:
+                    break
+                start += self.__RESULTS_PAGE_SIZE
+        finally:
+            # Runs on early stop too, an unused prefetch is dropped instead of awaited
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            if own_client is not None:
+                own_client.close()
+
+    # -------------------- Incremental Refresh --------------------
+    @staticmethod
+    def _article_key(citation_id: str, title: str) -> str:
+        return citation_id or " ".join(title.lower().split())
+
+    @staticmethod
+    def _same_title(stored: str, listed: str) -> bool:
+        # Long titles are cut with "..." in the table but stored in full from the detail page,
+        # a cut title still matches when it is the start of the stored one
+        if listed.endswith("..."):
+            return stored.startswith(listed[:-3].rstrip())
+        return stored == listed
+
+    def refresh_scholar_papers(
+        self,
+        previous,
+        count=10,
+        output_format="dict",
+        fetch_details=True,
+        concurrency=1,
+    ):
+        self._record_query("author")
+        known = {}
+        for paper in previous or []:
+            if not isinstance(paper, ScholarPaper):
+                paper = ScholarPaper.from_dict(paper)
+            known[self._article_key(paper.get_citation_id(), paper.get_title())] = paper
+
+        with self.config.get_metrics().timer("article_table"):
+            articles = self._read_article_table(count)
+
+        # Only rows that are new or whose title or citation count moved need their detail page
+        matches = []
+        stale = []
+        for article in articles:
+            paper = known.get(self._article_key(article["citation_id"], article["title"]))
+            citations = ScholarPaper.parse_citations(article["citations"])
+            if paper is None or not self._same_title(paper.get_title(), article["title"]) or paper.get_citations() != citations:
+                stale.append(article)
+            matches.append(paper)
+
+        if self.config._is_verbose:
+            print(f"Refreshing {len(stale)} of {len(articles)} articles.")
+
+        if fetch_details:
+            self._fetch_all_article_details(stale, concurrency)
+
+        stale_ids = {id(article) for article in stale}
+        papers = []
+        for article, paper in zip(articles, matches):
+            if paper is None:
+                paper = self._build_papers([article])[0]
+            elif id(article) in stale_ids:
+                # Without a detail page the row may still be cut, the stored full text is kept then
+                if not article["title"].endswith("..."):
+                    paper.set_title(article["title"])
+                if not article["authors"].endswith("..."):
+                    paper.set_authors(article["authors"])
+                paper.set_journal(article["journal"])
+                paper.set_year(article["year"])
+                paper.set_citations(article["citations"])
+                paper.set_citation_id(article["citation_id"])
+                if article["link"]:
+                    paper.set_link(article["link"])
+                if article["description"]:
+                    paper.set_description(article["description"])
+            papers.append(paper)
+
+        return self._format_papers(papers, output_format)
@@ -1,4 +1,8 @@
-from selenium import webdriver
+# Project models
+from models.scholarScheduler import ScholarScheduler
+from models.scholarMetrics import ScholarMetrics
+
+backend_pack = ["selenium", "http", "replay"]
 
 class ScholarScraperConfig:
     def __init__(
@@ -12,6 +16,15 @@ class ScholarScraperConfig:
         disable_software_rasterizer: bool = True,
         remote_allow_origins: bool = True,
         extra_args: list = None,
+        backend: str = "selenium",
+        http_timeout: float = 10,
+        requests_per_second: float = 1.0,
+        burst: int = 5,
+        max_retries: int = 3,
+        page_timeout: float = 10,
+        modal_timeout: float = 10,
+        archive_path: str = None,
+        record: bool = False,
     ):
         self._is_verbose = is_verbose
         self._headless = headless
@@ -22,6 +35,18 @@ class ScholarScraperConfig:
         self._disable_software_rasterizer = disable_software_rasterizer
         self._remote_allow_origins = remote_allow_origins
         self._extra_args = extra_args or []
+        self.set_backend(backend)
+        self._http_timeout = http_timeout
+        self._requests_per_second = requests_per_second
+        self._burst = burst
+        self._max_retries = max_retries
+        self._page_timeout = page_timeout
+        self._modal_timeout = modal_timeout
+        self._scheduler = None
+        self._metrics = None
+        self._archive_path = archive_path
+        self._record = record
+        self._archive = None
 
     # Setter
     def is_verbose(self) -> bool:
@@ -55,6 +80,81 @@ class ScholarScraperConfig:
     def get_extra_args(self) -> str:
         return self._extra_args
 
+    def get_backend(self) -> str:
+        return self._backend
+
+    def get_http_timeout(self) -> float:
+        return self._http_timeout
+
+    def get_page_timeout(self) -> float:
+        return self._page_timeout
+
+    def get_modal_timeout(self) -> float:
+        return self._modal_timeout
+
+    def is_recording(self) -> bool:
+        return self._record and self._archive_path is not None
+
+    # Page archive for record (every fetched page is saved) and the replay backend
+    def get_archive(self):
+        if self._archive is None and self._archive_path:
+            from models.scholarArchive import ScholarArchive
+            self._archive = ScholarArchive(self._archive_path)
+        return self._archive
+
+    def set_archive(self, archive_path: str, record: bool = False):
+        self._archive_path = archive_path
+        self._record = record
+        self._archive = None
+
+    # Shared by every scraper using this config, so the per-host rate limit holds across threads
+    def get_scheduler(self) -> ScholarScheduler:
+        if self._scheduler is None:
+            self._scheduler = ScholarScheduler(
+                requests_per_second=self._requests_per_second,
+                burst=self._burst,
+                max_retries=self._max_retries,
+                is_verbose=self._is_verbose,
+                metrics=self.get_metrics(),
+            )
+        return self._scheduler
+
+    # Stage timings and counters of every scraper using this config
+    def get_metrics(self) -> ScholarMetrics:
+        if self._metrics is None:
+            self._metrics = ScholarMetrics()
+        return self._metrics
+
+    def set_metrics(self, metrics: ScholarMetrics):
+        self._metrics = metrics
+        self._scheduler = None
+
+    # Fetch backend
+    def set_backend(self, backend: str):
+        if backend not in backend_pack:
+            raise ValueError(f"Backend must be one of {backend_pack}.")
+        self._backend = backend
+
+    def set_http_timeout(self, timeout: float):
+        self._http_timeout = timeout
+
+    # Pacing
+    def set_rate_limit(self, requests_per_second: float, burst: int = None):
+        self._requests_per_second = requests_per_second
+        if burst is not None:
+            self._burst = burst
+        self._scheduler = None
+
+    def set_max_retries(self, max_retries: int):
+        self._max_retries = max_retries
+        self._scheduler = None
+
+    def set_page_timeout(self, timeout: float):
+        self._page_timeout = timeout
+
+    def set_modal_timeout(self, timeout: float):
+        self._modal_timeout = timeout
+
     # WebDriver
     def set_headless(self, value: bool):
         self._headless = value
@@ -70,7 +170,9 @@ class ScholarScraperConfig:
         if arg in self._extra_args:
             self._extra_args.remove(arg)
             
-    def apply_to_chrome_options(self) -> webdriver.ChromeOptions:
+    def apply_to_chrome_options(self):
+        from selenium import webdriver
+
         options = webdriver.ChromeOptions()
 
         options.add_argument(
@@ -110,6 +212,15 @@ class ScholarScraperConfig:
             f"disable_gpu={self._disable_gpu}, "
             f"disable_software_rasterizer={self._disable_software_rasterizer}, "
             f"remote_allow_origins={self._remote_allow_origins}, "
-            f"extra_args={self._extra_args}"
+            f"extra_args={self._extra_args}, "
+            f"backend={self._backend}, "
+            f"http_timeout={self._http_timeout}, "
+            f"requests_per_second={self._requests_per_second}, "
+            f"burst={self._burst}, "
+            f"max_retries={self._max_retries}, "
+            f"page_timeout={self._page_timeout}, "
+            f"modal_timeout={self._modal_timeout}, "
+            f"archive_path={self._archive_path}, "
+            f"record={self._record}"
             f")"
         )
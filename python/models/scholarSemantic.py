@@ -0,0 +1,444 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+class ScholarEmbedder:
+    # LSA over hashed TF-IDF features: offline, CPU only, and words that share contexts ("neural nets",
+    # "deep learning") end up close even without a common term
+    def __init__(self, dim: int = 128, n_features: int = 2 ** 16, max_fit_documents: int = 200_000, seed: int = 0):
+        self.__dim = dim
+        self.__n_features = n_features
+        self.__max_fit_documents = max_fit_documents
+        self.__seed = seed
+
+        self.__idf = None
+        self.__components = None
+        self.__fitted_on = 0
+
+        # Stateless, so vectors stay comparable across runs without a stored vocabulary
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self.__hasher = HashingVectorizer(
+            n_features=n_features, alternate_sign=False, norm=None, ngram_range=(1, 2), dtype=np.float32
+        )
+
+    # ---------------------------------------------------------------------------------------------
+    # Getters
+    # ---------------------------------------------------------------------------------------------
+    def get_dim(self) -> int:
+        return self.__dim
+
+    def get_max_fit_documents(self) -> int:
+        return self.__max_fit_documents
+
+    def get_fitted_on(self) -> int:
+        return self.__fitted_on
+
+    def is_fitted(self) -> bool:
+        return self.__components is not None
+
+    # ---------------------------------------------------------------------------------------------
+    # Fitting
+    # ---------------------------------------------------------------------------------------------
+    def _weight(self, documents):
+        counts = self.__hasher.transform(documents)
+        counts.data = np.log1p(counts.data)
+        return counts.multiply(self.__idf).tocsr() if self.__idf is not None else counts
+
+    def fit(self, documents):
+        from sklearn.decomposition import TruncatedSVD
+
+        documents = list(documents)
+        if len(documents) > self.__max_fit_documents:
+            # A random sample is enough to find the topic directions, the rest is only projected
+            rng = np.random.default_rng(self.__seed)
+            picked = rng.choice(len(documents), self.__max_fit_documents, replace=False)
+            documents = [documents[i] for i in picked]
+
+        counts = self.__hasher.transform(documents)
+        df = np.bincount(counts.indices, minlength=self.__n_features)
+        self.__idf = (np.log((1 + len(documents)) / (1 + df)) + 1).astype(np.float32)
+
+        weighted = self._weight(documents)
+        # A tiny corpus cannot have more components than documents, the rest stays zero
+        components = max(1, min(self.__dim, weighted.shape[0] - 1, weighted.shape[1] - 1))
+        svd = TruncatedSVD(n_components=components, random_state=self.__seed).fit(weighted)
+
+        self.__components = np.zeros((self.__dim, self.__n_features), dtype=np.float32)
+        self.__components[:components] = svd.components_
+        self.__fitted_on = len(documents)
+        return self
+
+    # ---------------------------------------------------------------------------------------------
+    # Encoding
+    # ---------------------------------------------------------------------------------------------
+    def encode(self, documents, batch_size: int = 4096) -> np.ndarray:
+        if not self.is_fitted():
+            raise RuntimeError("Embedder not fitted. Call fit() first.")
+
+        documents = list(documents)
+        vectors = np.zeros((len(documents), self.__dim), dtype=np.float32)
+        for start in range(0, len(documents), batch_size):
+            # Sparse rows times the dense projection, only the non-zero features are touched
+            batch = self._weight(documents[start:start + batch_size])
+            vectors[start:start + batch.shape[0]] = batch @ self.__components.T
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    # ---------------------------------------------------------------------------------------------
+    # Persistence
+    # ---------------------------------------------------------------------------------------------
+    def save(self, path: str):
+        if not self.is_fitted():
+            raise RuntimeError("Embedder not fitted. Call fit() first.")
+        with open(path, "wb") as file:
+            np.savez(
+                file,
+                idf=self.__idf,
+                components=self.__components,
+                meta=np.array([self.__dim, self.__n_features, self.__fitted_on, self.__seed]),
+            )
+
+    @classmethod
+    def load(cls, path: str, max_fit_documents: int = 200_000) -> "ScholarEmbedder":
+        data = np.load(path)
+        dim, n_features, fitted_on, seed = (int(value) for value in data["meta"])
+        embedder = cls(dim=dim, n_features=n_features, max_fit_documents=max_fit_documents, seed=seed)
+        embedder.__idf = data["idf"]
+        embedder.__components = data["components"]
+        embedder.__fitted_on = fitted_on
+        return embedder
+
+    def __repr__(self) -> str:
+        return (
+            f"ScholarEmbedder("
+            f"dim={self.__dim}, "
+            f"n_features={self.__n_features}, "
+            f"fitted_on={self.__fitted_on}"
+            f")"
+        )
+
+
+class ScholarVectorStore:
+    # Append-only float32 rows in a raw file, read back through a memory map so 1M vectors cost
+    # page cache, not heap
+    VECTORS = "vectors.f32"
+    RECORDS = "records.ndjson"
+
+    def __init__(self, path: str, dim: int):
+        self.__path = path
+        self.__dim = dim
+        self.__keys = []
+        self.__rows = {}
+        self.__texts = []
+        self.__payloads = []
+        self.__vectors = None
+
+        os.makedirs(path, exist_ok=True)
+        records = os.path.join(path, self.RECORDS)
+        if os.path.exists(records):
+            with open(records, encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        self._append_record(json.loads(line))
+
+        # A crash between the two writes leaves vectors without a record, they are cut off before the next append
+        expected = 4 * dim * len(self.__keys)
+        size = os.path.getsize(self._vectors_path()) if os.path.exists(self._vectors_path()) else 0
+        if size < expected:
+            raise RuntimeError(f"Vector file in {path} is shorter than its records.")
+        if size > expected:
+            with open(self._vectors_path(), "r+b") as file:
+                file.truncate(expected)
+
+    def _vectors_path(self) -> str:
+        return os.path.join(self.__path, self.VECTORS)
+
+    def _append_record(self, record: dict):
+        self.__rows[record["key"]] = len(self.__keys)
+        self.__keys.append(record["key"])
+        self.__texts.append(record.get("text") or "")
+        self.__payloads.append(record.get("payload"))
+
+    # ---------------------------------------------------------------------------------------------
+    # Getters
+    # ---------------------------------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__rows
+
+    def get_row(self, key: str):
+        return self.__rows.get(key)
+
+    def get_key(self, row: int) -> str:
+        return self.__keys[row]
+
+    def get_payload(self, row: int):
+        return self.__payloads[row]
+
+    def get_texts(self) -> list:
+        return list(self.__texts)
+
+    def vectors(self) -> np.ndarray:
+        if self.__vectors is None or self.__vectors.shape[0] != len(self.__keys):
+            if not self.__keys:
+                return np.zeros((0, self.__dim), dtype=np.float32)
+            self.__vectors = np.memmap(
+                self._vectors_path(), dtype=np.float32, mode="r", shape=(len(self.__keys), self.__dim)
+            )
+        return self.__vectors
+
+    # ---------------------------------------------------------------------------------------------
+    # Writing
+    # ---------------------------------------------------------------------------------------------
+    def add(self, keys, vectors: np.ndarray, texts=None, payloads=None) -> int:
+        texts = texts or [""] * len(keys)
+        payloads = payloads or [None] * len(keys)
+
+        # Stored vectors are immutable, a key seen before keeps its first version
+        new, seen = [], set()
+        for i, key in enumerate(keys):
+            if key not in self.__rows and key not in seen:
+                seen.add(key)
+                new.append(i)
+        if not new:
+            return 0
+
+        # Vectors before records, so a record never points past the end of the file
+        with open(self._vectors_path(), "ab") as file:
+            file.write(np.ascontiguousarray(vectors[new], dtype=np.float32).tobytes())
+        with open(os.path.join(self.__path, self.RECORDS), "a", encoding="utf-8") as file:
+            for i in new:
+                record = {"key": keys[i], "text": texts[i], "payload": payloads[i]}
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._append_record(record)
+        return len(new)
+
+    def rewrite(self, vectors: np.ndarray):
+        # Same rows, new vectors (after the embedder was refitted)
+        self.__vectors = None
+        temporary = self._vectors_path() + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        os.replace(temporary, self._vectors_path())
+
+    def __repr__(self) -> str:
+        return f"ScholarVectorStore(path={self.__path!r}, vectors={len(self.__keys)}, dim={self.__dim})"
+
+
+class ScholarIvfIndex:
+    # Inverted file: vectors are bucketed by their nearest k-means centroid, a query only scans
+    # the nprobe closest buckets
+    def __init__(self, nlist: int = None, iterations: int = 10, sample_size: int = 100_000, seed: int = 0):
+        self.__nlist = nlist
+        self.__iterations = iterations
+        self.__sample_size = sample_size
+        self.__seed = seed
+
+        self.__centroids = None
+        self.__order = None
+        self.__offsets = None
+
+    def __len__(self) -> int:
+        return 0 if self.__order is None else len(self.__order)
+
+    # ---------------------------------------------------------------------------------------------
+    # Building
+    # ---------------------------------------------------------------------------------------------
+    @staticmethod
+    def _assign(vectors, centroids, batch_size: int = 65536) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), batch_size):
+            batch = np.asarray(vectors[start:start + batch_size])
+            labels[start:start + batch_size] = np.argmax(batch @ centroids.T, axis=1)
+        return labels
+
+    def build(self, vectors: np.ndarray):
+        count = len(vectors)
+        if count == 0:
+            self.__centroids = self.__order = self.__offsets = None
+            return self
+
+        # About 4 * sqrt(n) lists keeps both the centroid scan and each list short
+        nlist = min(self.__nlist or max(1, int(4 * np.sqrt(count))), count)
+        rng = np.random.default_rng(self.__seed)
+
+        # Spherical k-means on a sample, vectors are unit length so the dot product is the cosine
+        picked = rng.choice(count, min(count, max(self.__sample_size, nlist)), replace=False)
+        sample = np.asarray(vectors[np.sort(picked)])
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(self.__iterations):
+            labels = self._assign(sample, centroids)
+            # Sorted by label, each cluster sum is one contiguous reduceat segment
+            order = np.argsort(labels, kind="stable")
+            present, starts = np.unique(labels[order], return_index=True)
+            sums = np.zeros_like(centroids)
+            sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their old centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        labels = self._assign(vectors, centroids)
+        self.__centroids = centroids.astype(np.float32)
+        self.__order = np.argsort(labels, kind="stable").astype(np.int64)
+        self.__offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=nlist)))).astype(np.int64)
+        return self
+
+    # ---------------------------------------------------------------------------------------------
+    # Searching
+    # ---------------------------------------------------------------------------------------------
+    def search(self, vectors: np.ndarray, queries: np.ndarray, top_k: int = 10, nprobe: int = 8) -> list:
+        if self.__centroids is None:
+            return [[] for _ in queries]
+
+        results = []
+        nprobe = min(nprobe, len(self.__centroids))
+        probes = np.argpartition(-(queries @ self.__centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        for query, lists in zip(queries, probes):
+            rows = np.concatenate([self.__order[self.__offsets[l]:self.__offsets[l + 1]] for l in lists])
+            if not len(rows):
+                results.append([])
+                continue
+            # Sorted rows read the memory map front to back
+            rows.sort()
+            scores = np.asarray(vectors[rows]) @ query
+            best = np.argpartition(-scores, min(top_k, len(rows)) - 1)[:top_k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            results.append([(int(rows[i]), float(scores[i])) for i in best])
+        return results
+
+    # ---------------------------------------------------------------------------------------------
+    # Persistence
+    # ---------------------------------------------------------------------------------------------
+    def save(self, path: str):
+        with open(path, "wb") as file:
+            np.savez(file, centroids=self.__centroids, order=self.__order, offsets=self.__offsets)
+
+    def load(self, path: str):
+        data = np.load(path)
+        self.__centroids = data["centroids"]
+        self.__order = data["order"]
+        self.__offsets = data["offsets"]
+        return self
+
+    def __repr__(self) -> str:
+        nlist = 0 if self.__centroids is None else len(self.__centroids)
+        return f"ScholarIvfIndex(vectors={len(self)}, nlist={nlist})"
+
+
+class ScholarSemanticIndex:
+    EMBEDDER = "embedder.npz"
+    IVF = "ivf.npz"
+
+    def __init__(
+        self,
+        path: str = "scholar_semantic",
+        dim: int = 128,
+        nprobe: int = 8,
+        refit_growth: float = 4.0,
+        rebuild_ratio: float = 0.1,
+    ):
+        self.__path = path
+        self.__nprobe = nprobe
+        self.__lock = threading.RLock()
+
+        # Refit the projection once the corpus outgrew the one it was learned on
+        self.__refit_growth = refit_growth
+        # Vectors added since the last IVF build are scanned exactly, until they are this share of the store
+        self.__rebuild_ratio = rebuild_ratio
+
+        os.makedirs(path, exist_ok=True)
+        embedder_path = os.path.join(path, self.EMBEDDER)
+        self.__embedder = ScholarEmbedder.load(embedder_path) if os.path.exists(embedder_path) else ScholarEmbedder(dim=dim)
+        self.__store = ScholarVectorStore(path, self.__embedder.get_dim())
+
+        self.__ivf = ScholarIvfIndex()
+        ivf_path = os.path.join(path, self.IVF)
+        if os.path.exists(ivf_path):
+            self.__ivf.load(ivf_path)
+
+    # ---------------------------------------------------------------------------------------------
+    # Getters
+    # ---------------------------------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.__store)
+
+    def get_embedder(self) -> ScholarEmbedder:
+        return self.__embedder
+
+    def get_payload(self, key: str):
+        row = self.__store.get_row(key)
+        return None if row is None else self.__store.get_payload(row)
+
+    # ---------------------------------------------------------------------------------------------
+    # Indexing
+    # ---------------------------------------------------------------------------------------------
+    def encode(self, texts) -> np.ndarray:
+        return self.__embedder.encode(texts)
+
+    def add_documents(self, texts, keys, payloads=None) -> int:
+        with self.__lock:
+            if not self.__embedder.is_fitted():
+                self.__embedder.fit(texts)
+                self.__embedder.save(os.path.join(self.__path, self.EMBEDDER))
+
+            added = self.__store.add(keys, self.encode(texts), texts=list(texts), payloads=payloads)
+            embedder = self.__embedder
+            if (
+                embedder.get_fitted_on() < embedder.get_max_fit_documents()
+                and len(self.__store) >= embedder.get_fitted_on() * self.__refit_growth
+            ):
+                self.refit()
+            elif len(self.__store) - len(self.__ivf) > max(1000, self.__rebuild_ratio * len(self.__store)):
+                self.build()
+            return added
+
+    def refit(self):
+        # New projection, so every stored vector is re-encoded from its stored text
+        with self.__lock:
+            texts = self.__store.get_texts()
+            self.__embedder.fit(texts)
+            self.__embedder.save(os.path.join(self.__path, self.EMBEDDER))
+            self.__store.rewrite(self.encode(texts))
+            self.build()
+
+    def build(self):
+        with self.__lock:
+            self.__ivf.build(self.__store.vectors())
+            self.__ivf.save(os.path.join(self.__path, self.IVF))
+
+    # ---------------------------------------------------------------------------------------------
+    # Searching
+    # ---------------------------------------------------------------------------------------------
+    def search_vectors(self, queries: np.ndarray, top_k: int = 10) -> list:
+        with self.__lock:
+            vectors = self.__store.vectors()
+            results = self.__ivf.search(vectors, queries, top_k, self.__nprobe)
+
+            # Rows added after the last build are not in any list yet, they are few enough to scan
+            indexed = len(self.__ivf)
+            if indexed < len(vectors):
+                scores = np.asarray(vectors[indexed:]) @ queries.T
+                for i, result in enumerate(results):
+                    best = np.argsort(-scores[:, i])[:top_k]
+                    result.extend((indexed + int(row), float(scores[row, i])) for row in best)
+                    result.sort(key=lambda hit: -hit[1])
+                    del result[top_k:]
+
+            return [[(self.__store.get_key(row), score) for row, score in result] for result in results]
+
+    def search(self, texts, top_k: int = 10) -> list:
+        if not self.__embedder.is_fitted():
+            return [[] for _ in texts]
+        return self.search_vectors(self.encode(texts), top_k)
+
+    def close(self):
+        pass
+
+    def __repr__(self) -> str:
+        return f"ScholarSemanticIndex(path={self.__path!r}, documents={len(self.__store)}, ivf={self.__ivf!r})"
@@ -0,0 +1,360 @@
+# Project models
+from models.scholarScraper import ScholarScraper
+from models.scholarScraperConfig import ScholarScraperConfig
+from models.scholarComputation import ScholarComputation, language_pack
+from models.scholarDriverPool import ScholarDriverPool
+from models.scholarMetrics import ScholarMetrics
+
+from config.nltk_config import ensure_nltk_data
+
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import queue
+import traceback
+
+class ScholarWorker:
+    def __init__(
+        self,
+        metrics: ScholarMetrics = None,
+        index=None,
+        stem_cache=None,
+        semantic=None,
+        semantic_weight: float = 0.5,
+        computation_kwargs: dict = None,
+    ):
+        # Shared by every worker, the indexes and the stem cache serialise access with their own locks
+        self.__computation_kwargs = computation_kwargs or {}
+        self.__computation = ScholarComputation(
+            index=index, metrics=metrics, stem_cache=stem_cache, **self.__computation_kwargs,
+        )
+        self.__computation.set_semantic_index(semantic, semantic_weight)
+
+    def get_computation(self) -> ScholarComputation:
+        return self.__computation
+
+    def warm_up(self):
+        # Resources load lazily on first access, so a warm service has to touch them explicitly;
+        # with language detection either pipeline may be needed by the first request
+        computation = self.__computation
+        languages = language_pack if self.__computation_kwargs.get("detect_language") else [computation.get_language()]
+        for language in languages:
+            if language == "en":
+                ensure_nltk_data()
+            computation.get_computation(language).load_language_resources()
+
+
+class ScholarService:
+    def __init__(
+        self,
+        search_fn,
+        stream_fn=None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        workers: int = 1,
+        config: ScholarScraperConfig = None,
+        max_pages_per_driver: int = 200,
+        max_memory_mb: int = None,
+        detail_workers: int = 0,
+        cache=None,
+        store=None,
+        index=None,
+        stem_cache=None,
+        semantic=None,
+        semantic_weight: float = 0.5,
+        computation_kwargs: dict = None,
+        max_concurrency: int = 8,
+    ):
+        if workers < 1:
+            raise ValueError("Workers must be at least 1.")
+        if max_concurrency < 1:
+            raise ValueError("Max concurrency must be at least 1.")
+
+        self.config = config or ScholarScraperConfig(headless=True)
+        # One registry for the whole service, served on GET /metrics
+        self.metrics = self.config.get_metrics()
+        self.__search_fn = search_fn
+        self.__stream_fn = stream_fn
+        self.__cache = cache
+        self.__store = store
+        self.__index = index
+        self.__stem_cache = stem_cache
+        self.__semantic = semantic
+        self.__max_concurrency = max_concurrency
+        self.__host = host
+        self.__port = port
+        self.__workers = queue.Queue()
+        self.__server = None
+
+        # Warm up browsers and language resources before accepting requests
+        # With the HTTP backend Chrome is only a fallback, so it is launched on demand
+        self.__use_http = self.config.get_backend() in ("http", "replay")
+        self.__pool = ScholarDriverPool(
+            config=self.config,
+            max_size=workers,
+            max_pages=max_pages_per_driver,
+            max_memory_mb=max_memory_mb,
+            prelaunch=0 if self.__use_http else workers,
+        )
+        # Detail pages get their own drivers so a request never waits on a driver it already holds
+        self.__detail_pool = None
+        if detail_workers > 0:
+            self.__detail_pool = ScholarDriverPool(
+                config=self.config,
+                max_size=detail_workers,
+                max_pages=max_pages_per_driver,
+                max_memory_mb=max_memory_mb,
+                prelaunch=detail_workers,
+            )
+
+        for _ in range(workers):
+            worker = ScholarWorker(
+                self.metrics,
+                index=index,
+                stem_cache=stem_cache,
+                semantic=semantic,
+                semantic_weight=semantic_weight,
+                computation_kwargs=computation_kwargs,
+            )
+            worker.warm_up()
+            self.__workers.put(worker)
+
+    # -------------------- Getters --------------------
+    def get_address(self):
+        return self.__host, self.__port
+
+    # -------------------- Request Handling --------------------
+    @staticmethod
+    def _parse_int(payload: dict, name: str, default: int, minimum: int) -> int:
+        value = payload.get(name)
+        # Missing, empty and 0 keep the default, as php/controller.php sends 0 for an empty field
+        if value in (None, "", 0):
+            return default
+        if isinstance(value, bool):
+            raise ValueError(f"{name} must be an integer.")
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be an integer.")
+        if value < minimum:
+            raise ValueError(f"{name} must be at least {minimum}.")
+        return value
+
+    @staticmethod
+    def _parse_bool(payload: dict, name: str) -> bool:
+        value = payload.get(name)
+        if value is None:
+            return False
+        # bool("false") is True, so only real JSON booleans are accepted
+        if not isinstance(value, bool):
+            raise ValueError(f"{name} must be a boolean.")
+        return value
+
+    def _parse_request(self, payload: dict) -> dict:
+        # Every field is checked before a worker or browser is taken, a bad body is the client's error
+        author = payload.get("author") or ""
+        keyword = payload.get("keyword") or ""
+        if not isinstance(author, str) or not isinstance(keyword, str):
+            raise ValueError("Author and keyword must be strings.")
+        if not author and not keyword:
+            raise ValueError("Author or keyword is required.")
+
+        # Every unit of concurrency is an open connection or a browser, one request cannot ask for unlimited
+        concurrency = min(self._parse_int(payload, "concurrency", 1, 1), self.__max_concurrency)
+        if not self.__use_http:
+            detail_slots = self.__detail_pool.get_max_size() if self.__detail_pool else 1
+            concurrency = min(concurrency, detail_slots)
+
+        return {
+            "author": author,
+            "keyword": keyword,
+            "limit": self._parse_int(payload, "limit", 10, 1),
+            "fast": self._parse_bool(payload, "fast"),
+            "fetch_details": self._parse_bool(payload, "details"),
+            "concurrency": concurrency,
+            "dedup": self._parse_bool(payload, "dedup"),
+            "refresh": self._parse_bool(payload, "refresh"),
+            "top_k": self._parse_int(payload, "top_k", 0, 0),
+            "cache": self.__cache,
+            "store": self.__store,
+        }
+
+    @contextmanager
+    def _checkout(self):
+        worker = self.__workers.get()
+        session = None
+        scraper = None
+        failed = True
+        # A failed launch or scraper construction must still hand the worker back, or the queue drains
+        try:
+            session = None if self.__use_http else self.__pool.acquire()
+            scraper = ScholarScraper(
+                config=self.config,
+                webdriver=session.driver if session else None,
+                pool=self.__detail_pool,
+            )
+            yield scraper, worker.get_computation()
+            failed = False
+        finally:
+            try:
+                pages = scraper.get_pages_loaded() if scraper else 0
+                if session:
+                    # Browser may be in an unknown state after an error, let the pool replace it
+                    self.__pool.release(session, pages=pages, discard=failed)
+                elif scraper:
+                    # Closes the HTTP session and any Selenium fallback the scraper had to start
+                    scraper._close_webdriver()
+            finally:
+                self.__workers.put(worker)
+
+    def handle_search(self, payload: dict) -> tuple:
+        # (HTTP status, JSON body); scraping errors keep 200 with an "error" field like the CLI output
+        try:
+            request = self._parse_request(payload)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+        self.metrics.increment("requests")
+        try:
+            with self.metrics.timer("request"), self._checkout() as (scraper, computer):
+                return 200, self.__search_fn(
+                    request.pop("author"), request.pop("keyword"), request.pop("limit"),
+                    scraper=scraper,
+                    computer=computer,
+                    **request,
+                )
+        except Exception as e:
+            self.metrics.increment("request_errors")
+            return 200, {"error": str(e), "details": traceback.format_exc()}
+
+    def handle_search_stream(self, payload: dict) -> tuple:
+        # Validated before the stream starts, so a bad request still gets a 400 instead of a 200 header
+        if self.__stream_fn is None:
+            return 400, {"error": "Streaming is not enabled."}
+        try:
+            request = self._parse_request(payload)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        return 200, self._stream(request)
+
+    def _stream(self, request: dict):
+        # A streamed profile is always scraped in full, there is no incremental refresh to apply
+        request.pop("refresh")
+        self.metrics.increment("requests")
+        try:
+            with self.metrics.timer("request"), self._checkout() as (scraper, computer):
+                yield from self.__stream_fn(
+                    request.pop("author"), request.pop("keyword"), request.pop("limit"),
+                    scraper=scraper,
+                    computer=computer,
+                    **request,
+                )
+        except Exception as e:
+            self.metrics.increment("request_errors")
+            yield {"type": "error", "error": str(e), "details": traceback.format_exc()}
+
+    def _build_handler(self):
+        service = self
+
+        class ScholarRequestHandler(BaseHTTPRequestHandler):
+            def _send_json(self, status: int, body: dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_text(self, status: int, text: str, content_type: str):
+                data = text.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, records):
+                # No Content-Length, the response ends when the connection closes
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson; charset=UTF-8")
+                self.end_headers()
+                try:
+                    for record in records:
+                        self.wfile.write(json.dumps(record).encode("utf-8") + b"\n")
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client stopped reading, stop scraping too
+                    records.close()
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._send_json(200, {"status": "ok"})
+                elif self.path == "/metrics":
+                    self._send_text(200, service.metrics.to_prometheus(), "text/plain; version=0.0.4; charset=UTF-8")
+                elif self.path == "/metrics.json":
+                    self._send_json(200, service.metrics.snapshot())
+                else:
+                    self._send_json(404, {"error": "Not found."})
+
+            def do_POST(self):
+                if self.path not in ("/", "/search"):
+                    self._send_json(404, {"error": "Not found."})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except (ValueError, json.JSONDecodeError):
+                    self._send_json(400, {"error": "Invalid JSON body."})
+                    return
+                if not isinstance(payload, dict):
+                    self._send_json(400, {"error": "Request body must be a JSON object."})
+                    return
+
+                try:
+                    stream = service._parse_bool(payload, "stream")
+                except ValueError as e:
+                    self._send_json(400, {"error": str(e)})
+                    return
+
+                if stream:
+                    status, body = service.handle_search_stream(payload)
+                    if status == 200:
+                        self._send_stream(body)
+                        return
+                else:
+                    status, body = service.handle_search(payload)
+                self._send_json(status, body)
+
+            def log_message(self, format, *args):
+                if service.config._is_verbose:
+                    super().log_message(format, *args)
+
+        return ScholarRequestHandler
+
+    # -------------------- Lifecycle --------------------
+    def serve_forever(self):
+        self.__server = ThreadingHTTPServer((self.__host, self.__port), self._build_handler())
+        if self.config._is_verbose:
+            print(f"ScholarService listening on http://{self.__host}:{self.__port}")
+        try:
+            self.__server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        if self.__server:
+            self.__server.server_close()
+            self.__server = None
+        self.__pool.close()
+        if self.__cache:
+            self.__cache.close()
+        if self.__store is not None:
+            self.__store.close()
+        if self.__index is not None:
+            self.__index.close()
+        if self.__stem_cache is not None:
+            self.__stem_cache.close()
+        if self.__semantic is not None:
+            self.__semantic.close()
+        if self.__detail_pool:
+            self.__detail_pool.close()
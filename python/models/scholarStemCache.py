@@ -0,0 +1,83 @@
+import sqlite3
+import sys
+import threading
+
+class ScholarStemCache:
+    # Token -> stem (or lemma) per language, kept across runs; Sastrawi needs milliseconds per
+    # unseen word, a dictionary lookup does not
+    def __init__(self, path: str = "scholar_stems.sqlite3"):
+        self.__path = path
+        self.__lock = threading.Lock()
+
+        # Worker processes open the same file, WAL lets them read while the parent writes
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS stems (
+                language TEXT NOT NULL,
+                token TEXT NOT NULL,
+                stem TEXT NOT NULL,
+                PRIMARY KEY (language, token)
+            ) WITHOUT ROWID
+            """
+        )
+        self.__connection.commit()
+
+    # -------------------- Getters --------------------
+    def get_path(self) -> str:
+        return self.__path
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__connection.execute("SELECT COUNT(*) FROM stems").fetchone()[0]
+
+    # -------------------- Lookup --------------------
+    def load(self, language: str) -> dict:
+        with self.__lock:
+            return dict(self.__connection.execute(
+                "SELECT token, stem FROM stems WHERE language = ?", (language,)
+            ))
+
+    # -------------------- Store --------------------
+    def update(self, language: str, stems: dict) -> int:
+        if not stems:
+            return 0
+        with self.__lock:
+            before = self.__connection.total_changes
+            try:
+                # Stemmers are deterministic, a token stored by another process already has the same stem
+                self.__connection.executemany(
+                    "INSERT OR IGNORE INTO stems (language, token, stem) VALUES (?, ?, ?)",
+                    ((language, token, stem) for token, stem in stems.items()),
+                )
+                self.__connection.commit()
+            except sqlite3.Error:
+                # Read-only or locked file: the stems are recomputed next time, the search goes on
+                self.__connection.rollback()
+                return 0
+            return self.__connection.total_changes - before
+
+    def clear(self):
+        with self.__lock:
+            self.__connection.execute("DELETE FROM stems")
+            self.__connection.commit()
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def __repr__(self) -> str:
+        return f"ScholarStemCache(path={self.__path!r})"
+
+
+def open_stem_cache(path: str):
+    # The default file sits next to the sources, a web server user that cannot write there
+    # runs without a cache instead of failing every search
+    if not path:
+        return None
+    try:
+        return ScholarStemCache(path)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Stem cache {path} is not usable, continuing without it: {e}", file=sys.stderr)
+        return None
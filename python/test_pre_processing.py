@@ -34,6 +34,7 @@ if __name__ == "__main__":
     stemmed_docs = timed("EN Stemming", compute.stemming, lowered_docs)
     lemmatized_docs = timed("EN Lemmatization", compute.lemmatization, stemmed_docs)
     clean_docs = timed("EN Stopword removal", compute.stopword_removal, lemmatized_docs)
+    fused_docs = timed("EN Fused preprocessing", compute.preprocess, documents)
 
     lowered_query = timed("EN Query case folding", compute.case_folding, [query])[0]
     stemmed_query = timed("EN Query stemming", compute.stemming, lowered_query)
@@ -94,6 +95,7 @@ if __name__ == "__main__":
     stemmed_docs = timed("ID Stemming", compute.stemming, lowered_docs)
     lemmatized_docs = timed("ID Lemmatization", compute.lemmatization, stemmed_docs)
     clean_docs = timed("ID Stopword removal", compute.stopword_removal, lemmatized_docs)
+    fused_docs = timed("ID Fused preprocessing", compute.preprocess, documents)
 
     lowered_query = timed("ID Query case folding", compute.case_folding, [query])[0]
     stemmed_query = timed("ID Query stemming", compute.stemming, lowered_query)
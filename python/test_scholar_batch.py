@@ -0,0 +1,100 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.scholarBatch import ScholarBatchRunner, ScholarJobQueue
+
+REPLAY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "scholar", "replay")
+
+# Recorded pages only, so the workers never start Chrome or go online
+CONFIG = {"headless": True, "backend": "replay", "archive_path": REPLAY}
+
+def open_queue(tmp_path):
+    return ScholarJobQueue(str(tmp_path / "jobs.sqlite3"))
+
+# -------------------- Queue --------------------
+def test_enqueue_skips_jobs_already_queued(tmp_path):
+    queue = open_queue(tmp_path)
+    assert queue.enqueue([{"author": "A"}, {"author": "B"}, {"author": "A"}]) == 2
+    assert queue.enqueue([{"author": "B"}, {"keyword": "fruit", "limit": 5}]) == 1
+    assert queue.counts() == {"pending": 3}
+    queue.close()
+
+def test_claim_order_and_completion(tmp_path):
+    queue = open_queue(tmp_path)
+    queue.enqueue([{"author": "A"}, {"keyword": "fruit", "limit": 5}])
+
+    first = queue.claim()
+    assert first == {"id": first["id"], "author": "A", "keyword": "", "limit": 10}
+    assert queue.claim()["keyword"] == "fruit"
+    assert queue.claim() is None
+
+    queue.complete(first["id"])
+    assert queue.counts() == {"done": 1, "running": 1}
+    queue.close()
+
+def test_failed_job_is_retried_until_max_attempts(tmp_path):
+    queue = open_queue(tmp_path)
+    queue.enqueue([{"author": "A"}])
+
+    for _ in range(2):
+        job = queue.claim()
+        queue.fail(job["id"], "blocked", max_attempts=2)
+    assert queue.counts() == {"failed": 1}
+    assert queue.claim() is None
+    queue.close()
+
+def test_recover_requeues_jobs_of_a_crashed_run(tmp_path):
+    queue = open_queue(tmp_path)
+    queue.enqueue([{"author": "A"}, {"author": "B"}])
+    queue.claim()
+    queue.close()
+
+    # A new run on the same file finds the job the crashed one left running
+    queue = open_queue(tmp_path)
+    assert queue.recover() == 1
+    assert queue.counts() == {"pending": 2}
+    assert queue.claim()["author"] == "A"
+    queue.close()
+
+def test_read_jobs_accepts_names_and_json(tmp_path):
+    path = tmp_path / "jobs.txt"
+    path.write_text('Joko Siswantoro\n\n# comment\n{"keyword": "fruit", "limit": 5}\n', encoding="utf-8")
+    assert list(ScholarJobQueue.read_jobs(str(path), default_limit=20)) == [
+        {"author": "Joko Siswantoro", "limit": 20},
+        {"keyword": "fruit", "limit": 5},
+    ]
+
+# -------------------- Runner --------------------
+def crash_once(author, keyword, limit, scraper=None, computer=None, crash_marker=None, **options):
+    # Kills the worker process in the middle of the first job, like a crashed browser or an OOM kill
+    if author == "B" and not os.path.exists(crash_marker):
+        open(crash_marker, "w").close()
+        os._exit(1)
+    return {"papers": [{"title": f"{author}{keyword}"}], "top_keywords": []}
+
+def run_batch(tmp_path, jobs):
+    runner = ScholarBatchRunner(
+        search_fn=crash_once,
+        queue_path=str(tmp_path / "jobs.sqlite3"),
+        output_path=str(tmp_path / "results.ndjson"),
+        workers=1,
+        options={"crash_marker": str(tmp_path / "crashed")},
+        config_kwargs=CONFIG,
+    )
+    return runner.run(jobs)
+
+def test_runner_resumes_after_a_worker_crash(tmp_path):
+    counts = run_batch(tmp_path, [{"author": "A"}, {"author": "B"}, {"author": "C"}])
+    # The worker died on B: it is left running and C was never claimed
+    assert counts == {"done": 1, "running": 1, "pending": 1}
+
+    # Running again without new jobs (--batch -) picks up where the crash left off
+    assert run_batch(tmp_path, None) == {"done": 3}
+
+    with open(tmp_path / "results.ndjson", encoding="utf-8") as file:
+        results = [json.loads(line) for line in file]
+    assert [result["author"] for result in results] == ["A", "B", "C"]
+    assert results[1]["papers"] == [{"title": "B"}]
@@ -0,0 +1,113 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models import scholarCache
+from models.scholarCache import ScholarCache
+
+def papers(count, prefix="Paper"):
+    return [{"title": f"{prefix} {i}", "citations": i} for i in range(count)]
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Every call moves one second on, so access order is never a tie
+    now = [1_000_000.0]
+
+    def tick():
+        now[0] += 1
+        return now[0]
+
+    monkeypatch.setattr(scholarCache.time, "time", tick)
+    return now
+
+def open_cache(tmp_path, **kwargs):
+    return ScholarCache(path=str(tmp_path / "cache.sqlite3"), **kwargs)
+
+# -------------------- Prefix Serving --------------------
+def test_smaller_limit_is_served_from_the_stored_prefix(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put("Joko Siswantoro", papers(10), limit=10)
+    assert cache.get("Joko Siswantoro", 3) == papers(3)
+    # Queries are normalised, case and spacing do not make a new entry
+    assert cache.get("  joko   SISWANTORO ", 10) == papers(10)
+    cache.close()
+
+def test_larger_limit_needs_a_complete_entry(tmp_path):
+    cache = open_cache(tmp_path)
+    # Asked for 10 and got 10, there may be more
+    cache.put("full", papers(10), limit=10)
+    assert cache.get("full", 20) is None
+    # Asked for 10 and got 4, the profile has nothing more
+    cache.put("short", papers(4), limit=10)
+    assert cache.get("short", 50) == papers(4)
+    cache.close()
+
+def test_variants_are_kept_apart(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put("fruit", papers(3), limit=10, variant="author|table")
+    assert cache.get("fruit", 3, variant="author|details") is None
+    assert cache.get("fruit", 3, variant="author|table") == papers(3)
+    cache.close()
+
+def test_empty_result_is_never_served(tmp_path):
+    cache = open_cache(tmp_path)
+    cache.put("blocked", [], limit=10)
+    assert cache.get("blocked", 1) is None
+    assert cache.get("blocked", 10) is None
+    cache.close()
+
+# -------------------- TTL --------------------
+def test_entry_expires_after_its_ttl(tmp_path, clock):
+    cache = open_cache(tmp_path, ttl=60)
+    cache.put("fruit", papers(2), limit=10)
+    clock[0] += 30
+    assert cache.get("fruit", 2) == papers(2)
+    clock[0] += 60
+    assert cache.get("fruit", 2) is None
+    assert len(cache) == 0
+    cache.close()
+
+def test_snapshots_do_not_expire(tmp_path, clock):
+    cache = open_cache(tmp_path, ttl=60)
+    cache.put_snapshot("Joko Siswantoro", papers(2))
+    clock[0] += 3600
+    cache.put("other", papers(1), limit=10)
+    assert cache.get_snapshot("Joko Siswantoro") == papers(2)
+    cache.close()
+
+def test_invalid_settings_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        open_cache(tmp_path, ttl=0)
+    with pytest.raises(ValueError):
+        open_cache(tmp_path, max_entries=0)
+
+# -------------------- Eviction --------------------
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    cache = open_cache(tmp_path, max_entries=2)
+    cache.put("a", papers(1), limit=10)
+    cache.put("b", papers(1), limit=10)
+    # Reading "a" makes "b" the least recently used one
+    assert cache.get("a", 1) == papers(1)
+    cache.put("c", papers(1), limit=10)
+
+    assert len(cache) == 2
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == papers(1)
+    assert cache.get("c", 1) == papers(1)
+    cache.close()
+
+def test_byte_budget_keeps_the_most_recent_entries(tmp_path, clock):
+    entry = papers(20)
+    size = len(json.dumps(entry, ensure_ascii=False))
+    cache = open_cache(tmp_path, max_entries=None, max_bytes=2 * size)
+    for query in ("a", "b", "c"):
+        cache.put(query, entry, limit=100)
+
+    assert len(cache) == 2
+    assert cache.get("a", 20) is None
+    assert cache.get("c", 20) == entry
+    cache.close()
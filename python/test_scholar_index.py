@@ -0,0 +1,149 @@
+import math
+import os
+import random
+import sys
+from collections import Counter
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.scholarIndex import ScholarIndex
+
+def open_index(tmp_path):
+    return ScholarIndex(path=str(tmp_path / "index.sqlite3"))
+
+def brute_force_scores(corpus, query):
+    # Same weighting as sklearn's TfidfTransformer (smooth idf, l2 norm), refitted on the live corpus
+    counts = {key: Counter(ScholarIndex.tokenize(text)) for key, text in corpus.items()}
+    df = Counter(term for terms in counts.values() for term in terms)
+    idf = {term: math.log((1 + len(counts)) / (1 + n)) + 1 for term, n in df.items()}
+
+    def vector(terms):
+        weights = {term: tf * idf[term] for term, tf in terms.items() if term in idf}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        return {term: w / norm for term, w in weights.items()}
+
+    query_vector = vector(Counter(ScholarIndex.tokenize(query)))
+    scores = {}
+    for key, terms in counts.items():
+        document = vector(terms)
+        scores[key] = sum(w * document.get(term, 0.0) for term, w in query_vector.items())
+    return scores
+
+def index_scores(index, query):
+    scores = index.score(index.transform([query]))
+    return dict(zip(index.get_keys(), scores))
+
+# -------------------- Dropped Terms --------------------
+def test_term_without_documents_does_not_scale_the_query(tmp_path):
+    index = open_index(tmp_path)
+    corpus = {"a": "alpha beta retrieval", "b": "gamma retrieval", "c": "beta gamma"}
+    index.add_documents(list(corpus.values()), keys=list(corpus))
+
+    # "alpha" only occurred in the replaced version of "a"
+    corpus["a"] = "beta delta"
+    index.add_documents([corpus["a"]], keys=["a"])
+    assert index.get_document_frequency("alpha") == 0
+
+    query = index.transform(["alpha beta"])
+    assert query.nnz == 1
+    assert query.data[0] == pytest.approx(1.0)
+
+    expected = brute_force_scores(corpus, "alpha beta")
+    for key, score in index_scores(index, "alpha beta").items():
+        assert score == pytest.approx(expected[key])
+    index.close()
+
+# -------------------- Top-k Retrieval --------------------
+VOCABULARY = (
+    "fruit food volume vision image deep learning neural network retrieval ranking index "
+    "query text mining semantic citation sistem temu kembali klasifikasi citra"
+).split()
+
+def random_corpus(rng, size, prefix="d"):
+    return {
+        f"{prefix}{i}": " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(2, 12)))
+        for i in range(size)
+    }
+
+def assert_top_k(index, corpus, query, top_k):
+    expected = brute_force_scores(corpus, query)
+    hits = index.search(index.transform([query]), top_k)
+    best = sorted((score for score in expected.values() if score > 0), reverse=True)[:top_k]
+
+    # Ties may come back in any order, the scores themselves must be the k best
+    assert [score for _, score in hits] == pytest.approx(best)
+    for key, score in hits:
+        assert score == pytest.approx(expected[key])
+
+def test_search_matches_brute_force_top_k(tmp_path):
+    rng = random.Random(7)
+    index = open_index(tmp_path)
+    corpus = random_corpus(rng, 300)
+    index.add_documents(list(corpus.values()), keys=list(corpus))
+
+    for _ in range(20):
+        query = " ".join(rng.sample(VOCABULARY, rng.randint(1, 4)))
+        for top_k in (1, 5, 50):
+            assert_top_k(index, corpus, query, top_k)
+    index.close()
+
+def test_norms_follow_adds_replacements_and_removals(tmp_path):
+    rng = random.Random(11)
+    index = open_index(tmp_path)
+    corpus = random_corpus(rng, 100)
+    index.add_documents(list(corpus.values()), keys=list(corpus))
+
+    # Every step changes N and some df, the stored weights are updated instead of rebuilt
+    for step in range(5):
+        batch = random_corpus(rng, 20, prefix=f"n{step}-")
+        replaced = {key: corpus[key][::-1] for key in rng.sample(sorted(corpus), 10)}
+        removed = rng.sample(sorted(set(corpus) - set(replaced)), 5)
+
+        index.add_documents(list(batch.values()) + list(replaced.values()), keys=list(batch) + list(replaced))
+        index.remove_documents(removed)
+        corpus.update(batch)
+        corpus.update(replaced)
+        for key in removed:
+            del corpus[key]
+
+        query = " ".join(rng.sample(VOCABULARY, 3))
+        expected = brute_force_scores(corpus, query)
+        for key, score in index_scores(index, query).items():
+            assert score == pytest.approx(expected[key])
+        assert_top_k(index, corpus, query, 10)
+
+    # Rows of the matrix are unit vectors, a stale norm would show here first
+    norms = np.sqrt(np.asarray(index.document_matrix().multiply(index.document_matrix()).sum(axis=1)))
+    assert norms.ravel() == pytest.approx(np.ones(len(corpus)))
+    index.close()
+
+def test_reopened_index_scores_like_the_original(tmp_path):
+    rng = random.Random(3)
+    index = open_index(tmp_path)
+    corpus = random_corpus(rng, 80)
+    index.add_documents(list(corpus.values()), keys=list(corpus), payloads=[{"key": key} for key in corpus])
+    index.remove_documents(["d0", "d1"])
+    del corpus["d0"], corpus["d1"]
+    query = "fruit vision retrieval"
+    before = index.search(index.transform([query]), 10)
+    index.close()
+
+    # Only terms and document weights are read back, the postings load on demand
+    reopened = open_index(tmp_path)
+    assert len(reopened) == len(corpus)
+    after = reopened.search(reopened.transform([query]), 10)
+    assert [key for key, _ in after] == [key for key, _ in before]
+    assert [score for _, score in after] == pytest.approx([score for _, score in before])
+    assert reopened.get_payload(before[0][0]) == {"key": before[0][0]}
+    assert_top_k(reopened, corpus, query, 10)
+    reopened.close()
+
+def test_search_needs_a_positive_top_k(tmp_path):
+    index = open_index(tmp_path)
+    index.add_documents(["fruit vision"], keys=["a"])
+    with pytest.raises(ValueError):
+        index.search(index.transform(["fruit"]), 0)
+    index.close()
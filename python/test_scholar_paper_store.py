@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models import scholarPaperStore
+from models.scholarPaperStore import ScholarPaperStore
+
+def paper(citation_id, title, authors="J Siswantoro, AS Prabuwono", year=2015, citations=0):
+    return {
+        "title": title,
+        "authors": authors,
+        "journal": "Journal",
+        "year": year,
+        "citations": citations,
+        "citation_id": citation_id,
+    }
+
+PAPERS = [
+    paper("a", "Fruit classification using computer vision", year=2016, citations=42),
+    paper("b", "Food volume measurement", year=2015, citations=57),
+    paper("c", "Monte Carlo volume estimation", year=2014, citations=45),
+    paper("d", "Sistem temu kembali informasi", authors="Joko Siswantoro", year=2019, citations=3),
+    paper("e", "Undated preprint", authors="B Idrus", year=None, citations=8),
+]
+
+def titles(store, **filters):
+    return [p["title"] for p in store.select(**filters).to_dicts()]
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScholarPaperStore(path=str(tmp_path / "store"))
+    store.put(PAPERS)
+    yield store
+    store.close()
+
+# -------------------- Range Queries --------------------
+def test_year_range_is_inclusive_and_ordered_by_citations(store):
+    assert titles(store, min_year=2015, max_year=2016) == [
+        "Food volume measurement",
+        "Fruit classification using computer vision",
+    ]
+    assert titles(store, min_year=2016, order_by="year") == [
+        "Sistem temu kembali informasi",
+        "Fruit classification using computer vision",
+    ]
+
+def test_paper_without_year_is_outside_any_year_range(store):
+    assert "Undated preprint" not in titles(store, max_year=2030)
+    assert "Undated preprint" in titles(store, min_citations=5, max_citations=10)
+
+def test_citation_range_with_limit(store):
+    assert titles(store, min_citations=40, limit=2) == [
+        "Food volume measurement",
+        "Monte Carlo volume estimation",
+    ]
+
+def test_unknown_order_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.query(order_by="title")
+
+# -------------------- Author Queries --------------------
+def test_author_matches_initial_and_surname(store):
+    expected = {
+        "Fruit classification using computer vision",
+        "Food volume measurement",
+        "Monte Carlo volume estimation",
+        "Sistem temu kembali informasi",
+    }
+    assert set(titles(store, author="Joko Siswantoro")) == expected
+    assert set(titles(store, author="J Siswantoro")) == expected
+    # A surname alone matches every initial
+    assert set(titles(store, author="siswantoro")) == expected
+    assert titles(store, author="Idrus") == ["Undated preprint"]
+    assert titles(store, author="Someone Else") == []
+
+def test_author_combined_with_year(store):
+    assert titles(store, author="J Siswantoro", min_year=2016) == [
+        "Fruit classification using computer vision",
+        "Sistem temu kembali informasi",
+    ]
+
+# -------------------- Versions --------------------
+def test_unchanged_paper_is_not_appended_again(store):
+    assert store.put(PAPERS) == 0
+    assert len(store) == len(PAPERS)
+
+def test_changed_paper_replaces_its_previous_version(tmp_path, store):
+    assert store.put([paper("b", "Food volume measurement", year=2015, citations=60)]) == 1
+    assert len(store) == len(PAPERS)
+    assert store.get("b")["citations"] == 60
+    assert titles(store, min_citations=58) == ["Food volume measurement"]
+    store.close()
+
+    reopened = ScholarPaperStore(path=str(tmp_path / "store"))
+    assert reopened.get("b")["citations"] == 60
+    assert set(titles(reopened, author="J Siswantoro", min_citations=50)) == {"Food volume measurement"}
+    reopened.close()
+
+# -------------------- Several Processes --------------------
+def _append(path, worker, count):
+    store = ScholarPaperStore(path=path)
+    for i in range(count):
+        store.put([paper(f"{worker}-{i}", f"Paper {i} of worker {worker}", authors=f"A Writer{worker}", citations=i)])
+    store.close()
+
+@pytest.mark.skipif(scholarPaperStore.fcntl is None, reason="needs flock")
+def test_appends_from_several_processes(tmp_path):
+    path = str(tmp_path / "store")
+    # Opened before the other processes write, it has to catch up on their rows
+    store = ScholarPaperStore(path=path)
+    store.put(PAPERS)
+
+    workers, count = 4, 50
+    processes = [
+        multiprocessing.Process(target=_append, args=(path, worker, count))
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    total = len(PAPERS) + workers * count
+    assert len(store.query()) == total
+    assert len(store) == total
+    assert len(titles(store, author="A Writer2")) == count
+    assert titles(store, author="A Writer3", min_citations=count - 1) == [f"Paper {count - 1} of worker 3"]
+    store.close()
+
+    fresh = ScholarPaperStore(path=path)
+    assert len(fresh) == total
+    assert sorted(p["citation_id"] for p in fresh.iter_dicts()) == sorted(
+        [p["citation_id"] for p in PAPERS] + [f"{w}-{i}" for w in range(workers) for i in range(count)]
+    )
+    fresh.close()
@@ -0,0 +1,162 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.scholarParser import ScholarParser
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "scholar")
+
+PROFILE_URL = "https://scholar.google.com/citations?user=AbCdEfGAAAAJ&hl=en&oi=ao"
+DETAIL_URL = "https://scholar.google.com/citations?view_op=view_citation&hl=en&user=AbCdEfGAAAAJ&citation_for_view="
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as file:
+        return file.read()
+
+# -------------------- Author Search --------------------
+def test_parse_author_profile_url():
+    page = read_fixture("author_search.html")
+    assert ScholarParser.parse_author_profile_url(page, "Joko Siswantoro") == PROFILE_URL
+    # Matching ignores case, an unknown author gives no profile
+    assert ScholarParser.parse_author_profile_url(page, "joko siswantoro") == PROFILE_URL
+    assert ScholarParser.parse_author_profile_url(page, "Someone Else") == ""
+
+def test_author_search_profile_card_is_not_a_result():
+    results = ScholarParser.parse_search_results(read_fixture("author_search.html"))
+    assert results == [{
+        "title": "Fruit classification using computer vision",
+        "link": "https://example.org/paper-1",
+        "description": "We propose a computer vision system for classifying fruit using color and texture features.",
+        "authors": "J Siswantoro, AS Prabuwono",
+        "journal": "International Journal of Food Engineering",
+        "year": "2016",
+        "citations": "42",
+        "citation_id": "x1",
+        "detail_url": "",
+    }]
+
+# -------------------- Author Profile --------------------
+def test_parse_article_table():
+    articles = ScholarParser.parse_article_table(read_fixture("author_profile.html"))
+    assert articles == [
+        {
+            "title": "A measurement system for estimating the volume of food using computer vision",
+            "link": "",
+            "description": "",
+            "authors": "J Siswantoro, AS Prabuwono, A Abdullah, B Idrus",
+            "journal": "Pertanika Journal of Science & Technology 23 (1), 123-140",
+            "year": "2015",
+            "citations": "57",
+            "citation_id": "AbCdEfGAAAAJ:u5HHmVD_uO8C",
+            "detail_url": DETAIL_URL + "AbCdEfGAAAAJ:u5HHmVD_uO8C",
+        },
+        {
+            "title": "Monte Carlo method with heuristic adjustment for irregularly shaped food product volume measurement",
+            "link": "",
+            "description": "",
+            "authors": "J Siswantoro, AS Prabuwono, A Abdullah, B Idrus",
+            "journal": "The Scientific World Journal 2014",
+            "year": "2014",
+            "citations": "45",
+            "citation_id": "AbCdEfGAAAAJ:d1gkVwhDpl0C",
+            "detail_url": DETAIL_URL + "AbCdEfGAAAAJ:d1gkVwhDpl0C",
+        },
+        {
+            "title": "Sistem temu kembali informasi dokumen skripsi menggunakan metode TF-IDF",
+            "link": "",
+            "description": "",
+            "authors": "J Siswantoro, ...",
+            "journal": "Jurnal Teknik Informatika dan Sistem Informasi 5 (2)",
+            "year": "2019",
+            "citations": "0",
+            "citation_id": "AbCdEfGAAAAJ:9yKSN-GCB0IC",
+            "detail_url": DETAIL_URL + "AbCdEfGAAAAJ:9yKSN-GCB0IC",
+        },
+    ]
+
+def test_has_more_articles():
+    page = read_fixture("author_profile.html")
+    assert ScholarParser.has_more_articles(page) is False
+    assert ScholarParser.has_more_articles(page.replace(' disabled=""', "")) is True
+    assert ScholarParser.has_more_articles("<html><body></body></html>") is False
+
+# -------------------- Citation Detail --------------------
+def test_parse_citation_details():
+    details = ScholarParser.parse_citation_details(read_fixture("citation_detail.html"))
+    assert details == {
+        "title": "A measurement system for estimating the volume of food using computer vision",
+        "link": "https://example.org/volume-measurement",
+        "description": (
+            "Volume measurement of food products is an important step in food processing. "
+            "This paper proposes a computer vision system that estimates food volume from images taken by five cameras."
+        ),
+        "authors": "Joko Siswantoro, Anton Satria Prabuwono, Azizi Abdullah, Bahari Idrus",
+        "journal": "Pertanika Journal of Science & Technology",
+        "year": "2015/1/1",
+        # From the "Cited by" link, not the per-year chart in the same cell
+        "citations": "57",
+    }
+
+# -------------------- Topic Search --------------------
+def test_parse_search_results():
+    results = ScholarParser.parse_search_results(read_fixture("search_results.html"))
+    assert len(results) == 10
+    assert [result["citation_id"] for result in results] == [f"t{i}" for i in range(10)]
+    assert [result["year"] for result in results] == [str(year) for year in range(2010, 2020)]
+    assert [result["citations"] for result in results] == [
+        "165", "77", "202", "24", "37", "274", "48", "187", "298", "29",
+    ]
+    assert results[0] == {
+        "title": "Fruit classification with computer vision for automated grading",
+        "link": "https://example.org/topic-0",
+        "description": "We study fruit classification and deep learning on a dataset of 100 samples.",
+        "authors": "J Siswantoro, A Author0",
+        "journal": "Journal of Food Engineering",
+        "year": "2010",
+        "citations": "165",
+        "citation_id": "t0",
+        "detail_url": "",
+    }
+
+def test_citation_entry_without_link():
+    # [CITATION] entries have no link, the type tag is dropped from the title
+    entry = ScholarParser.parse_search_results(read_fixture("search_results.html"))[3]
+    assert entry["title"] == "Food quality inspection with fruit classification for automated grading"
+    assert entry["link"] == ""
+    assert entry["authors"] == "J Siswantoro, A Author3"
+    assert entry["journal"] == "Expert Systems with Applications"
+
+def test_has_next_results_page():
+    page = read_fixture("search_results.html")
+    assert ScholarParser.has_next_results_page(page) is True
+    assert ScholarParser.has_next_results_page(read_fixture("author_search.html")) is False
+
+def test_split_byline():
+    assert ScholarParser.split_byline("J Siswantoro, AS Prabuwono - Journal of Food Engineering, 2016 - elsevier.com") == (
+        "J Siswantoro, AS Prabuwono", "Journal of Food Engineering", "2016",
+    )
+    # Only authors and the source domain
+    assert ScholarParser.split_byline("J Siswantoro - ubaya.ac.id") == ("J Siswantoro", "", "")
+
+# -------------------- Replay Archive --------------------
+def test_replay_detail_pages_match_their_rows():
+    # Each recorded detail page belongs to its own profile row, not a copy of another one
+    replay = os.path.join(FIXTURES, "replay")
+    with open(os.path.join(replay, "manifest.ndjson"), encoding="utf-8") as file:
+        entries = [json.loads(line) for line in file if line.strip()]
+
+    rows = {row["detail_url"]: row for row in ScholarParser.parse_article_table(read_fixture("author_profile.html"))}
+    details = {}
+    for entry in entries:
+        if entry["url"] in rows:
+            with open(os.path.join(replay, entry["file"]), encoding="utf-8") as file:
+                details[entry["url"]] = ScholarParser.parse_citation_details(file.read())
+
+    assert set(details) == set(rows)
+    for url, detail in details.items():
+        assert detail["title"] == rows[url]["title"]
+        assert detail["citations"] == rows[url]["citations"]
+    assert len({detail["link"] for detail in details.values()}) == len(rows)
+    assert len({detail["description"] for detail in details.values()}) == len(rows)